@@ -0,0 +1,362 @@
+"""
+Provider-agnostic agent engine: ONE async tool-calling loop shared by the agents of the repository.
+
+    model turn (streamed) -> tool calls dispatched concurrently -> tool results -> next turn ...
+
+until the model answers without tool calls or a budget is exhausted.
+
+Building blocks:
+    - ChatModel: anything with `stream(messages, tools)` yielding ModelEvent objects (text deltas,
+      complete tool calls, usage). Messages and tool schemas use the OpenAI chat format; provider
+      adapters (./integrations/providers/) translate.
+    - Tools: a ToolRegistry (./core/tool.py): schemas computed once, validated O(1) dispatch.
+    - Budget: maximum number of turns, total tokens and wall time. The engine stops cleanly
+      (stop_reason) instead of raising when one is exhausted.
+    - Executors: how tool functions run. "async" (coroutine tools awaited, blocking ones in the
+      default thread pool), "thread" (dedicated pool), "sync" (inline: cheapest for tiny tools),
+      "process" (process pool, for CPU-bound tools defined at module level).
+    - Prefetcher (optional, ./core/prefetch.py): the tool calls the run will likely make start
+      with the first model turn; matching calls of the model are served from them.
+
+Usage:
+    agent = Agent(OpenAIChatModel("gpt-4o"), tools=[arxiv_search_tool], system_prompt="...")
+    result = agent.run("Find papers on agent evaluation")      # AgentResult
+    async for event in agent.astream("..."):                   # streaming
+        if event.type == "text": print(event.data, end="")
+"""
+
+# --- Standard library ---
+import asyncio
+import importlib
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Protocol, Union
+
+# --- Local / project ---
+from agentic_learning.core.tool import Tool, ToolRegistry, to_json
+from agentic_learning.utils.config import get_settings
+
+if TYPE_CHECKING:
+    from agentic_learning.core.prefetch import Prefetcher, PrefetchSession
+
+# --- Data model ---
+
+
+@dataclass
+class ToolCall:
+    id: str
+    name: str
+    arguments: str  # JSON string, as produced by the model
+
+
+@dataclass
+class Usage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def __add__(self, other: "Usage") -> "Usage":
+        return Usage(self.prompt_tokens + other.prompt_tokens, self.completion_tokens + other.completion_tokens)
+
+
+@dataclass
+class ModelEvent:
+    """Event of a streamed model turn: type is "text", "tool_call" or "usage"."""
+
+    type: str
+    data: Any
+
+
+@dataclass
+class StreamEvent:
+    """
+    Event of an agent run: "text" (delta), "tool_call" (ToolCall), "tool_result" ((ToolCall, result)),
+    "turn" (turn number completed) and finally "done" (AgentResult).
+    """
+
+    type: str
+    data: Any
+
+
+@dataclass
+class AgentResult:
+    text: str
+    messages: List[dict]
+    usage: Usage
+    turns: int
+    tool_calls: int
+    stop_reason: str  # "final_answer", "max_turns", "max_tokens" or "max_seconds"
+    elapsed_s: float
+
+
+class ChatModel(Protocol):
+    """Streaming chat model (see ./integrations/providers/ for the adapters)."""
+
+    def stream(self, messages: List[dict], tools: Optional[List[dict]] = None) -> AsyncIterator[ModelEvent]:
+        ...
+
+
+@dataclass
+class Budget:
+    """Limits of one agent run (None = unlimited)."""
+
+    max_turns: int = 8
+    max_tokens: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+
+# --- Tool executors ---
+
+
+def _call_module_tool(module: str, name: str, kwargs: dict) -> Any:
+    # Runs in a worker process: the tool is looked up by reference (Tool objects are not picklable)
+    obj = getattr(importlib.import_module(module), name)
+    return obj.fn(**kwargs) if isinstance(obj, Tool) else obj(**kwargs)
+
+
+class ToolExecutor:
+    """Runs validated tool calls. Subclasses choose where the function runs."""
+
+    async def run(self, tool: Tool, kwargs: dict) -> Any:
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class AsyncExecutor(ToolExecutor):
+    """Coroutine tools are awaited, blocking tools run in the loop's default thread pool."""
+
+    async def run(self, tool: Tool, kwargs: dict) -> Any:
+        if tool.is_async:
+            return await tool.fn(**kwargs)
+        return await asyncio.to_thread(tool.fn, **kwargs)
+
+
+class SyncExecutor(ToolExecutor):
+    """Blocking tools run inline on the event loop: no hand-off cost, but no concurrency."""
+
+    async def run(self, tool: Tool, kwargs: dict) -> Any:
+        if tool.is_async:
+            return await tool.fn(**kwargs)
+        return tool.fn(**kwargs)
+
+
+class PoolExecutor(ToolExecutor):
+    """Blocking tools run in a dedicated thread or process pool."""
+
+    def __init__(self, pool: Executor):
+        self.pool = pool
+        self._processes = isinstance(pool, ProcessPoolExecutor)
+
+    async def run(self, tool: Tool, kwargs: dict) -> Any:
+        if tool.is_async:
+            return await tool.fn(**kwargs)
+        loop = asyncio.get_running_loop()
+        if self._processes:
+            return await loop.run_in_executor(self.pool, _call_module_tool, tool.fn.__module__, tool.fn.__name__, kwargs)
+        return await loop.run_in_executor(self.pool, lambda: tool.fn(**kwargs))
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def make_executor(kind: str = "async", max_workers: Optional[int] = None) -> ToolExecutor:
+    """Executor by name: "async", "sync", "thread" or "process"."""
+    if kind == "async":
+        return AsyncExecutor()
+    if kind == "sync":
+        return SyncExecutor()
+    if kind == "thread":
+        return PoolExecutor(ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent-tool"))
+    if kind == "process":
+        return PoolExecutor(ProcessPoolExecutor(max_workers=max_workers))
+    raise ValueError(f"Unknown executor '{kind}', expected async, sync, thread or process")
+
+
+# --- Engine ---
+
+
+class Agent:
+    """Tool-calling agent running the shared async turn loop."""
+
+    def __init__(
+        self,
+        model: ChatModel,
+        tools: Union[ToolRegistry, Iterable[Any]] = (),
+        system_prompt: Optional[str] = None,
+        budget: Optional[Budget] = None,
+        executor: Union[str, ToolExecutor] = "async",
+        max_concurrent_tools: Optional[int] = None,
+        prefetcher: Optional["Prefetcher"] = None,
+    ):
+        self.model = model
+        self.tools = tools if isinstance(tools, ToolRegistry) else ToolRegistry(tools)
+        self.system_prompt = system_prompt
+        self.budget = budget or Budget()
+        self.executor = make_executor(executor) if isinstance(executor, str) else executor
+        self.max_concurrent_tools = max_concurrent_tools or get_settings().max_concurrent_tools
+        self.prefetcher = prefetcher
+
+    def _initial_messages(self, prompt: Union[str, List[dict]]) -> List[dict]:
+        if isinstance(prompt, list):
+            return list(prompt)
+        messages = [{"role": "system", "content": self.system_prompt}] if self.system_prompt else []
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _initial_variables(self, prompt: Union[str, List[dict]]) -> Dict[str, str]:
+        if isinstance(prompt, str):
+            return {"prompt": prompt}
+        users = [m.get("content") for m in prompt if m.get("role") == "user" and isinstance(m.get("content"), str)]
+        return {"prompt": users[-1]} if users else {}
+
+    async def _run_tool(self, tool: Tool, kwargs: dict, semaphore: asyncio.Semaphore) -> Any:
+        async with semaphore:
+            return await self.executor.run(tool, kwargs)
+
+    async def _call_tool(
+        self,
+        call: ToolCall,
+        semaphore: asyncio.Semaphore,
+        deadline: Optional[float],
+        prefetched: Optional["PrefetchSession"] = None,
+    ) -> Any:
+        try:
+            tool = self.tools[call.name]
+            kwargs = tool.validate(call.arguments)
+            pending = prefetched.take(call.name, kwargs) if prefetched else None
+            if pending is not None:
+                try:
+                    return await _before(pending, deadline)
+                except asyncio.TimeoutError:
+                    raise
+                except Exception:
+                    pass  # Failed prefetch: the call runs again
+            return await _before(self._run_tool(tool, kwargs, semaphore), deadline)
+        except asyncio.TimeoutError:
+            return {"error": f"Tool '{call.name}' stopped: agent time budget exhausted."}
+        except Exception as e:
+            # Returned to the model (unknown tool, invalid arguments, tool failure): it can recover
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    async def astream(self, prompt: Union[str, List[dict]]) -> AsyncIterator[StreamEvent]:
+        """Run the agent, streaming text deltas, tool calls and results. The last event is "done"."""
+        budget = self.budget
+        started = time.monotonic()
+        deadline = started + budget.max_seconds if budget.max_seconds else None
+        messages = self._initial_messages(prompt)
+        schemas = self.tools.openai_schemas or None
+        semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+        prefetched = None
+        if self.prefetcher is not None and schemas:
+            # Started before the first model turn: they run while it streams
+            prefetched = self.prefetcher.start(
+                self._initial_variables(prompt), lambda tool, kwargs: self._run_tool(tool, kwargs, semaphore), self.tools
+            )
+
+        usage, turns, n_tool_calls, text = Usage(), 0, 0, ""
+        stop_reason = "max_turns"
+        try:
+            while turns < budget.max_turns:
+                if budget.max_tokens is not None and usage.total_tokens >= budget.max_tokens:
+                    stop_reason = "max_tokens"
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    stop_reason = "max_seconds"
+                    break
+
+                # --- Model turn ---
+                turns += 1
+                chunks, calls = [], []
+                events = self.model.stream(messages, schemas).__aiter__()
+                try:
+                    while True:
+                        try:
+                            event = await _next_before(events, deadline)
+                        except StopAsyncIteration:
+                            break
+                        if event.type == "text":
+                            chunks.append(event.data)
+                            yield StreamEvent("text", event.data)
+                        elif event.type == "tool_call":
+                            calls.append(event.data)
+                            yield StreamEvent("tool_call", event.data)
+                        elif event.type == "usage":
+                            usage = usage + event.data
+                except asyncio.TimeoutError:
+                    stop_reason = "max_seconds"
+                    text = "".join(chunks) or text
+                    break
+                finally:
+                    if hasattr(events, "aclose"):
+                        await events.aclose()
+
+                text = "".join(chunks)
+                assistant: Dict[str, Any] = {"role": "assistant", "content": text or None}
+                if calls:
+                    assistant["tool_calls"] = [
+                        {"id": c.id, "type": "function", "function": {"name": c.name, "arguments": c.arguments}}
+                        for c in calls
+                    ]
+                messages.append(assistant)
+                yield StreamEvent("turn", turns)
+
+                if not calls:
+                    stop_reason = "final_answer"
+                    break
+
+                # --- Tools: all the calls of the turn run concurrently ---
+                n_tool_calls += len(calls)
+                results = await asyncio.gather(*(self._call_tool(c, semaphore, deadline, prefetched) for c in calls))
+                for call, result in zip(calls, results):
+                    messages.append(
+                        {"role": "tool", "tool_call_id": call.id, "name": call.name, "content": to_json(result)}
+                    )
+                    yield StreamEvent("tool_result", (call, result))
+        finally:
+            # Also when the run fails or the caller stops iterating: no prefetch left running
+            if prefetched is not None:
+                prefetched.close()
+        yield StreamEvent(
+            "done",
+            AgentResult(
+                text=text,
+                messages=messages,
+                usage=usage,
+                turns=turns,
+                tool_calls=n_tool_calls,
+                stop_reason=stop_reason,
+                elapsed_s=time.monotonic() - started,
+            ),
+        )
+
+    async def arun(self, prompt: Union[str, List[dict]]) -> AgentResult:
+        async for event in self.astream(prompt):
+            if event.type == "done":
+                return event.data
+        raise RuntimeError("Agent stream ended without a result.")
+
+    def run(self, prompt: Union[str, List[dict]]) -> AgentResult:
+        """Blocking version of `arun` (not usable inside a running event loop)."""
+        return asyncio.run(self.arun(prompt))
+
+    def close(self):
+        self.executor.shutdown()
+
+
+async def _before(awaitable, deadline: Optional[float]) -> Any:
+    if deadline is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout=max(deadline - time.monotonic(), 0.001))
+
+
+async def _next_before(events: AsyncIterator[ModelEvent], deadline: Optional[float]) -> ModelEvent:
+    """Next model event, or asyncio.TimeoutError once the time budget is exhausted."""
+    if deadline is None:
+        return await events.__anext__()
+    return await asyncio.wait_for(events.__anext__(), timeout=max(deadline - time.monotonic(), 0.001))
@@ -34,6 +34,7 @@ from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
+from agentic_learning.integrations.providers.google_adk import RateLimitPlugin, retry_options
 from agentic_learning.utils.utils import load_env
 import sqlite3
 import asyncio
@@ -147,7 +148,8 @@ def build_db_memory_agent_run(
         runner = Runner(
             agent=chatbot_agent, 
             app_name=app_name, 
-            session_service=session_service
+            session_service=session_service,
+            plugins=[RateLimitPlugin()]
         )
    
     print("✅ Upgraded to persistent sessions!")
@@ -182,7 +184,7 @@ def build_in_memory_agent_run(app_name: str, user_id: str, session_id: str, mode
     session_service = InMemorySessionService()
 
     # Step 3: Create the Runner
-    runner = Runner(agent=root_agent, app_name=app_name, session_service=session_service)
+    runner = Runner(agent=root_agent, app_name=app_name, session_service=session_service, plugins=[RateLimitPlugin()])
 
     print("✅ Stateful agent initialized!")
     print(f"   - Application: {app_name}")
@@ -242,7 +244,7 @@ def build_agent_with_user_state(app_name: str, retry_config: types.HttpRetryOpti
 
     # Set up session service and runner
     session_service = InMemorySessionService()
-    runner = Runner(agent=root_agent, session_service=session_service, app_name=app_name)
+    runner = Runner(agent=root_agent, session_service=session_service, app_name=app_name, plugins=[RateLimitPlugin()])
     return runner
 
 ########################################################################
@@ -252,12 +254,7 @@ if __name__ == "__main__":
     RUN_MODE = "StateTools" # InMemory or DBMemory or CheckDB
     load_env()
 
-    retry_config = types.HttpRetryOptions(
-        attempts=5,  # Maximum retry attempts
-        exp_base=7,  # Delay multiplier
-        initial_delay=1,
-        http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
-    )
+    retry_config = retry_options()
     
     if RUN_MODE ==  "InMemory" : 
         runner = build_in_memory_agent_run(
@@ -0,0 +1,489 @@
+"""
+Long-term (cross-session) semantic memory for Google ADK agents.
+
+Session state (see ./core/google_session_memory.py) only shares a few `user:` keys between
+sessions. This module adds a real memory store that ADK can plug in as its `memory_service`:
+
+    - Conversation snippets are embedded with a pluggable *local* embedding function
+      (default: a hashing bag-of-words embedding, no model download / API call needed).
+    - Embeddings are indexed in an on-disk IVF (inverted file) index built on NumPy:
+        * below `train_threshold` vectors the search is an exact (flat) scan,
+        * above it, k-means centroids are trained once and each query only scans the
+          `nprobe` closest inverted lists.
+    - Inserts are incremental (append-only files), so adding a session never rebuilds the index.
+    - Agents access it through the `recall_memory` tool.
+
+On-disk layout (one directory per app/user scope):
+    index.json    index parameters ({"dim": ...}), checked when the index is reopened
+    vectors.f32   raw float32 matrix (n x dim), appended on every insert
+    meta.jsonl    one JSON line per vector (text, author, timestamp, event id)
+    centroids.npy IVF centroids (only once trained)
+    lists.i32     centroid id of every vector (only once trained)
+"""
+
+# --- Standard library ---
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+# --- Third-party ---
+import numpy as np
+from google.adk.memory import BaseMemoryService
+from google.adk.memory.base_memory_service import SearchMemoryResponse
+from google.adk.memory.memory_entry import MemoryEntry
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+# Batch embedding function: list of texts -> (n, dim) float32 matrix with L2-normalized rows
+EmbeddingFn = Callable[[Sequence[str]], np.ndarray]
+
+_TOKEN_RE = re.compile(r"\w+", flags=re.UNICODE)
+
+
+#### EMBEDDINGS ####
+
+def hashing_embedding(texts: Sequence[str], dim: int = 256) -> np.ndarray:
+    """
+    Local embedding based on feature hashing of unigrams and bigrams (signed hashing trick).
+
+    Cheap, deterministic and dependency-free: good enough for keyword-ish recall.
+    Swap it for a sentence-transformer (or any callable with the same signature) for
+    real semantic similarity.
+
+    Args:
+        texts: Texts to embed.
+        dim: Embedding dimension.
+
+    Returns:
+        np.ndarray: (len(texts), dim) float32 matrix with L2-normalized rows.
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = [t.lower() for t in _TOKEN_RE.findall(text)]
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            matrix[row, h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+#### INDEX ####
+
+class IVFIndex:
+    """
+    Append-only inner-product index persisted in a directory.
+
+    Vectors are expected to be L2-normalized so the inner product is the cosine similarity.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        dim: int,
+        train_threshold: int = 4096,
+        nprobe: int = 8,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.train_threshold = train_threshold
+        self.nprobe = nprobe
+
+        self._lock = threading.Lock()
+        self._vectors = np.empty((0, dim), dtype=np.float32)  # capacity buffer, see _append
+        self._size = 0
+        self._meta: List[Dict[str, Any]] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.empty(0, dtype=np.int32)
+        self._lists: Dict[int, List[int]] = {}
+        self._trained_at = 0
+
+        self._load()
+
+    # --- Persistence ---
+
+    @property
+    def _info_file(self) -> Path:
+        return self.path / "index.json"
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / "vectors.f32"
+
+    @property
+    def _meta_file(self) -> Path:
+        return self.path / "meta.jsonl"
+
+    @property
+    def _centroids_file(self) -> Path:
+        return self.path / "centroids.npy"
+
+    @property
+    def _lists_file(self) -> Path:
+        return self.path / "lists.i32"
+
+    def _load(self):
+        if self._info_file.exists():
+            dim = json.loads(self._info_file.read_text(encoding="utf-8")).get("dim")
+            if dim != self.dim:
+                raise ValueError(f"{self.path} holds {dim}-d vectors, the index was opened with dim={self.dim}.")
+        else:
+            self._info_file.write_text(json.dumps({"dim": self.dim}), encoding="utf-8")
+        if not self._vectors_file.exists():
+            return
+
+        # A torn append leaves a partial vector at the end: keep whole vectors only
+        raw = np.fromfile(self._vectors_file, dtype=np.float32)
+        whole = len(raw) - len(raw) % self.dim
+        vectors = raw[:whole].reshape(-1, self.dim)
+        meta, torn = [], False
+        if self._meta_file.exists():
+            with open(self._meta_file, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        meta.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        torn = True  # Torn last line
+                        break
+
+        # A crash between the two appends leaves one file longer than the other: keep the common prefix
+        n = min(len(vectors), len(meta))
+        self._vectors = vectors[:n].copy()
+        self._size = n
+        self._meta = meta[:n]
+        if len(raw) != n * self.dim:
+            self._vectors.tofile(self._vectors_file)
+        if len(meta) != n or torn:
+            with open(self._meta_file, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(m, ensure_ascii=False) + "\n" for m in self._meta))
+
+        if self._centroids_file.exists() and self._lists_file.exists():
+            assign = np.fromfile(self._lists_file, dtype=np.int32)
+            if len(assign) >= n:
+                self._centroids = np.load(self._centroids_file)
+                self._assign = assign[:n].copy()
+                if len(assign) != n:
+                    self._assign.tofile(self._lists_file)
+                self._rebuild_lists()
+                self._trained_at = n
+
+        # Untrained (or truncated lists file) but already large enough: train now
+        if self._centroids is None and n >= self.train_threshold:
+            self._train()
+
+    def _rebuild_lists(self):
+        self._lists = {}
+        for idx, centroid in enumerate(self._assign.tolist()):
+            self._lists.setdefault(centroid, []).append(idx)
+
+    # --- Insert ---
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _append(self, vectors: np.ndarray):
+        # Amortized O(1) growth: double the buffer instead of re-allocating on every insert
+        needed = self._size + len(vectors)
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors), 64)
+            grown = np.empty((capacity, self.dim), dtype=np.float32)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+        self._vectors[self._size : needed] = vectors
+        self._size = needed
+
+    def add(self, vectors: np.ndarray, metadata: Sequence[Dict[str, Any]]) -> None:
+        """
+        Append vectors and their metadata to the index (and to disk).
+
+        Args:
+            vectors: (n, dim) float32 matrix.
+            metadata: One JSON-serializable dict per vector.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(vectors) != len(metadata):
+            raise ValueError("vectors and metadata must have the same length.")
+        if not len(vectors):
+            return
+
+        with self._lock:
+            start = self._size
+            self._append(vectors)
+            self._meta.extend(metadata)
+
+            with open(self._vectors_file, "ab") as f:
+                vectors.tofile(f)
+            with open(self._meta_file, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(m, ensure_ascii=False) + "\n" for m in metadata))
+
+            if self._centroids is None:
+                if self._size >= self.train_threshold:
+                    self._train()
+            elif self._size >= 16 * self._trained_at:
+                # The data distribution drifted far from the training sample: re-train
+                self._train()
+            else:
+                assign = np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+                self._assign = np.concatenate([self._assign, assign])
+                for offset, centroid in enumerate(assign.tolist()):
+                    self._lists.setdefault(centroid, []).append(start + offset)
+                with open(self._lists_file, "ab") as f:
+                    assign.tofile(f)
+
+    def _train(self, iterations: int = 10, seed: int = 0):
+        """Spherical k-means on (a sample of) the stored vectors, then assign every vector."""
+        data = self._vectors[: self._size]
+        nlist = max(1, int(np.sqrt(self._size)))
+        rng = np.random.default_rng(seed)
+
+        sample = data
+        if len(data) > 64 * nlist:
+            sample = data[rng.choice(len(data), 64 * nlist, replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Keep the previous centroid for empty clusters
+            non_empty = norms[:, 0] > 0
+            centroids[non_empty] = sums[non_empty] / norms[non_empty]
+
+        self._centroids = centroids.astype(np.float32)
+        self._assign = np.argmax(data @ self._centroids.T, axis=1).astype(np.int32)
+        self._rebuild_lists()
+        self._trained_at = self._size
+
+        np.save(self._centroids_file, self._centroids)
+        self._assign.tofile(self._lists_file)
+
+    # --- Search ---
+
+    def search(self, query: np.ndarray, top_k: int = 5) -> List[tuple[float, Dict[str, Any]]]:
+        """
+        Return the `top_k` most similar entries as (score, metadata) pairs, best first.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+
+        with self._lock:
+            if not self._size:
+                return []
+            data = self._vectors[: self._size]
+
+            if self._centroids is None:
+                candidates = None
+                scores = data @ query
+            else:
+                nprobe = min(self.nprobe, len(self._centroids))
+                probe = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+                candidates = np.concatenate(
+                    [np.asarray(self._lists.get(int(c), []), dtype=np.int64) for c in probe]
+                )
+                scores = data[candidates] @ query
+
+            k = min(top_k, len(scores))
+            if not k:
+                return []
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            ids = best if candidates is None else candidates[best]
+            return [(float(scores[b]), self._meta[i]) for b, i in zip(best, ids.tolist())]
+
+
+#### ADK MEMORY SERVICE ####
+
+def _format_timestamp(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+def _scope_dir(name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", name) or "_"
+
+
+class LocalSemanticMemoryService(BaseMemoryService):
+    """
+    ADK `BaseMemoryService` backed by a local embedding function and an on-disk IVF index.
+
+    Memories are isolated per (app_name, user_id), like the built-in memory services.
+    """
+
+    def __init__(
+        self,
+        root_dir: str | os.PathLike,
+        embedding_fn: EmbeddingFn = hashing_embedding,
+        top_k: int = 5,
+        min_score: float = 0.1,
+        train_threshold: int = 4096,
+        nprobe: int = 8,
+    ):
+        self.root_dir = Path(root_dir)
+        self.embedding_fn = embedding_fn
+        self.top_k = top_k
+        self.min_score = min_score
+        self.train_threshold = train_threshold
+        self.nprobe = nprobe
+
+        # Probe the embedding dimension once
+        self.dim = int(np.asarray(self.embedding_fn(["dimension probe"])).shape[1])
+
+        self._lock = threading.Lock()
+        self._indexes: Dict[tuple[str, str], IVFIndex] = {}
+        self._seen_ids: Dict[tuple[str, str], set] = {}
+
+    def _index(self, app_name: str, user_id: str) -> IVFIndex:
+        key = (app_name, user_id)
+        with self._lock:
+            if key not in self._indexes:
+                index = IVFIndex(
+                    self.root_dir / _scope_dir(app_name) / _scope_dir(user_id),
+                    dim=self.dim,
+                    train_threshold=self.train_threshold,
+                    nprobe=self.nprobe,
+                )
+                self._indexes[key] = index
+                self._seen_ids[key] = {m.get("event_id") for m in index._meta}
+            return self._indexes[key]
+
+    def _add_events(self, app_name: str, user_id: str, events: Iterable[Any], session_id: str | None):
+        index = self._index(app_name, user_id)
+        seen = self._seen_ids[(app_name, user_id)]
+
+        texts, metadata = [], []
+        for event in events:
+            if not event.content or not event.content.parts or event.id in seen:
+                continue
+            text = " ".join(part.text for part in event.content.parts if part.text).strip()
+            if not text:
+                continue
+            seen.add(event.id)
+            texts.append(text)
+            metadata.append(
+                {
+                    "event_id": event.id,
+                    "session_id": session_id,
+                    "author": event.author,
+                    "role": event.content.role,
+                    "timestamp": event.timestamp,
+                    "text": text,
+                }
+            )
+
+        if texts:
+            index.add(np.asarray(self.embedding_fn(texts), dtype=np.float32), metadata)
+
+    async def add_session_to_memory(self, session) -> None:
+        # Only the events not ingested yet are embedded, so re-adding a session is incremental
+        self._add_events(session.app_name, session.user_id, session.events, session.id)
+
+    async def add_events_to_memory(
+        self, *, app_name: str, user_id: str, events, session_id: str | None = None, custom_metadata=None
+    ) -> None:
+        self._add_events(app_name, user_id, events, session_id)
+
+    async def search_memory(self, *, app_name: str, user_id: str, query: str) -> SearchMemoryResponse:
+        index = self._index(app_name, user_id)
+        query_vector = np.asarray(self.embedding_fn([query]), dtype=np.float32)[0]
+
+        memories = []
+        for score, meta in index.search(query_vector, top_k=self.top_k):
+            if score < self.min_score:
+                continue
+            memories.append(
+                MemoryEntry(
+                    id=meta.get("event_id"),
+                    author=meta.get("author"),
+                    timestamp=_format_timestamp(meta.get("timestamp")),
+                    content=types.Content(role=meta.get("role") or "user", parts=[types.Part(text=meta["text"])]),
+                    custom_metadata={"score": score, "session_id": meta.get("session_id")},
+                )
+            )
+        return SearchMemoryResponse(memories=memories)
+
+
+#### TOOL ####
+
+async def recall_memory(query: str, tool_context: ToolContext) -> Dict[str, Any]:
+    """
+    Recall facts from previous conversations with the user (long-term memory).
+
+    Args:
+        query: What to look for, e.g. "user's favorite programming language".
+
+    Returns:
+        A dictionary with the matching memory snippets, best match first.
+    """
+    response = await tool_context.search_memory(query)
+    memories = [
+        {
+            "author": m.author,
+            "text": " ".join(p.text for p in m.content.parts if p.text),
+            "score": round(m.custom_metadata.get("score", 0.0), 3),
+        }
+        for m in response.memories
+    ]
+    return {"status": "success", "memories": memories}
+
+
+#### MAIN ####
+
+if __name__ == "__main__":
+    import asyncio
+
+    from google.adk.agents import LlmAgent
+    from google.adk.models.google_llm import Gemini
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from loguru import logger
+
+    from agentic_learning.integrations.providers.google_adk import RateLimitPlugin, retry_options
+    from agentic_learning.utils.utils import load_env
+
+    load_env()
+
+    retry_config = retry_options()
+
+    memory_service = LocalSemanticMemoryService(os.path.join(os.path.dirname(__file__), "memory_store"))
+    session_service = InMemorySessionService()
+
+    agent = LlmAgent(
+        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+        name="memory_chat_bot",
+        instruction="""You are a helpful assistant with long-term memory.
+        When the user refers to something said in a previous conversation, use the `recall_memory` tool.""",
+        tools=[recall_memory],
+    )
+    runner = Runner(
+        agent=agent,
+        app_name="memory_demo",
+        session_service=session_service,
+        memory_service=memory_service,
+        plugins=[RateLimitPlugin()],
+    )
+
+    async def chat(session_id: str, query: str):
+        await session_service.create_session(app_name="memory_demo", user_id="default", session_id=session_id)
+        content = types.Content(role="user", parts=[types.Part(text=query)])
+        async for event in runner.run_async(user_id="default", session_id=session_id, new_message=content):
+            if event.is_final_response() and event.content:
+                logger.info(f"[{session_id}] {event.content.parts[0].text}")
+
+        # Ingest the finished session into long-term memory
+        session = await session_service.get_session(app_name="memory_demo", user_id="default", session_id=session_id)
+        await memory_service.add_session_to_memory(session)
+
+    async def main():
+        await chat("session-1", "My favorite programming language is Rust and I live in Abu Dhabi.")
+        await chat("session-2", "Which programming language do I like?")
+
+    asyncio.run(main())
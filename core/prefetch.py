@@ -0,0 +1,366 @@
+"""
+Speculative tool calls: run the likely tool calls of an agent while its first model turn is
+still in flight.
+
+Research agents almost always start with the same calls (`arxiv_search_tool` and/or
+`tavily_search_tool` with the user topic), but they only run once the first model turn is
+complete. A Prefetcher learns which calls runs make and starts them as soon as the prompt is
+known; when the model requests a matching call, the result is already there (or on its way).
+
+    - PredictionTable: learned from traces (the calls of past runs). A call is stored as a
+      template: string arguments equal to a run variable (the prompt, the task) become
+      `{"$var": name}`, the others are kept as-is. Probability of a template = runs making
+      the call / runs observed. Saved as JSON. Calls with literal arguments (a query the
+      model wrote) rarely repeat: past `max_templates` templates, the ones seen in a single
+      run are pruned first, then the rarest, so the table stays bounded.
+    - Prefetcher: predicts the calls of a run (probability >= `min_probability`, at most
+      `max_prefetch`), launches them, serves the matching calls and learns from every run.
+      Calls match on (tool name, arguments with defaults applied, strings compared
+      case / whitespace insensitively). Unused prefetches are cancelled (or discarded) at
+      the end of the run and counted as wasted.
+
+Two integration points:
+    - The agent engine (./core/agent.py): `Agent(..., prefetcher=Prefetcher())`.
+    - Tool functions called by another loop (aisuite): `prefetcher.wrap(tool)` + a session:
+
+        tools = [prefetcher.wrap(t) for t in (arxiv_search_tool, tavily_search_tool)]
+        with prefetcher.session({"task": task}, tools):
+            client.chat.completions.create(..., tools=tools)
+"""
+
+# --- Standard library ---
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# --- Third-party ---
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.core.tool import Tool, ToolRegistry, as_tool
+from agentic_learning.utils.config import get_settings
+
+Call = Tuple[str, Dict[str, Any]]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def call_key(name: str, kwargs: Dict[str, Any]) -> str:
+    """Matching key of a call (strings compared case / whitespace insensitively)."""
+    return json.dumps([name, _normalize(kwargs)], sort_keys=True, default=str)
+
+
+def _template(kwargs: Dict[str, Any], variables: Dict[str, str]) -> Dict[str, Any]:
+    normalized = {name: _normalize(value) for name, value in variables.items() if value}
+    template = {}
+    for arg, value in kwargs.items():
+        match = next((name for name, var in normalized.items() if _normalize(value) == var), None)
+        template[arg] = {"$var": match} if isinstance(value, str) and match else value
+    return template
+
+
+def _instantiate(template: Dict[str, Any], variables: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    kwargs = {}
+    for arg, value in template.items():
+        if isinstance(value, dict) and set(value) == {"$var"}:
+            if not variables.get(value["$var"]):
+                return None
+            value = variables[value["$var"]]
+        kwargs[arg] = value
+    return kwargs
+
+
+def calls_of(messages: List[dict], registry: Optional[ToolRegistry] = None) -> List[Call]:
+    """Tool calls of a trace (OpenAI chat messages), arguments validated by `registry` if given."""
+    calls = []
+    for message in messages:
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call["function"]
+            try:
+                if registry is not None:
+                    kwargs = registry[function["name"]].validate(function["arguments"])
+                else:
+                    kwargs = json.loads(function["arguments"] or "{}")
+            except Exception:
+                continue  # Unknown tool or invalid arguments: the call failed, nothing to learn
+            calls.append((function["name"], kwargs))
+    return calls
+
+
+class PredictionTable:
+    """Call templates and the number of runs that made them (at most `max_templates`)."""
+
+    def __init__(self, runs: int = 0, counts: Optional[Dict[str, int]] = None, max_templates: int = 1000):
+        self.runs = runs
+        self.counts: Counter = Counter(counts or {})
+        self.max_templates = max_templates
+        self._lock = threading.Lock()
+        if len(self.counts) > max_templates:
+            self._prune()
+
+    def observe(self, calls: Iterable[Call], variables: Dict[str, str]):
+        """Learn from the calls of one run."""
+        templates = {json.dumps([name, _template(kwargs, variables)], sort_keys=True, default=str) for name, kwargs in calls}
+        with self._lock:
+            self.runs += 1
+            self.counts.update(templates)
+            if len(self.counts) > self.max_templates:
+                self._prune()
+
+    def _prune(self):
+        # One-off templates first (probability 1 / runs, far below any threshold), then the rarest
+        before = len(self.counts)
+        self.counts = Counter({key: count for key, count in self.counts.items() if count > 1})
+        if len(self.counts) > self.max_templates:
+            self.counts = Counter(dict(self.counts.most_common(self.max_templates)))
+        logger.debug(f"Prediction table pruned: {before} -> {len(self.counts)} templates")
+
+    def observe_messages(self, messages: List[dict], variables: Dict[str, str], registry: Optional[ToolRegistry] = None):
+        self.observe(calls_of(messages, registry), variables)
+
+    def predict(self, variables: Dict[str, str], min_probability: float = 0.5, limit: int = 4) -> List[Tuple[str, Dict[str, Any], float]]:
+        """Likely calls of a run: (tool name, arguments, probability), most likely first."""
+        with self._lock:
+            if not self.runs:
+                return []
+            ranked = [(key, count / self.runs) for key, count in self.counts.most_common()]
+        predictions, seen = [], set()
+        for key, probability in ranked:
+            if probability < min_probability or len(predictions) >= limit:
+                break
+            name, template = json.loads(key)
+            kwargs = _instantiate(template, variables)
+            if kwargs is None or call_key(name, kwargs) in seen:
+                continue
+            seen.add(call_key(name, kwargs))
+            predictions.append((name, kwargs, probability))
+        return predictions
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {"runs": self.runs, "max_templates": self.max_templates, "counts": dict(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: dict, max_templates: Optional[int] = None) -> "PredictionTable":
+        """Table from `to_dict` data (`max_templates` overrides the saved cap)."""
+        if max_templates is None:
+            max_templates = data.get("max_templates", 1000)
+        return cls(data.get("runs", 0), data.get("counts", {}), max_templates)
+
+    @classmethod
+    def from_traces(
+        cls,
+        traces: Iterable[Tuple[List[dict], Dict[str, str]]],
+        registry: Optional[ToolRegistry] = None,
+        max_templates: int = 1000,
+    ) -> "PredictionTable":
+        """Table learned from (messages, variables) traces."""
+        table = cls(max_templates=max_templates)
+        for messages, variables in traces:
+            table.observe_messages(messages, variables, registry)
+        return table
+
+    def save(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path: str | Path, max_templates: Optional[int] = None) -> "PredictionTable":
+        """Table saved at `path`, empty if there is none (`max_templates` overrides the saved cap)."""
+        path = Path(path)
+        if not path.exists():
+            return cls() if max_templates is None else cls(max_templates=max_templates)
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), max_templates)
+
+
+_current: contextvars.ContextVar[Optional["PrefetchSession"]] = contextvars.ContextVar("prefetch_session", default=None)
+
+
+class PrefetchSession:
+    """Prefetched calls of one run."""
+
+    def __init__(self, prefetcher: "Prefetcher", variables: Dict[str, str]):
+        self.prefetcher = prefetcher
+        self.variables = variables
+        self.predictions = prefetcher.table.predict(variables, prefetcher.min_probability, prefetcher.max_prefetch)
+        self.calls: List[Call] = []
+        self._pending: Dict[str, Any] = {}  # call key -> asyncio.Task | concurrent Future
+        self._lock = threading.Lock()
+
+    def launch(self, start: Callable[[str, Dict[str, Any]], Any]):
+        """Start the predicted calls: `start(name, kwargs)` returns a Task or Future (None: skipped)."""
+        for name, kwargs, probability in self.predictions:
+            pending = start(name, kwargs)
+            if pending is not None:
+                self._pending[call_key(name, kwargs)] = pending
+                logger.debug(f"Prefetching {name}({kwargs}) p={probability:.2f}")
+        self.prefetcher._count("launched", len(self._pending))
+
+    def take(self, name: str, kwargs: Dict[str, Any]):
+        """The prefetched Task / Future of this call (removed from the session), or None."""
+        with self._lock:
+            self.calls.append((name, kwargs))
+            pending = self._pending.pop(call_key(name, kwargs), None)
+        if pending is not None:
+            self.prefetcher._count("hits")
+        return pending
+
+    def close(self, learn: bool = True):
+        """Cancel the unused prefetches and learn from the calls of the run."""
+        with self._lock:
+            unused, self._pending = list(self._pending.values()), {}
+        for pending in unused:
+            pending.cancel()
+            if isinstance(pending, asyncio.Task) and pending.done() and not pending.cancelled():
+                pending.exception()  # Retrieved: no "exception was never retrieved" warning
+        self.prefetcher._count("wasted", len(unused))
+        if learn:
+            self.prefetcher.learn(self.calls, self.variables)
+
+
+class Prefetcher:
+    """Predicts, launches and serves the likely tool calls of agent runs (see the module docstring)."""
+
+    def __init__(
+        self,
+        table: Optional[PredictionTable] = None,
+        path: Optional[str | Path] = None,
+        min_probability: float = 0.6,
+        max_prefetch: int = 4,
+    ):
+        """
+        Args:
+            table: Prediction table (default: loaded from `path`, or empty).
+            path: JSON file of the table, saved after every learned run (None: in memory only).
+            min_probability: Minimum share of past runs making a call to prefetch it.
+            max_prefetch: Maximum number of calls prefetched per run.
+        """
+        self.path = Path(path) if path else None
+        self.table = table or (PredictionTable.load(self.path) if self.path else PredictionTable())
+        self.min_probability = min_probability
+        self.max_prefetch = max_prefetch
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self.stats[name] += n
+
+    def learn(self, calls: Iterable[Call], variables: Dict[str, str]):
+        self.table.observe(calls, variables)
+        if self.path:
+            try:
+                self.table.save(self.path)
+            except OSError as e:
+                logger.warning(f"Prediction table not saved to {self.path}: {e}")
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=get_settings().max_concurrent_tools, thread_name_prefix="prefetch"
+                )
+            return self._pool
+
+    # --- Agent engine (asyncio) ---
+
+    def start(self, variables: Dict[str, str], run: Callable[[Tool, Dict[str, Any]], Awaitable[Any]], registry: ToolRegistry) -> PrefetchSession:
+        """Session whose predicted calls run as tasks of the running loop (`run(tool, kwargs)`)."""
+        session = PrefetchSession(self, variables)
+
+        def start_task(name: str, kwargs: Dict[str, Any]):
+            if name not in registry:
+                return None
+            tool = registry[name]
+            try:
+                kwargs = tool.validate(kwargs)
+            except ValueError:
+                return None
+            return asyncio.ensure_future(run(tool, kwargs))
+
+        session.launch(start_task)
+        return session
+
+    # --- Wrapped tool functions (threads) ---
+
+    @contextmanager
+    def session(self, variables: Dict[str, str], tools: Iterable[Any] = ()) -> Iterator[PrefetchSession]:
+        """
+        Prefetch in threads for the wrapped tools called in the block (same thread / context).
+
+        Args:
+            variables: Run variables (e.g. {"task": task}).
+            tools: Tools that may be prefetched (wrapped or not).
+        """
+        by_name = {tool.name: tool for tool in map(as_tool, tools)}
+        session = PrefetchSession(self, variables)
+
+        def start_future(name: str, kwargs: Dict[str, Any]):
+            tool = by_name.get(name)
+            if tool is None:
+                return None
+            fn = getattr(tool.fn, "__prefetch_target__", tool.fn)
+            return self.pool.submit(fn, **kwargs)
+
+        session.launch(start_future)
+        token = _current.set(session)
+        try:
+            yield session
+        finally:
+            _current.reset(token)
+            session.close()
+
+    def wrap(self, fn: "Tool | Callable") -> "Tool | Callable":
+        """Tool function answering from the current session's prefetches (same name, schema, doc)."""
+        target = fn.fn if isinstance(fn, Tool) else fn
+        signature = inspect.signature(target)
+        name = fn.name if isinstance(fn, Tool) else fn.__name__
+
+        @functools.wraps(target)
+        def wrapper(*args, **kwargs):
+            session = _current.get()
+            if session is None:
+                return target(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            pending = session.take(name, dict(bound.arguments))
+            if isinstance(pending, Future):
+                try:
+                    return pending.result()
+                except Exception:
+                    pass  # Failed prefetch: the model gets a fresh call
+            return target(*args, **kwargs)
+
+        wrapper.__prefetch_target__ = target
+        return Tool(wrapper, name=name, description=fn.description) if isinstance(fn, Tool) else wrapper
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,245 @@
+"""
+Tool abstraction shared by the agents of the repository.
+
+A plain function becomes a `Tool` with the `@tool` decorator. Everything an LLM tool call needs is
+derived ONCE, when the module defining the tool is imported:
+
+    - the JSON schema of the parameters (from the signature type hints and defaults),
+    - the descriptions (first paragraph of the docstring, and its Google style `Args:` section),
+    - a pydantic model of the arguments, whose compiled validator checks and coerces the
+      arguments of every call (`'5'` -> `5` for an int parameter, missing/extra fields rejected).
+
+The schema can never drift from the code, and a call costs one validation + one dict lookup:
+
+    @tool
+    def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
+        \"\"\"
+        Searches for research papers on arXiv by query string.
+
+        Args:
+            query (str): Search keywords for research papers.
+            max_results (int): Maximum number of results to return.
+        \"\"\"
+
+    arxiv_search_tool.openai_schema      # {"type": "function", "function": {...}}, cached
+    registry = ToolRegistry([arxiv_search_tool, ...])
+    registry.dispatch("arxiv_search_tool", '{"query": "agents"}')   # validated call
+
+A `Tool` is still a regular callable with the signature and docstring of its function, so it can
+be given as is to aisuite or wrapped in an ADK FunctionTool.
+"""
+
+# --- Standard library ---
+import asyncio
+import functools
+import inspect
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# --- Third-party ---
+from pydantic import ConfigDict, ValidationError, create_model
+
+# Parameters injected by the caller (never part of the schema, never sent by the model)
+INJECTED_PARAMS = {"self", "cls", "tool_context", "callback_context"}
+
+_ARGS_SECTION_RE = re.compile(r"^\s*(Args|Arguments|Parameters)\s*:\s*$")
+_SECTION_RE = re.compile(r"^\s*(Returns|Return|Raises|Yields|Examples?|Notes?)\s*:\s*$")
+_ARG_LINE_RE = re.compile(r"^\s*(\*{0,2}\w+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$")
+
+
+class ToolArgumentsError(ValueError):
+    """The arguments of a tool call do not match the tool schema."""
+
+
+def parse_docstring(doc: Optional[str]) -> Tuple[str, Dict[str, str]]:
+    """
+    Split a Google style docstring into (description, {parameter: description}).
+
+    The description is the first paragraph; parameter descriptions may span several lines.
+    """
+    lines = inspect.cleandoc(doc or "").splitlines()
+    description_lines, params = [], {}
+    current, in_args, in_description = None, False, True
+
+    for line in lines:
+        if _ARGS_SECTION_RE.match(line):
+            in_args, in_description = True, False
+            continue
+        if _SECTION_RE.match(line):
+            in_args, in_description, current = False, False, None
+            continue
+        if in_args:
+            match = _ARG_LINE_RE.match(line)
+            if match and not line.startswith(" " * 8):
+                current = match.group(1).lstrip("*")
+                params[current] = match.group(3).strip()
+            elif current and line.strip():
+                params[current] = f"{params[current]} {line.strip()}".strip()
+        elif in_description:
+            if not line.strip() and description_lines:
+                in_description = False
+            elif line.strip():
+                description_lines.append(line.strip())
+
+    return " ".join(description_lines), params
+
+
+def _strip_titles(schema: Any) -> Any:
+    # pydantic adds a "title" to every field: noise in a tool schema (and in the prompt tokens)
+    if isinstance(schema, dict):
+        return {k: _strip_titles(v) for k, v in schema.items() if not (k == "title" and isinstance(v, str))}
+    if isinstance(schema, list):
+        return [_strip_titles(v) for v in schema]
+    return schema
+
+
+class Tool:
+    """A function with a cached JSON schema and a compiled argument validator."""
+
+    def __init__(self, fn: Callable, name: Optional[str] = None, description: Optional[str] = None):
+        self.fn = fn
+        self.name = name or fn.__name__
+        functools.update_wrapper(self, fn)
+        self.is_async = inspect.iscoroutinefunction(fn)
+
+        doc_description, param_docs = parse_docstring(fn.__doc__)
+        self.description = description or doc_description or self.name
+
+        signature = inspect.signature(fn)
+        fields = {}
+        self.injected = set()
+        for param in signature.parameters.values():
+            if param.name in INJECTED_PARAMS:
+                self.injected.add(param.name)
+                continue
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                continue
+            annotation = Any if param.annotation is inspect.Parameter.empty else param.annotation
+            default = ... if param.default is inspect.Parameter.empty else param.default
+            fields[param.name] = (annotation, default)
+
+        # Built once: pydantic compiles the validator of the model
+        self.arguments_model = create_model(
+            f"{self.name}_arguments",
+            __config__=ConfigDict(extra="forbid", arbitrary_types_allowed=True),
+            **fields,
+        )
+        self._validator = self.arguments_model.__pydantic_validator__
+
+        parameters = _strip_titles(self.arguments_model.model_json_schema())
+        parameters.pop("additionalProperties", None)
+        for name, prop in parameters.get("properties", {}).items():
+            if name in param_docs:
+                prop["description"] = param_docs[name]
+        parameters.setdefault("required", [])
+        self.parameters: Dict[str, Any] = parameters
+
+        self.openai_schema: Dict[str, Any] = {
+            "type": "function",
+            "function": {"name": self.name, "description": self.description, "parameters": parameters},
+        }
+
+    def __repr__(self) -> str:
+        return f"Tool({self.name})"
+
+    def __call__(self, *args, **kwargs):
+        return self.fn(*args, **kwargs)
+
+    def __get__(self, instance, owner):
+        # Decorated methods stay bound methods
+        return self if instance is None else functools.partial(self.__call__, instance)
+
+    @property
+    def anthropic_schema(self) -> Dict[str, Any]:
+        return {"name": self.name, "description": self.description, "input_schema": self.parameters}
+
+    def validate(self, arguments: "Dict[str, Any] | str | bytes | None") -> Dict[str, Any]:
+        """Validate (and coerce) call arguments, given as a dict or as the JSON string of the model."""
+        try:
+            if isinstance(arguments, (str, bytes)):
+                validated = self._validator.validate_json(arguments or "{}")
+            else:
+                validated = self._validator.validate_python(arguments or {})
+        except ValidationError as e:
+            errors = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'arguments'}: {err['msg']}" for err in e.errors())
+            raise ToolArgumentsError(f"Invalid arguments for tool '{self.name}': {errors}") from None
+        return validated.__dict__
+
+    def invoke(self, arguments: "Dict[str, Any] | str | None" = None, **injected) -> Any:
+        """Validated call. `injected` holds the non-schema parameters (e.g. tool_context)."""
+        return self.fn(**self.validate(arguments), **injected)
+
+    async def ainvoke(self, arguments: "Dict[str, Any] | str | None" = None, **injected) -> Any:
+        """Validated call from a coroutine; blocking tools run in a worker thread."""
+        kwargs = self.validate(arguments)
+        if self.is_async:
+            return await self.fn(**kwargs, **injected)
+        return await asyncio.to_thread(self.fn, **kwargs, **injected)
+
+
+def tool(fn: Optional[Callable] = None, *, name: Optional[str] = None, description: Optional[str] = None):
+    """
+    Decorator turning a function into a `Tool` (usable as `@tool` or `@tool(name=...)`).
+    """
+    if fn is None:
+        return functools.partial(tool, name=name, description=description)
+    return Tool(fn, name=name, description=description)
+
+
+def as_tool(obj: "Tool | Callable") -> Tool:
+    return obj if isinstance(obj, Tool) else Tool(obj)
+
+
+class ToolRegistry:
+    """Tools by name: schema lists computed once, O(1) dispatch of model tool calls."""
+
+    def __init__(self, tools: Iterable["Tool | Callable"] = ()):
+        self._tools: Dict[str, Tool] = {}
+        self._schemas: Optional[List[dict]] = None
+        for t in tools:
+            self.register(t)
+
+    def register(self, t: "Tool | Callable") -> Tool:
+        t = as_tool(t)
+        self._tools[t.name] = t
+        self._schemas = None
+        return t
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def __getitem__(self, name: str) -> Tool:
+        try:
+            return self._tools[name]
+        except KeyError:
+            raise KeyError(f"Unknown tool '{name}'. Available tools: {', '.join(self._tools)}") from None
+
+    def __iter__(self):
+        return iter(self._tools.values())
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._tools)
+
+    @property
+    def openai_schemas(self) -> List[dict]:
+        """Tool definitions for the OpenAI `tools=` parameter (built once)."""
+        if self._schemas is None:
+            self._schemas = [t.openai_schema for t in self._tools.values()]
+        return self._schemas
+
+    def dispatch(self, name: str, arguments: "Dict[str, Any] | str | None" = None, **injected) -> Any:
+        """Validate the arguments of a model tool call and run the tool."""
+        return self[name].invoke(arguments, **injected)
+
+    async def adispatch(self, name: str, arguments: "Dict[str, Any] | str | None" = None, **injected) -> Any:
+        return await self[name].ainvoke(arguments, **injected)
+
+
+def to_json(result: Any) -> str:
+    """Serialize a tool result for a `tool` message (non JSON types as strings)."""
+    return json.dumps(result, ensure_ascii=False, default=str)
@@ -0,0 +1,317 @@
+"""
+Record / replay ("cassette") layer for evaluations.
+
+Evaluations such as `find_references` (./evaluation/web_search_eval.py) or the ADK evaluation
+agents (./evaluation/google_adk/) hit live APIs on every run: slow and nondeterministic.
+
+A cassette intercepts HTTP at the transport level, so every client is covered without
+touching its code:
+    - `requests` (Tavily, arXiv, Wikipedia)           -> requests.adapters.HTTPAdapter.send
+    - `httpx` sync/async (OpenAI, Anthropic, Gemini)  -> httpx.HTTPTransport / AsyncHTTPTransport
+
+Modes:
+    - "record": always call the network and record the interactions,
+    - "replay": never call the network; a request missing from the cassette raises CassetteMiss,
+    - "auto":   replay when the request is in the cassette, otherwise call the network and record.
+
+Matching:
+    - "exact": key = hash of (method, URL, canonical body). Secrets (api keys in the query string
+      or in a JSON body) are removed and volatile values (dates by default) are masked first.
+      Identical requests recorded several times are replayed in the recorded order.
+    - "fuzzy": if there is no exact match, the most similar recorded request on the same
+      method + host + path is used (difflib similarity >= `fuzzy_threshold`).
+
+Storage: one gzip-compressed JSON line per interaction, appended as it happens (crash safe),
+indexed in memory when the cassette is opened.
+
+Usage:
+    with Cassette("cassettes/find_references.jsonl.gz", mode="auto"):
+        result = find_references(task)
+
+NOTE: streamed responses are recorded once fully read (they are replayed as a single chunk),
+and async Gemini calls must go through httpx (not aiohttp) to be captured.
+"""
+
+# --- Standard library ---
+import base64
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import zlib
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# --- Third-party ---
+import httpx
+import requests
+from loguru import logger
+from requests.structures import CaseInsensitiveDict
+
+# Never written to a cassette
+SECRET_FIELDS = {"key", "api_key", "apikey", "access_token", "token"}
+
+# Masked before matching: today's date is part of several prompts
+DEFAULT_IGNORE_PATTERNS = (r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?",)
+
+# Headers describing the wire encoding: the recorded content is already decoded
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie", "connection"}
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request is not in the cassette."""
+
+
+def _strip_secrets(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_secrets(v) for k, v in value.items() if k.lower() not in SECRET_FIELDS}
+    if isinstance(value, list):
+        return [_strip_secrets(v) for v in value]
+    return value
+
+
+def _canonical_url(url: str) -> str:
+    parts = urlsplit(str(url))
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_FIELDS)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+
+def _canonical_body(body: Optional[bytes | str]) -> str:
+    if not body:
+        return ""
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return "sha256:" + hashlib.sha256(body).hexdigest()
+    try:
+        return json.dumps(_strip_secrets(json.loads(body)), sort_keys=True, ensure_ascii=False)
+    except (json.JSONDecodeError, TypeError):
+        return body
+
+
+class Cassette:
+    """Record / replay HTTP interactions of `requests` and `httpx` clients."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "auto",
+        match: str = "exact",
+        fuzzy_threshold: float = 0.9,
+        ignore_patterns: Sequence[str] = DEFAULT_IGNORE_PATTERNS,
+    ):
+        if mode not in ("record", "replay", "auto"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if match not in ("exact", "fuzzy"):
+            raise ValueError(f"Unknown match mode: {match}")
+        self.path = path
+        self.mode = mode
+        self.match = match
+        self.fuzzy_threshold = fuzzy_threshold
+        self._ignore = [re.compile(p) for p in ignore_patterns]
+
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, List[dict]] = defaultdict(list)
+        self._by_route: Dict[str, List[dict]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._patches: List[tuple] = []
+        self.stats = {"replayed": 0, "recorded": 0, "fuzzy": 0}
+        self._load()
+
+    # --- Storage ---
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        loaded = 0
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # Torn last line of an interrupted recording
+                    loaded += 1
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            # Torn gzip member of an interrupted recording: keep the interactions read before it
+            logger.warning(f"Cassette {self.path}: truncated after {loaded} interactions ({type(e).__name__}: {e})")
+
+    def _index(self, entry: dict):
+        self._by_key[entry["key"]].append(entry)
+        self._by_route[entry["route"]].append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._by_key.values())
+
+    def _append(self, entry: dict):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Each append is a new gzip member: concatenated members are a valid gzip file
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    # --- Matching ---
+
+    def _request_key(self, method: str, url: str, body) -> tuple[str, str, str]:
+        url = _canonical_url(url)
+        body = _canonical_body(body)
+        for pattern in self._ignore:
+            body = pattern.sub("<masked>", body)
+            url = pattern.sub("<masked>", url)
+        parts = urlsplit(url)
+        route = f"{method.upper()} {parts.netloc}{parts.path}"
+        signature = f"{method.upper()} {url}\n{body}"
+        return hashlib.sha256(signature.encode("utf-8")).hexdigest(), route, signature
+
+    def _lookup(self, key: str, route: str, signature: str) -> Optional[dict]:
+        with self._lock:
+            entries = self._by_key.get(key)
+            if entries:
+                # Same request recorded several times: replay in order, then repeat the last one
+                i = min(self._served[key], len(entries) - 1)
+                self._served[key] += 1
+                return entries[i]
+
+            if self.match != "fuzzy":
+                return None
+            best, best_score = None, self.fuzzy_threshold
+            for entry in self._by_route.get(route, []):
+                matcher = SequenceMatcher(None, signature, entry["signature"], autojunk=False)
+                if matcher.real_quick_ratio() < best_score or matcher.quick_ratio() < best_score:
+                    continue
+                score = matcher.ratio()
+                if score >= best_score:
+                    best, best_score = entry, score
+            if best is not None:
+                self.stats["fuzzy"] += 1
+            return best
+
+    def _find(self, method: str, url: str, body) -> tuple[Optional[dict], tuple]:
+        request_key = self._request_key(method, url, body)
+        if self.mode == "record":
+            return None, request_key
+        entry = self._lookup(*request_key)
+        if entry is None and self.mode == "replay":
+            raise CassetteMiss(f"No recorded interaction for {method} {_canonical_url(url)} in {self.path}")
+        if entry is not None:
+            self.stats["replayed"] += 1
+        return entry, request_key
+
+    def _record(self, request_key: tuple, status: int, headers, content: bytes):
+        key, route, signature = request_key
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+        entry = {
+            "key": key,
+            "route": route,
+            "signature": signature,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() not in _DROPPED_RESPONSE_HEADERS},
+            **body,
+        }
+        with self._lock:
+            self._index(entry)
+            self._append(entry)
+            self.stats["recorded"] += 1
+
+    @staticmethod
+    def _content(entry: dict) -> bytes:
+        if "base64" in entry:
+            return base64.b64decode(entry["base64"])
+        return entry["text"].encode("utf-8")
+
+    # --- requests ---
+
+    def _requests_send(self, original):
+        cassette = self
+
+        def send(adapter, request, **kwargs):
+            entry, request_key = cassette._find(request.method, request.url, request.body)
+            if entry is not None:
+                response = requests.Response()
+                response.status_code = entry["status"]
+                response.reason = http.client.responses.get(entry["status"], "")
+                response.headers = CaseInsensitiveDict(entry["headers"])
+                response._content = cassette._content(entry)
+                response._content_consumed = True
+                response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+                response.url = request.url
+                response.request = request
+                return response
+
+            response = original(adapter, request, **kwargs)
+            cassette._record(request_key, response.status_code, response.headers, response.content)
+            return response
+
+        return send
+
+    # --- httpx ---
+
+    def _httpx_response(self, entry: dict, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(entry["status"], headers=entry["headers"], content=self._content(entry), request=request)
+
+    def _httpx_send(self, original):
+        cassette = self
+
+        def handle_request(transport, request):
+            entry, request_key = cassette._find(request.method, str(request.url), request.read())
+            if entry is not None:
+                return cassette._httpx_response(entry, request)
+
+            response = original(transport, request)
+            content = response.read()
+            response.close()
+            cassette._record(request_key, response.status_code, response.headers, content)
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_RESPONSE_HEADERS}
+            return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+        return handle_request
+
+    def _httpx_async_send(self, original):
+        cassette = self
+
+        async def handle_async_request(transport, request):
+            entry, request_key = cassette._find(request.method, str(request.url), await request.aread())
+            if entry is not None:
+                return cassette._httpx_response(entry, request)
+
+            response = await original(transport, request)
+            content = await response.aread()
+            await response.aclose()
+            cassette._record(request_key, response.status_code, response.headers, content)
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_RESPONSE_HEADERS}
+            return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+        return handle_async_request
+
+    # --- Activation ---
+
+    def __enter__(self):
+        targets = [
+            (requests.adapters.HTTPAdapter, "send", self._requests_send),
+            (httpx.HTTPTransport, "handle_request", self._httpx_send),
+            (httpx.AsyncHTTPTransport, "handle_async_request", self._httpx_async_send),
+        ]
+        for owner, name, factory in targets:
+            original = getattr(owner, name)
+            self._patches.append((owner, name, original))
+            setattr(owner, name, factory(original))
+        return self
+
+    def __exit__(self, *exc):
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            setattr(owner, name, original)
+        logger.info(f"Cassette {self.path}: {self.stats}")
+
+
+def use_cassette(path: str, mode: Optional[str] = None, match: str = "exact", **kwargs) -> Cassette:
+    """Cassette whose mode defaults to the AGENTIC_CASSETTE_MODE env var (or 'auto')."""
+    return Cassette(path, mode=mode or os.getenv("AGENTIC_CASSETTE_MODE", "auto"), match=match, **kwargs)
@@ -0,0 +1,156 @@
+"""
+Compiled domain matcher used to score research results against an allowlist of preferred domains.
+
+The naive check `any(td in domain for td in TOP_DOMAINS)` is O(urls x domains) substring
+scanning and gives false positives (`notmit.edu` contains `mit.edu`). Here the allowlist is
+compiled once into a reversed-label suffix trie:
+
+    mit.edu, arxiv.org, nasa.gov  ->  {"edu": {"mit": END}, "org": {"arxiv": END}, "gov": {"nasa": END}}
+
+A host matches when walking its labels from the right reaches an END marker, so matching is
+O(number of labels), independent of the allowlist size, and only happens on label boundaries
+(`cs.mit.edu` matches `mit.edu`, `notmit.edu` does not).
+
+Public-suffix awareness: entries that are public suffixes (`co.uk`, `github.io`, a bare TLD...)
+are rejected at compile time, since allowlisting them would allowlist every site registered
+under them. A small built-in suffix set is used by default; the full Public Suffix List
+(https://publicsuffix.org/list/public_suffix_list.dat) can be loaded with `load_public_suffix_list`.
+
+Batches of URLs are scored at once with a per-host cache, so logs with millions of URLs
+(and a long tail of repeated hosts) only walk the trie once per distinct host.
+"""
+
+# --- Standard library ---
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+
+# Multi-label public suffixes commonly seen in search results (the bare TLDs are handled separately)
+DEFAULT_PUBLIC_SUFFIXES = {
+    "co.uk", "ac.uk", "gov.uk", "org.uk", "nhs.uk",
+    "com.au", "edu.au", "gov.au", "org.au",
+    "co.jp", "ac.jp", "go.jp",
+    "co.in", "ac.in", "gov.in",
+    "com.br", "gov.br", "com.cn", "edu.cn", "gov.cn",
+    "co.kr", "ac.kr", "co.nz", "ac.nz", "co.za", "ac.za",
+    "github.io", "gitlab.io", "blogspot.com", "herokuapp.com", "netlify.app", "vercel.app",
+    "pages.dev", "web.app", "firebaseapp.com", "appspot.com", "azurewebsites.net", "cloudfront.net",
+}
+
+_END = ""  # Trie terminal marker (never a valid label)
+
+
+def load_public_suffix_list(path: str) -> Set[str]:
+    """
+    Read a Public Suffix List file.
+
+    Simplified: a wildcard rule ("*.ck") keeps its parent ("ck") and exception rules
+    ("!www.ck", registrable domains) are skipped.
+    """
+    suffixes = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split()[0] if line.strip() else ""  # A rule ends at the first whitespace
+            if not line or line.startswith("//") or line.startswith("!"):
+                continue
+            if line.startswith("*."):
+                line = line[2:]
+            suffixes.add(line.lower())
+    return suffixes
+
+
+def normalize_host(host: str) -> str:
+    """Lowercase, strip a trailing dot and a leading 'www.'/'*.'."""
+    host = host.strip().lower().rstrip(".")
+    for prefix in ("*.", "www."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+
+def host_of(url: str) -> str:
+    """Extract the host of a URL (scheme, userinfo, port, path, query and fragment removed)."""
+    rest = url.split("://", 1)[-1]
+    end = len(rest)
+    for sep in "/?#":
+        i = rest.find(sep)
+        if i != -1 and i < end:
+            end = i
+    netloc = rest[:end].rsplit("@", 1)[-1]
+    if netloc.startswith("["):  # IPv6 literal
+        return netloc.split("]", 1)[0] + "]"
+    return normalize_host(netloc.split(":", 1)[0])
+
+
+class DomainMatcher:
+    """Allowlist of domains compiled into a reversed-label suffix trie."""
+
+    def __init__(
+        self,
+        domains: Iterable[str] = (),
+        public_suffixes: Optional[Set[str]] = None,
+        host_cache_size: int = 1 << 16,
+    ):
+        self.public_suffixes = DEFAULT_PUBLIC_SUFFIXES if public_suffixes is None else public_suffixes
+        self._trie: Dict[str, dict] = {}
+        self.domains: Set[str] = set()
+        self.rejected: Set[str] = set()
+        for domain in domains:
+            self.add(domain)
+        self.match_host = lru_cache(maxsize=host_cache_size)(self._match_host)
+
+    def add(self, domain: str) -> bool:
+        """Add a domain (and implicitly all its subdomains). Returns False if it was rejected."""
+        domain = normalize_host(domain)
+        if "." not in domain or domain in self.public_suffixes:
+            logger.warning(f"Domain '{domain}' is a public suffix, not added to the allowlist.")
+            self.rejected.add(domain)
+            return False
+
+        node = self._trie
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node[_END] = domain
+        self.domains.add(domain)
+        if hasattr(self, "match_host"):
+            self.match_host.cache_clear()
+        return True
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def __contains__(self, host: str) -> bool:
+        return self.match_host(normalize_host(host)) is not None
+
+    def _match_host(self, host: str) -> Optional[str]:
+        """Return the allowlisted domain covering `host` (closest to the root), or None."""
+        node = self._trie
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                return None
+            if _END in node:
+                return node[_END]
+        return None
+
+    def match_url(self, url: str) -> Optional[str]:
+        return self.match_host(host_of(url))
+
+    def match_urls(self, urls: Iterable[str]) -> List[bool]:
+        """Score a batch of URLs: True for each URL whose host is allowlisted."""
+        match_host = self.match_host
+        return [match_host(host_of(url)) is not None for url in urls]
+
+
+@lru_cache(maxsize=8)
+def compile_domains(domains: frozenset) -> DomainMatcher:
+    """Compile (and memoize) a matcher for a set of domains."""
+    return DomainMatcher(domains)
+
+
+def as_matcher(domains) -> DomainMatcher:
+    """Accept a DomainMatcher or any iterable of domains."""
+    if isinstance(domains, DomainMatcher):
+        return domains
+    return compile_domains(frozenset(domains))
@@ -0,0 +1,252 @@
+"""
+Parallel evaluation runner for the web search component evaluation (./evaluation/web_search_eval.py).
+
+Instead of one hard-coded research task, the runner:
+
+1- loads a suite of tasks from a JSONL file, one task per line:
+       {"id": "agentic-eval-1", "task": "Find 2 recent papers about ...", "min_ratio": 0.4}
+   (`id` defaults to the line number, `min_ratio` to the runner default)
+2- runs `find_references` for the tasks concurrently with a bounded thread pool
+   (the calls are I/O bound: LLM + Tavily/arXiv/Wikipedia requests),
+3- appends every finished task to a JSONL checkpoint, so an interrupted run resumes where it
+   stopped (tasks already in the checkpoint are skipped, except the ones that ended with an
+   error, which run again unless `--keep-errors` is given),
+4- aggregates pass rate, preferred-domain ratio distribution and latency percentiles,
+5- optionally saves the run to the results store (./evaluation/results_store.py) to compare runs.
+
+Usage:
+    python -m agentic_learning.evaluation.eval_runner suite.jsonl --checkpoint run.jsonl --workers 16
+    python -m agentic_learning.evaluation.eval_runner suite.jsonl --store evaluation_results.duckdb
+    # Offline rerun from recorded interactions (see ./evaluation/cassette.py)
+    python -m agentic_learning.evaluation.eval_runner suite.jsonl --cassette run.jsonl.gz --cassette-mode replay
+"""
+
+# --- Standard library ---
+import argparse
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# --- Third-party ---
+import numpy as np
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.evaluation.cassette import use_cassette
+from agentic_learning.evaluation.results_store import ResultsStore
+from agentic_learning.evaluation.web_search_eval import TOP_DOMAIN_MATCHER, find_references, score_tavily_results
+
+
+def load_suite(path: str) -> List[Dict[str, Any]]:
+    """Load a JSONL task suite (blank lines and lines starting with '#' are ignored)."""
+    tasks = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            task = json.loads(line)
+            if "task" not in task:
+                raise ValueError(f"{path}:{line_no}: missing 'task' field.")
+            task.setdefault("id", str(line_no))
+            tasks.append(task)
+    return tasks
+
+
+def load_checkpoint(path: Optional[str], include_errors: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Return the records already in a checkpoint file, by task id (a torn last line is ignored).
+
+    The last record of a task wins; a task whose last record has an `error` is left out (to be
+    run again) unless `include_errors` is set.
+    """
+    records = {}
+    if not path or not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[str(record["id"])] = record
+    if not include_errors:
+        records = {task_id: record for task_id, record in records.items() if record.get("error") is None}
+    return records
+
+
+def evaluate_task(
+    task: Dict[str, Any],
+    run_fn: Callable[[str], str],
+    domains=TOP_DOMAIN_MATCHER,
+    min_ratio: float = 0.4,
+) -> Dict[str, Any]:
+    """
+    Run one task and score its result. Errors are recorded, never raised.
+
+    `run_fn` returns the result text, or (text, usage) to also record the token usage.
+    """
+    started = time.perf_counter()
+    usage = {}
+    try:
+        result = run_fn(task["task"])
+        if isinstance(result, tuple):  # find_references(..., return_usage=True)
+            result, usage = result
+        error = result if isinstance(result, str) and result.startswith("[Model Error") else None
+    except Exception as e:
+        result, error = "", f"{type(e).__name__}: {e}"
+    latency = time.perf_counter() - started
+
+    urls, preferred, ratio = score_tavily_results(domains, result or "")
+    threshold = task.get("min_ratio", min_ratio)
+    return {
+        "id": str(task["id"]),
+        "task": task["task"],
+        "passed": bool(urls) and error is None and ratio >= threshold,
+        "ratio": ratio,
+        "min_ratio": threshold,
+        "total_urls": len(urls),
+        "preferred_urls": int(sum(preferred)),
+        "urls": urls,
+        "preferred": preferred,
+        "latency_s": latency,
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "error": error,
+    }
+
+
+def run_suite(
+    tasks: Iterable[Dict[str, Any]],
+    run_fn: Callable[[str], str] = find_references,
+    checkpoint_path: Optional[str] = None,
+    max_workers: int = 8,
+    domains=TOP_DOMAIN_MATCHER,
+    min_ratio: float = 0.4,
+    retry_errors: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate all the tasks concurrently, checkpointing every result.
+
+    Args:
+        tasks: Tasks as loaded by `load_suite`.
+        run_fn: Function producing the research result of a task (default: find_references).
+        checkpoint_path: JSONL file receiving one record per finished task (enables resume).
+        max_workers: Maximum number of tasks running at the same time.
+        domains: Preferred domains (set or DomainMatcher).
+        min_ratio: Default pass threshold of the preferred-domain ratio.
+        retry_errors: Run again the checkpointed tasks that ended with an error.
+
+    Returns:
+        list[dict]: One record per task (including the ones restored from the checkpoint).
+    """
+    tasks = list(tasks)
+    done = load_checkpoint(checkpoint_path, include_errors=not retry_errors)
+    pending = [t for t in tasks if str(t["id"]) not in done]
+    logger.info(f"{len(tasks)} tasks, {len(tasks) - len(pending)} restored from checkpoint, {len(pending)} to run.")
+
+    lock = threading.Lock()
+    checkpoint = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(evaluate_task, task, run_fn, domains, min_ratio) for task in pending
+            ]
+            for n, future in enumerate(as_completed(futures), start=1):
+                record = future.result()
+                with lock:
+                    done[record["id"]] = record
+                    if checkpoint:
+                        checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        checkpoint.flush()
+                if n % 50 == 0 or n == len(futures):
+                    logger.info(f"{n}/{len(futures)} tasks evaluated.")
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    return [done[str(t["id"])] for t in tasks if str(t["id"]) in done]
+
+
+def aggregate(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Pass rate, ratio distribution and latency percentiles of a list of task records."""
+    if not records:
+        return {"tasks": 0}
+
+    ratios = np.array([r["ratio"] for r in records], dtype=float)
+    latencies = np.array([r["latency_s"] for r in records], dtype=float)
+    histogram, edges = np.histogram(ratios, bins=10, range=(0.0, 1.0))
+
+    return {
+        "tasks": len(records),
+        "passed": int(sum(r["passed"] for r in records)),
+        "errors": int(sum(r["error"] is not None for r in records)),
+        "pass_rate": float(np.mean([r["passed"] for r in records])),
+        "ratio": {
+            "mean": float(ratios.mean()),
+            "min": float(ratios.min()),
+            "p10": float(np.percentile(ratios, 10)),
+            "p50": float(np.percentile(ratios, 50)),
+            "p90": float(np.percentile(ratios, 90)),
+            "max": float(ratios.max()),
+            "histogram": {f"{lo:.1f}-{hi:.1f}": int(c) for lo, hi, c in zip(edges[:-1], edges[1:], histogram)},
+        },
+        "latency_s": {
+            "mean": float(latencies.mean()),
+            "p50": float(np.percentile(latencies, 50)),
+            "p90": float(np.percentile(latencies, 90)),
+            "p95": float(np.percentile(latencies, 95)),
+            "p99": float(np.percentile(latencies, 99)),
+            "max": float(latencies.max()),
+        },
+    }
+
+
+#### MAIN ####
+
+if __name__ == "__main__":
+    from agentic_learning.utils import utils
+
+    parser = argparse.ArgumentParser(description="Run the web search evaluation over a JSONL task suite.")
+    parser.add_argument("suite", help="JSONL file with one {'id', 'task', 'min_ratio'} object per line.")
+    parser.add_argument("--checkpoint", help="JSONL checkpoint file (resumes if it exists).")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--model", default="openai:gpt-4o")
+    parser.add_argument("--min-ratio", type=float, default=0.4)
+    parser.add_argument("--keep-errors", action="store_true", help="Do not rerun checkpointed tasks that failed.")
+    parser.add_argument("--cassette", help="Record/replay every HTTP call in this cassette file (.jsonl.gz).")
+    parser.add_argument("--cassette-mode", choices=["record", "replay", "auto"], default=None)
+    parser.add_argument("--match", choices=["exact", "fuzzy"], default="exact")
+    parser.add_argument("--store", help="DuckDB results store receiving the run (see results_store.py).")
+    parser.add_argument("--run-id", help="Run id in the results store (generated by default).")
+    args = parser.parse_args()
+
+    utils.load_env()
+
+    # Replaying a cassette makes reruns offline, fast and deterministic
+    recording = use_cassette(args.cassette, args.cassette_mode, args.match) if args.cassette else contextlib.nullcontext()
+    with recording:
+        records = run_suite(
+            load_suite(args.suite),
+            run_fn=functools.partial(find_references, model=args.model, return_usage=True),
+            checkpoint_path=args.checkpoint,
+            max_workers=args.workers,
+            min_ratio=args.min_ratio,
+            retry_errors=not args.keep_errors,
+        )
+    logger.info(json.dumps(aggregate(records), indent=2))
+
+    if args.store:
+        with ResultsStore(args.store) as store:
+            store.save_run(
+                records,
+                run_id=args.run_id,
+                model=args.model,
+                suite=args.suite,
+                metadata={"workers": args.workers, "min_ratio": args.min_ratio, "cassette": args.cassette},
+            )
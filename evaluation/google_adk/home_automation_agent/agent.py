@@ -1,15 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
 
-from google.genai import types
+from agentic_learning.integrations.providers.google_adk import retry_options
 
 # Configure Model Retry on errors
-retry_config = types.HttpRetryOptions(
-    attempts=5,  # Maximum retry attempts
-    exp_base=7,  # Delay multiplier
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
-)
+retry_config = retry_options()
 
 def set_device_status(location: str, device_id: str, status: str) -> dict:
     """Sets the status of a smart home device.
@@ -0,0 +1,456 @@
+"""
+Local evaluation engine for ADK evalsets (the agents of ./home_automation_agent and ./research_agent).
+
+`adk eval` calls Gemini for every turn of every case, one case after the other. This engine runs
+the cases of an evalset concurrently, each in its own session of ONE shared runner, against a
+mock model backend, so large evalsets run in CI time without any Gemini call:
+
+    backend="reference"  The model replays the reference trajectory of the case (expected tool
+                         calls, then the expected final response). It checks the agent plumbing:
+                         tools exist, accept the recorded arguments and run without error.
+    backend="record"     The real models are called once and every model response is recorded
+                         (per case and per agent) in a JSON recordings file.
+    backend="replay"     The recorded model responses are replayed: the agent behaves as the real
+                         model did, deterministically and offline (the CI mode).
+
+The agent is built once per (agent module, backend): its models (sub-agents and AgentTool
+agents included) are swapped for the mock backend on a clone, and the clone is cached.
+
+Scores are computed for all the invocations of the evalset at once:
+    - tool_trajectory_avg_score: exact match of the tool call sequence (name + arguments),
+      tool calls hashed into an (invocations x calls) int matrix compared row-wise,
+    - tool_name_recall: fraction of the expected calls made with the right tool at the right step,
+    - response_match_score: cosine similarity of the expected / actual final responses embedded
+      with the local hashing embedding (../../core/memory.py).
+Pass thresholds come from a `test_config.json` next to the evalset (ADK format), if any.
+
+Usage:
+    python -m agentic_learning.evaluation.google_adk.local_eval \
+        agentic_learning.evaluation.google_adk.home_automation_agent \
+        evaluation/google_adk/home_automation_agent/home_automation.evalset.json --concurrency 32
+"""
+
+# --- Standard library ---
+import argparse
+import asyncio
+import copy
+import functools
+import hashlib
+import importlib
+import json
+import os
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+# --- Third-party ---
+import numpy as np
+from google.adk.agents import LlmAgent
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.evaluation.eval_case import EvalCase, Invocation, get_all_tool_calls
+from google.adk.evaluation.eval_set import EvalSet
+from google.adk.models._capabilities import LlmCapabilities
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.core.memory import hashing_embedding
+
+BACKENDS = ("reference", "record", "replay")
+
+DEFAULT_CRITERIA = {"tool_trajectory_avg_score": 1.0, "response_match_score": 0.7}
+
+_APP_NAME = "local_eval"
+
+
+class ScriptExhausted(RuntimeError):
+    """The recorded responses of an agent ran out: the agent diverged from the recording."""
+
+
+@dataclass
+class _CaseRun:
+    """Per-case state read by the mock models (one per concurrently running case)."""
+
+    eval_id: str
+    root_agent: str
+    conversation: List[Invocation]
+    recorded: Dict[str, List[dict]] = field(default_factory=dict)
+    recording: Dict[str, List[dict]] = field(default_factory=lambda: defaultdict(list))
+    invocation: int = 0
+    calls: Dict[str, int] = field(default_factory=lambda: defaultdict(int))  # agent -> calls in the case
+    turn_calls: int = 0  # Root agent calls in the current invocation
+
+    def start_invocation(self, index: int):
+        self.invocation = index
+        self.turn_calls = 0
+
+
+# Each case runs in its own asyncio task, hence its own context: the shared (cached) agents
+# find the state of the case they are serving here
+_current_case: ContextVar[_CaseRun] = ContextVar("local_eval_case")
+
+
+def _text_response(text: str) -> LlmResponse:
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+class ScriptedLlm(BaseLlm):
+    """Mock model: plays the recorded responses of the case, or its reference trajectory."""
+
+    agent_name: str
+
+    @property
+    def capabilities(self) -> LlmCapabilities:
+        return LlmCapabilities(output_schema_and_tools=True)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        case = _current_case.get()
+        step = case.calls[self.agent_name]
+        case.calls[self.agent_name] += 1
+
+        recorded = case.recorded.get(self.agent_name)
+        if recorded is not None:
+            if step >= len(recorded):
+                raise ScriptExhausted(f"{case.eval_id}: no recorded response #{step} for agent {self.agent_name}")
+            yield LlmResponse.model_validate(recorded[step])
+            return
+
+        if self.agent_name != case.root_agent:
+            # Sub-agents have no reference trajectory: answer with a canned text
+            yield _text_response(f"[{self.agent_name}] mock response.")
+            return
+
+        # Reference trajectory: the expected tool calls one by one, then the expected final response
+        expected = case.conversation[case.invocation]
+        tool_uses = get_all_tool_calls(expected.intermediate_data)
+        k = case.turn_calls
+        case.turn_calls += 1
+        if k < len(tool_uses):
+            call = tool_uses[k]
+            yield LlmResponse(
+                content=types.Content(
+                    role="model",
+                    parts=[types.Part(function_call=types.FunctionCall(name=call.name, args=call.args or {}))],
+                )
+            )
+        else:
+            yield _text_response(_content_text(expected.final_response))
+
+
+class RecordingLlm(BaseLlm):
+    """Calls the real model and records its responses in the current case."""
+
+    agent_name: str
+    inner: BaseLlm
+
+    @property
+    def capabilities(self) -> LlmCapabilities:
+        return self.inner.capabilities
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        case = _current_case.get()
+        async for response in self.inner.generate_content_async(llm_request, stream=False):
+            case.recording[self.agent_name].append(response.model_dump(mode="json", exclude_none=True))
+            yield response
+
+
+# --- Agent preparation (cached) ---
+
+def _swap_models(agent: BaseAgent, make_model: Callable[[LlmAgent], BaseLlm]) -> BaseAgent:
+    """Clone an agent tree, replacing the model of every LlmAgent (AgentTool agents included)."""
+    update: Dict[str, Any] = {"sub_agents": [_swap_models(sub, make_model) for sub in agent.sub_agents]}
+    if isinstance(agent, LlmAgent):
+        update["model"] = make_model(agent)
+        tools = []
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                tool = copy.copy(tool)
+                tool.agent = _swap_models(tool.agent, make_model)
+            tools.append(tool)
+        update["tools"] = tools
+    return agent.clone(update=update)
+
+
+def _mock_model(backend: str, agent: LlmAgent) -> BaseLlm:
+    # Keep the real model name: built-in tools (google_search...) check it
+    name = agent.canonical_model.model
+    if backend == "record":
+        return RecordingLlm(model=name, agent_name=agent.name, inner=agent.canonical_model)
+    return ScriptedLlm(model=name, agent_name=agent.name)
+
+
+@functools.lru_cache(maxsize=16)
+def prepare_agent(agent_module: str, backend: str = "reference") -> BaseAgent:
+    """
+    Import `<agent_module>.agent.root_agent` (or `<agent_module>.root_agent`) and return a clone
+    wired to the mock backend. Cached: the agent tree is built once for all the cases.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+    module = importlib.import_module(agent_module)
+    root = getattr(getattr(module, "agent", module), "root_agent", None)
+    if root is None:
+        raise AttributeError(f"{agent_module} has no root_agent")
+    return _swap_models(root, functools.partial(_mock_model, backend))
+
+
+# --- Evalset I/O ---
+
+def load_eval_set(path: str) -> EvalSet:
+    with open(path, encoding="utf-8") as f:
+        return EvalSet.model_validate_json(f.read())
+
+
+def load_criteria(eval_set_path: str) -> Dict[str, float]:
+    """Thresholds from the `test_config.json` next to the evalset (ADK format), or the defaults."""
+    config_path = os.path.join(os.path.dirname(os.path.abspath(eval_set_path)), "test_config.json")
+    criteria = dict(DEFAULT_CRITERIA)
+    if os.path.exists(config_path):
+        with open(config_path, encoding="utf-8") as f:
+            for name, value in json.load(f).get("criteria", {}).items():
+                # ADK also accepts {"threshold": x} objects
+                criteria[name] = value["threshold"] if isinstance(value, dict) else value
+    return criteria
+
+
+def load_recordings(path: Optional[str]) -> Dict[str, Dict[str, List[dict]]]:
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["cases"]
+
+
+def save_recordings(path: str, eval_set_id: str, recordings: Dict[str, Dict[str, List[dict]]]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"eval_set_id": eval_set_id, "cases": recordings}, f, indent=1)
+
+
+def _content_text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text and not part.thought)
+
+
+# --- Running ---
+
+async def _run_case(
+    runner: InMemoryRunner,
+    case: EvalCase,
+    recorded: Dict[str, List[dict]],
+    semaphore: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    async with semaphore:
+        case_run = _CaseRun(
+            eval_id=case.eval_id,
+            root_agent=runner.agent.name,
+            conversation=case.conversation,
+            recorded=recorded,
+        )
+        _current_case.set(case_run)  # Task-local: each case runs in its own task
+        session_input = case.session_input
+        user_id = session_input.user_id if session_input else "eval_user"
+        session = await runner.session_service.create_session(
+            app_name=_APP_NAME, user_id=user_id, state=dict(session_input.state) if session_input else {}
+        )
+
+        started = time.perf_counter()
+        actual, error = [], None
+        try:
+            for i, invocation in enumerate(case.conversation):
+                case_run.start_invocation(i)
+                tool_calls, final_text = [], ""
+                async for event in runner.run_async(
+                    user_id=user_id, session_id=session.id, new_message=invocation.user_content
+                ):
+                    tool_calls.extend(event.get_function_calls())
+                    if event.is_final_response() and event.content:
+                        final_text = _content_text(event.content) or final_text
+                actual.append({"tool_calls": tool_calls, "response": final_text})
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.warning(f"Case {case.eval_id} failed: {error}")
+
+        # Cases that failed halfway are scored on empty invocations
+        actual += [{"tool_calls": [], "response": ""}] * (len(case.conversation) - len(actual))
+        return {
+            "eval_id": case.eval_id,
+            "actual": actual,
+            "error": error,
+            "latency_s": time.perf_counter() - started,
+            "recording": dict(case_run.recording),
+        }
+
+
+async def run_eval_set(
+    agent_module: str,
+    eval_set: EvalSet,
+    backend: str = "reference",
+    recordings: Optional[Dict[str, Dict[str, List[dict]]]] = None,
+    concurrency: int = 16,
+) -> List[Dict[str, Any]]:
+    """Run all the cases of an evalset concurrently (one session each) on a shared runner."""
+    runner = InMemoryRunner(agent=prepare_agent(agent_module, backend), app_name=_APP_NAME)
+    recordings = recordings or {}
+    if backend == "replay":
+        missing = [c.eval_id for c in eval_set.eval_cases if c.eval_id not in recordings]
+        if missing:
+            raise KeyError(f"No recording for the cases: {', '.join(missing)}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(
+            _run_case(runner, case, recordings.get(case.eval_id, {}) if backend == "replay" else {}, semaphore)
+            for case in eval_set.eval_cases
+        )
+    )
+
+
+# --- Scoring (vectorized over all the invocations) ---
+
+def _call_id(name: str, args: Optional[dict]) -> int:
+    canonical = json.dumps([name, args or {}], sort_keys=True, default=str)
+    return int.from_bytes(hashlib.blake2b(canonical.encode("utf-8"), digest_size=7).digest(), "little")
+
+
+def _call_matrix(trajectories: List[List[tuple]], width: int, with_args: bool) -> np.ndarray:
+    matrix = np.full((len(trajectories), width), -1, dtype=np.int64)
+    for row, calls in enumerate(trajectories):
+        for col, (name, args) in enumerate(calls):
+            matrix[row, col] = _call_id(name, args if with_args else None)
+    return matrix
+
+
+def trajectory_scores(expected: List[List[tuple]], actual: List[List[tuple]]) -> Dict[str, np.ndarray]:
+    """
+    Score tool trajectories, one row per invocation. Calls are (name, args) tuples.
+
+    Returns:
+        dict: "exact" (1.0 if the sequences are identical) and "name_recall" (fraction of the
+              expected calls made with the right tool at the right step) arrays.
+    """
+    expected_len = np.array([len(t) for t in expected])
+    actual_len = np.array([len(t) for t in actual])
+    width = int(max(expected_len.max(initial=0), actual_len.max(initial=0), 1))
+
+    exact_match = _call_matrix(expected, width, True) == _call_matrix(actual, width, True)
+    exact = (exact_match.all(axis=1) & (expected_len == actual_len)).astype(float)
+
+    expected_names = _call_matrix(expected, width, False)
+    name_hits = ((expected_names == _call_matrix(actual, width, False)) & (expected_names != -1)).sum(axis=1)
+    name_recall = np.where(expected_len > 0, name_hits / np.maximum(expected_len, 1), (actual_len == 0).astype(float))
+    return {"exact": exact, "name_recall": name_recall}
+
+
+def response_scores(expected: List[str], actual: List[str]) -> np.ndarray:
+    """Row-wise cosine similarity of the hashing embeddings (1.0 when both responses are empty)."""
+    similarity = np.sum(hashing_embedding(expected) * hashing_embedding(actual), axis=1)
+    both_empty = np.array([not e.strip() and not a.strip() for e, a in zip(expected, actual)])
+    return np.clip(np.where(both_empty, 1.0, similarity), 0.0, 1.0)
+
+
+def score_results(
+    eval_set: EvalSet, results: List[Dict[str, Any]], criteria: Dict[str, float] = DEFAULT_CRITERIA
+) -> List[Dict[str, Any]]:
+    """Per-case scores (mean over the case invocations) and pass/fail against `criteria`."""
+    expected_calls, actual_calls, expected_text, actual_text, owner = [], [], [], [], []
+    for case_index, (case, result) in enumerate(zip(eval_set.eval_cases, results)):
+        for invocation, run in zip(case.conversation, result["actual"]):
+            expected_calls.append([(c.name, c.args) for c in get_all_tool_calls(invocation.intermediate_data)])
+            actual_calls.append([(c.name, c.args) for c in run["tool_calls"]])
+            expected_text.append(_content_text(invocation.final_response))
+            actual_text.append(run["response"])
+            owner.append(case_index)
+
+    n_cases = len(results)
+    owner = np.array(owner, dtype=np.int64)
+    counts = np.maximum(np.bincount(owner, minlength=n_cases), 1)
+
+    def per_case(values: np.ndarray) -> np.ndarray:
+        return np.bincount(owner, weights=values, minlength=n_cases) / counts
+
+    trajectories = trajectory_scores(expected_calls, actual_calls)
+    trajectory = per_case(trajectories["exact"])
+    name_recall = per_case(trajectories["name_recall"])
+    response = per_case(response_scores(expected_text, actual_text))
+
+    scored = []
+    for i, result in enumerate(results):
+        passed = (
+            result["error"] is None
+            and trajectory[i] >= criteria.get("tool_trajectory_avg_score", 1.0)
+            and response[i] >= criteria.get("response_match_score", 0.7)
+        )
+        scored.append({
+            "eval_id": result["eval_id"],
+            "passed": bool(passed),
+            "tool_trajectory_avg_score": float(trajectory[i]),
+            "tool_name_recall": float(name_recall[i]),
+            "response_match_score": float(response[i]),
+            "latency_s": result["latency_s"],
+            "error": result["error"],
+        })
+    return scored
+
+
+def evaluate(
+    agent_module: str,
+    eval_set_path: str,
+    backend: str = "reference",
+    recordings_path: Optional[str] = None,
+    concurrency: int = 16,
+) -> List[Dict[str, Any]]:
+    """Run and score an evalset file (see module docstring for the backends)."""
+    # Checked before running: the record backend makes paid model calls
+    if backend == "record" and not recordings_path:
+        raise ValueError("The record backend needs a recordings path.")
+    eval_set = load_eval_set(eval_set_path)
+    recordings = load_recordings(recordings_path) if backend == "replay" else {}
+    results = asyncio.run(run_eval_set(agent_module, eval_set, backend, recordings, concurrency))
+
+    if backend == "record":
+        save_recordings(recordings_path, eval_set.eval_set_id, {r["eval_id"]: r["recording"] for r in results})
+        logger.info(f"Recorded the model responses of {len(results)} cases to {recordings_path}")
+
+    return score_results(eval_set, results, load_criteria(eval_set_path))
+
+
+#### MAIN ####
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run an ADK evalset locally with a mock model backend.")
+    parser.add_argument("agent_module", help="Agent package, e.g. agentic_learning.evaluation.google_adk.home_automation_agent")
+    parser.add_argument("eval_set", help="Path of the .evalset.json file.")
+    parser.add_argument("--backend", choices=BACKENDS, default="reference")
+    parser.add_argument("--recordings", help="Model responses file (written by 'record', read by 'replay').")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.backend == "record":
+        from agentic_learning.utils.utils import load_env
+        load_env()
+
+    started = time.perf_counter()
+    scores = evaluate(args.agent_module, args.eval_set, args.backend, args.recordings, args.concurrency)
+    elapsed = time.perf_counter() - started
+
+    for s in scores:
+        status = "✅ PASS" if s["passed"] else "❌ FAIL"
+        logger.info(
+            f"{status} {s['eval_id']}: trajectory={s['tool_trajectory_avg_score']:.2f} "
+            f"tool_recall={s['tool_name_recall']:.2f} response={s['response_match_score']:.2f}"
+            + (f" error={s['error']}" if s["error"] else "")
+        )
+    passed = sum(s["passed"] for s in scores)
+    logger.info(f"{passed}/{len(scores)} cases passed in {elapsed:.2f}s")
@@ -3,14 +3,13 @@ from google.adk.models.google_llm import Gemini
 from google.adk.tools.agent_tool import AgentTool
 from google.adk.tools.google_search_tool import google_search
 
-from google.genai import types
 from typing import List
 from google.adk.runners import InMemoryRunner
 from google.adk.plugins.logging_plugin import (
     LoggingPlugin,
 )  # <---- 1. Import the Plugin
-from google.genai import types
 import asyncio
+from agentic_learning.integrations.providers.google_adk import RateLimitPlugin, retry_options
 from agentic_learning.utils.utils import load_env
 from google.adk.plugins.base_plugin import BasePlugin
 from google.adk.agents.base_agent import BaseAgent
@@ -59,45 +58,47 @@ class CountInvocationPlugin(BasePlugin):
         logging.info(f"[Plugin] LLM request count: {self.llm_request_count}")
 
 
-#### Main Section ###
-if __name__ == "__main__":
-    load_env()
+#### Agents ###
 
-    retry_config = types.HttpRetryOptions(
-        attempts=5,  # Maximum retry attempts
-        exp_base=7,  # Delay multiplier
-        initial_delay=1,
-        http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
-    )
+# Module level `root_agent`, as expected by the ADK tooling (adk web / adk eval) and by the
+# local evaluation engine (../local_eval.py)
+retry_config = retry_options()
 
-    # Google search agent
-    google_search_agent = LlmAgent(
-        name="google_search_agent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-        description="Searches for information using Google search",
-        instruction="Use the google_search tool to find information on the given topic. Return the raw search results.",
-        tools=[google_search],
-    )
+# Google search agent
+google_search_agent = LlmAgent(
+    name="google_search_agent",
+    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+    description="Searches for information using Google search",
+    instruction="Use the google_search tool to find information on the given topic. Return the raw search results.",
+    tools=[google_search],
+)
 
-    # Root agent
-    research_agent_with_plugin = LlmAgent(
-        name="research_paper_finder_agent",
-        model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
-        instruction="""Your task is to find research papers and count them. 
-      
-      You must follow these steps:
-      1) Find research papers on the user provided topic using the 'google_search_agent'. 
-      2) Then, pass the papers to 'count_papers' tool to count the number of papers returned.
-      3) Return both the list of research papers and the total number of papers.
-      """,
-        tools=[AgentTool(agent=google_search_agent), count_papers],
-    )
+# Root agent
+research_agent_with_plugin = LlmAgent(
+    name="research_paper_finder_agent",
+    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+    instruction="""Your task is to find research papers and count them. 
+  
+  You must follow these steps:
+  1) Find research papers on the user provided topic using the 'google_search_agent'. 
+  2) Then, pass the papers to 'count_papers' tool to count the number of papers returned.
+  3) Return both the list of research papers and the total number of papers.
+  """,
+    tools=[AgentTool(agent=google_search_agent), count_papers],
+)
 
+root_agent = research_agent_with_plugin
+
+
+#### Main Section ###
+if __name__ == "__main__":
+    load_env()
 
     runner = InMemoryRunner(
         agent=research_agent_with_plugin,
         plugins=[
             LoggingPlugin(), # Built-in Plugin 
+            RateLimitPlugin(),  # Shared Gemini rate limit
             # CountInvocationPlugin() # Custom Plugin 
         ],  # <---- 2. Add the plugin. Handles standard Observability logging across ALL agents
     )
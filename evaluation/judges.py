@@ -0,0 +1,366 @@
+"""
+LLM-as-judge scoring service.
+
+Judging report quality one LLM call per item (the reflection step of
+./patterns/single_agent/researcher_with_tools_and_reflection.py, the critic of
+./patterns/multi_agent/google_iterative_refinement_loop.py) does not scale to thousands of
+candidates. `LLMJudge` cuts the number of calls by:
+
+1- packing: the candidates sharing a rubric are numbered and judged in ONE prompt (up to
+   `batch_size` candidates / `max_batch_chars` characters), the model answers with a JSON list
+   of {"id", "score", "reason"} objects. Ids missing from an answer are re-judged alone,
+2- caching: every score is cached by the content hash of (model, rubric, candidate), in memory
+   and optionally in a JSONL file, so re-runs and duplicates cost nothing,
+3- pruning for comparisons: `tournament` scores every candidate once (packed + cached), keeps
+   only the ones within `margin` of the best score, and runs a knockout of packed pairwise
+   comparisons on those. It stops early as soon as one candidate is left, which for a clear
+   winner means no pairwise call at all.
+
+Pairwise comparisons are asked in both orders (A/B then B/A) in the same packed prompt to cancel
+the position bias; when the two orders disagree the pointwise score decides.
+
+Usage:
+    judge = LLMJudge(model="gpt-4o-mini", cache_path="data/judge_cache.jsonl")
+    scores = judge.score([(REPORT_RUBRIC, report) for report in reports])
+    best = judge.tournament(REPORT_RUBRIC, reports)
+"""
+
+# --- Standard library ---
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# --- Third-party ---
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.utils.config import get_settings
+
+REPORT_RUBRIC = (
+    "Quality of a research report: accuracy, coverage of the topic, structure, academic tone, "
+    "and citations with full URLs for every claim taken from a source."
+)
+
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+@dataclass
+class JudgeScore:
+    """Score of one candidate against a rubric (score is None if the judge failed)."""
+
+    score: Optional[float]
+    reason: str = ""
+    cached: bool = False
+
+
+def content_hash(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def parse_json_object(text: str) -> dict:
+    """Parse the JSON object of a model answer (markdown fences and surrounding text tolerated)."""
+    match = _JSON_RE.search(text or "")
+    if not match:
+        raise ValueError(f"No JSON object in judge answer: {text[:200]!r}")
+    return json.loads(match.group(0))
+
+
+def openai_complete(model: str) -> Callable[[str], str]:
+    """Default completion function: OpenAI chat completion in JSON mode, temperature 0."""
+    from agentic_learning.utils.llm import openai_client
+
+    client = openai_client()
+
+    def complete(prompt: str) -> str:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "You are a strict, impartial evaluator. Output only JSON."},
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+        )
+        return response.choices[0].message.content
+
+    return complete
+
+
+class LLMJudge:
+    """Batched, cached LLM judge (pointwise scores, pairwise comparisons and tournaments)."""
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        complete: Optional[Callable[[str], str]] = None,
+        batch_size: int = 8,
+        max_batch_chars: int = 24_000,
+        scale: Tuple[int, int] = (1, 10),
+        cache_path: Optional[str] = None,
+        max_workers: int = 4,
+    ):
+        """
+        Args:
+            model: Judge model name, part of the cache key (default: settings.judge_model).
+            complete: Function prompt -> answer text (default: OpenAI chat in JSON mode).
+            batch_size: Maximum number of candidates per packed prompt.
+            max_batch_chars: Maximum size of the candidates of a packed prompt.
+            scale: Score range (min, max).
+            cache_path: JSONL file persisting the scores between runs.
+            max_workers: Packed prompts sent concurrently.
+        """
+        self.model = model or get_settings().judge_model
+        self._complete = complete
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.scale = scale
+        self.cache_path = cache_path
+        self.max_workers = max_workers
+
+        self._cache: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {"items": 0, "cache_hits": 0, "llm_calls": 0, "retries": 0}
+        self._load_cache()
+
+    def complete(self, prompt: str) -> str:
+        if self._complete is None:
+            self._complete = openai_complete(self.model)
+        with self._lock:
+            self.stats["llm_calls"] += 1
+        return self._complete(prompt)
+
+    # --- Cache ---
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        with open(self.cache_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line
+                self._cache[entry["key"]] = entry["value"]
+
+    def _cache_put(self, key: str, value: dict):
+        with self._lock:
+            self._cache[key] = value
+            if self.cache_path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+                with open(self.cache_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"key": key, "value": value}, ensure_ascii=False) + "\n")
+
+    # --- Packing ---
+
+    def _batches(self, items: list) -> list:
+        """Split (key, text or (text, text)) items into batches bounded in count and characters."""
+        batches, current, size = [], [], 0
+        for key, value in items:
+            length = len(value) if isinstance(value, str) else sum(len(v) for v in value)
+            if current and (len(current) >= self.batch_size or size + length > self.max_batch_chars):
+                batches.append(current)
+                current, size = [], 0
+            current.append((key, value))
+            size += length
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_batches(self, batches: list, judge_batch: Callable[[list], None]):
+        if len(batches) == 1 or self.max_workers <= 1:
+            for batch in batches:
+                judge_batch(batch)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(judge_batch, batches))
+
+    # --- Pointwise scores ---
+
+    def _score_prompt(self, rubric: str, candidates: Sequence[str]) -> str:
+        lo, hi = self.scale
+        blocks = "\n\n".join(
+            f'<candidate id="{i}">\n{text}\n</candidate>' for i, text in enumerate(candidates, start=1)
+        )
+        return f"""
+Score each candidate independently against the rubric, from {lo} (worst) to {hi} (best).
+
+Rubric:
+{rubric}
+
+{blocks}
+
+Answer with this JSON object, one entry per candidate id:
+{{"scores": [{{"id": 1, "score": <number>, "reason": "<one sentence>"}}]}}
+""".strip()
+
+    def _judge_score_batch(self, rubric: str, batch: List[Tuple[str, str]]):
+        try:
+            answer = parse_json_object(self.complete(self._score_prompt(rubric, [text for _, text in batch])))
+            by_id = {int(s["id"]): s for s in answer.get("scores", []) if "id" in s}
+        except Exception as e:
+            logger.warning(f"Judge batch of {len(batch)} failed: {e}")
+            by_id = {}
+
+        lo, hi = self.scale
+        missing = []
+        for i, (key, text) in enumerate(batch, start=1):
+            entry = by_id.get(i)
+            try:
+                score = min(max(float(entry["score"]), lo), hi)
+            except (TypeError, KeyError, ValueError):
+                missing.append((key, text))
+                continue
+            self._cache_put(key, {"score": score, "reason": str(entry.get("reason", ""))})
+
+        if len(batch) > 1:
+            # Re-judge the dropped ids alone (models sometimes skip entries of long batches)
+            for item in missing:
+                with self._lock:
+                    self.stats["retries"] += 1
+                self._judge_score_batch(rubric, [item])
+
+    def score(self, items: Sequence[Tuple[str, str]]) -> List[JudgeScore]:
+        """
+        Score (rubric, candidate) pairs.
+
+        Returns:
+            list[JudgeScore]: One score per pair, in order.
+        """
+        keys = [content_hash("score", self.model, rubric, candidate) for rubric, candidate in items]
+        self.stats["items"] += len(items)
+
+        hits = {key for key in keys if key in self._cache}
+        self.stats["cache_hits"] += sum(key in hits for key in keys)
+
+        # Unique uncached candidates, grouped by rubric (the rubric is written once per prompt)
+        todo: Dict[str, Dict[str, str]] = {}
+        for key, (rubric, candidate) in zip(keys, items):
+            if key not in hits:
+                todo.setdefault(rubric, {})[key] = candidate
+
+        jobs = [
+            (rubric, batch)
+            for rubric, candidates in todo.items()
+            for batch in self._batches(list(candidates.items()))
+        ]
+        self._run_batches(jobs, lambda job: self._judge_score_batch(*job))
+
+        results = []
+        for key in keys:
+            value = self._cache.get(key)
+            if value is None:
+                results.append(JudgeScore(score=None, reason="judge failed"))
+            else:
+                results.append(JudgeScore(score=value["score"], reason=value["reason"], cached=key in hits))
+        return results
+
+    # --- Pairwise comparisons ---
+
+    def _pairwise_prompt(self, rubric: str, pairs: Sequence[Tuple[str, str]]) -> str:
+        blocks = "\n\n".join(
+            f'<comparison id="{i}">\n<A>\n{a}\n</A>\n<B>\n{b}\n</B>\n</comparison>'
+            for i, (a, b) in enumerate(pairs, start=1)
+        )
+        return f"""
+For each comparison, decide which response better satisfies the rubric.
+
+Rubric:
+{rubric}
+
+{blocks}
+
+Answer with this JSON object, one entry per comparison id:
+{{"results": [{{"id": 1, "winner": "A" or "B", "reason": "<one sentence>"}}]}}
+""".strip()
+
+    def _judge_pairwise_batch(self, rubric: str, batch: List[Tuple[str, Tuple[str, str]]]):
+        try:
+            answer = parse_json_object(self.complete(self._pairwise_prompt(rubric, [pair for _, pair in batch])))
+            by_id = {int(r["id"]): r for r in answer.get("results", []) if "id" in r}
+        except Exception as e:
+            logger.warning(f"Pairwise batch of {len(batch)} failed: {e}")
+            by_id = {}
+        for i, (key, _) in enumerate(batch, start=1):
+            winner = str(by_id.get(i, {}).get("winner", "")).strip().upper()
+            if winner in ("A", "B"):
+                self._cache_put(key, {"winner": winner, "reason": str(by_id[i].get("reason", ""))})
+
+    def compare_pairs(self, rubric: str, pairs: Sequence[Tuple[str, str]]) -> List[Optional[int]]:
+        """
+        Compare (a, b) pairs in both orders.
+
+        Returns:
+            list[int | None]: 0 if a wins, 1 if b wins, None if the two orders disagree (or failed).
+        """
+        forward = [content_hash("pair", self.model, rubric, a, b) for a, b in pairs]
+        backward = [content_hash("pair", self.model, rubric, b, a) for a, b in pairs]
+        jobs, seen = [], set()
+        for (a, b), fk, bk in zip(pairs, forward, backward):
+            for key, pair in ((fk, (a, b)), (bk, (b, a))):
+                if key not in self._cache and key not in seen:
+                    seen.add(key)
+                    jobs.append((key, pair))
+        self.stats["items"] += 2 * len(pairs)
+        self.stats["cache_hits"] += 2 * len(pairs) - len(jobs)
+
+        self._run_batches(self._batches(jobs), lambda batch: self._judge_pairwise_batch(rubric, batch))
+
+        outcomes = []
+        for fk, bk in zip(forward, backward):
+            first = self._cache.get(fk, {}).get("winner")
+            second = self._cache.get(bk, {}).get("winner")
+            if first == "A" and second == "B":
+                outcomes.append(0)
+            elif first == "B" and second == "A":
+                outcomes.append(1)
+            else:
+                outcomes.append(None)  # Position bias or failure: no decision
+        return outcomes
+
+    def compare(self, rubric: str, a: str, b: str) -> int:
+        """0 if `a` is better, 1 if `b` is better (pointwise scores break undecided comparisons)."""
+        outcome = self.compare_pairs(rubric, [(a, b)])[0]
+        if outcome is not None:
+            return outcome
+        score_a, score_b = self.score([(rubric, a), (rubric, b)])
+        return 1 if (score_b.score or 0) > (score_a.score or 0) else 0
+
+    # --- Tournament ---
+
+    def tournament(self, rubric: str, candidates: Sequence[str], margin: float = 1.0) -> int:
+        """
+        Index of the best candidate.
+
+        Every candidate is scored once (packed, cached); only the candidates within `margin` of
+        the best score enter a knockout of packed pairwise comparisons, which stops as soon as
+        one candidate is left.
+        """
+        if not candidates:
+            raise ValueError("No candidates.")
+        scores = [s.score if s.score is not None else float("-inf") for s in self.score([(rubric, c) for c in candidates])]
+        best = max(scores)
+        alive = sorted((i for i, s in enumerate(scores) if s >= best - margin), key=lambda i: -scores[i])
+        logger.info(f"Tournament: {len(alive)}/{len(candidates)} candidates within {margin} of the best score.")
+
+        while len(alive) > 1:
+            # Pair neighbours by score; an odd one out gets a bye
+            matches = [(alive[i], alive[i + 1]) for i in range(0, len(alive) - 1, 2)]
+            outcomes = self.compare_pairs(rubric, [(candidates[i], candidates[j]) for i, j in matches])
+            winners = []
+            for (i, j), outcome in zip(matches, outcomes):
+                if outcome is None:
+                    outcome = 1 if scores[j] > scores[i] else 0
+                winners.append(j if outcome else i)
+            if len(alive) % 2:
+                winners.append(alive[-1])
+            alive = winners
+        return alive[0]
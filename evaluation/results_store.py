@@ -0,0 +1,361 @@
+"""
+Columnar results store for evaluation runs (./evaluation/eval_runner.py).
+
+Every run is persisted in DuckDB instead of being logged as a markdown report, in three tables:
+
+    runs   one row per run:  run_id, started_at, model, suite, aggregated metrics, metadata (JSON)
+    tasks  one row per task: run_id, task_id, passed, ratio, latency_s, tokens, cost_usd, error, ...
+    urls   one row per URL:  run_id, task_id, position, url, host, preferred
+
+The per-run aggregates are computed once at insert time, so trend queries over hundreds of runs
+only scan the small `runs` table, and `compare` diffs two runs with a single join on task_id.
+Tables can be exported to Parquet (`export_parquet`) for notebooks / other tools.
+
+Usage:
+    store = ResultsStore("evaluation_results.duckdb")
+    run_id = store.save_run(records, model="openai:gpt-4o", suite="suite.jsonl")
+    diff = store.compare(previous_run_id, run_id)
+    history = store.trend("pass_rate", last=200)
+
+    python -m agentic_learning.evaluation.results_store evaluation_results.duckdb runs
+    python -m agentic_learning.evaluation.results_store evaluation_results.duckdb compare RUN_A RUN_B
+    python -m agentic_learning.evaluation.results_store evaluation_results.duckdb trend --metric pass_rate
+"""
+
+# --- Standard library ---
+import argparse
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# --- Third-party ---
+import duckdb
+import pandas as pd
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.evaluation.domain_matcher import host_of
+
+# USD per 1M tokens (input, output), used to derive the cost of a run
+MODEL_PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "claude-sonnet-4": (3.00, 15.00),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+# Metrics available to `trend` (columns of the runs table)
+RUN_METRICS = (
+    "tasks", "passed", "errors", "pass_rate", "mean_ratio",
+    "latency_p50", "latency_p95", "total_tokens", "cost_usd",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id VARCHAR PRIMARY KEY,
+    started_at TIMESTAMP,
+    model VARCHAR,
+    suite VARCHAR,
+    tasks INTEGER,
+    passed INTEGER,
+    errors INTEGER,
+    pass_rate DOUBLE,
+    mean_ratio DOUBLE,
+    latency_p50 DOUBLE,
+    latency_p95 DOUBLE,
+    total_tokens BIGINT,
+    cost_usd DOUBLE,
+    metadata JSON
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    run_id VARCHAR,
+    task_id VARCHAR,
+    task VARCHAR,
+    passed BOOLEAN,
+    ratio DOUBLE,
+    min_ratio DOUBLE,
+    total_urls INTEGER,
+    preferred_urls INTEGER,
+    latency_s DOUBLE,
+    prompt_tokens BIGINT,
+    completion_tokens BIGINT,
+    cost_usd DOUBLE,
+    error VARCHAR
+);
+CREATE TABLE IF NOT EXISTS urls (
+    run_id VARCHAR,
+    task_id VARCHAR,
+    position INTEGER,
+    url VARCHAR,
+    host VARCHAR,
+    preferred BOOLEAN
+);
+"""
+
+_TASK_COLUMNS = [
+    "run_id", "task_id", "task", "passed", "ratio", "min_ratio", "total_urls", "preferred_urls",
+    "latency_s", "prompt_tokens", "completion_tokens", "cost_usd", "error",
+]
+
+
+def token_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost in USD of a call ("provider:model" names accepted, unknown models cost 0)."""
+    name = (model or "").split(":", 1)[-1]
+    # Longest known prefix wins: "gpt-4o-mini-2024-07-18" -> "gpt-4o-mini"
+    prices = next((MODEL_PRICES[m] for m in sorted(MODEL_PRICES, key=len, reverse=True) if name.startswith(m)), None)
+    if prices is None:
+        return 0.0
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class ResultsStore:
+    """DuckDB store of evaluation runs, with comparison and trend queries."""
+
+    def __init__(self, database: str = "evaluation_results.duckdb"):
+        if database != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+        self.database = database
+        self.con = duckdb.connect(database)
+        self.con.execute(_SCHEMA)
+        self._lock = threading.Lock()  # A DuckDB connection must not be used by two threads at once
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _df(self, sql: str, params: Optional[list] = None) -> pd.DataFrame:
+        with self._lock:
+            return self.con.execute(sql, params or []).df()
+
+    # --- Writing ---
+
+    def save_run(
+        self,
+        records: List[Dict[str, Any]],
+        run_id: Optional[str] = None,
+        model: Optional[str] = None,
+        suite: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Persist the task records of a run (as returned by `eval_runner.run_suite`).
+
+        Returns:
+            str: The run id (generated when not given). Saving an existing run id replaces it.
+        """
+        run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S-") + uuid.uuid4().hex[:6]
+
+        task_rows, url_rows = [], []
+        for r in records:
+            prompt_tokens = int(r.get("prompt_tokens") or 0)
+            completion_tokens = int(r.get("completion_tokens") or 0)
+            task_rows.append((
+                run_id, str(r["id"]), r["task"], bool(r["passed"]), r["ratio"], r["min_ratio"],
+                r["total_urls"], r["preferred_urls"], r["latency_s"], prompt_tokens, completion_tokens,
+                token_cost(model, prompt_tokens, completion_tokens), r.get("error"),
+            ))
+            url_rows.extend(
+                (run_id, str(r["id"]), i, url, host_of(url), bool(ok))
+                for i, (url, ok) in enumerate(zip(r.get("urls", []), r.get("preferred", [])))
+            )
+        tasks_df = pd.DataFrame(task_rows, columns=_TASK_COLUMNS)
+        urls_df = pd.DataFrame(url_rows, columns=["run_id", "task_id", "position", "url", "host", "preferred"])
+
+        with self._lock:
+            con = self.con
+            con.execute("BEGIN TRANSACTION")
+            try:
+                for table in ("runs", "tasks", "urls"):
+                    con.execute(f"DELETE FROM {table} WHERE run_id = ?", [run_id])
+                # Bulk inserts straight from the DataFrames (no per-row round trips)
+                con.register("new_tasks", tasks_df)
+                con.register("new_urls", urls_df)
+                con.execute("INSERT INTO tasks SELECT * FROM new_tasks")
+                con.execute("INSERT INTO urls SELECT * FROM new_urls")
+                con.execute(
+                    """
+                    INSERT INTO runs
+                    SELECT ?, ?, ?, ?,
+                           count(*), count(*) FILTER (WHERE passed), count(error),
+                           coalesce(avg(passed::INTEGER), 0), coalesce(avg(ratio), 0),
+                           coalesce(quantile_cont(latency_s, 0.5), 0), coalesce(quantile_cont(latency_s, 0.95), 0),
+                           coalesce(sum(prompt_tokens + completion_tokens), 0), coalesce(sum(cost_usd), 0),
+                           ?
+                    FROM new_tasks
+                    """,
+                    [run_id, datetime.now(timezone.utc).replace(tzinfo=None), model, suite,
+                     json.dumps(metadata or {}, default=str)],
+                )
+                con.execute("COMMIT")
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+            finally:
+                con.unregister("new_tasks")
+                con.unregister("new_urls")
+
+        logger.info(f"Saved run {run_id} ({len(task_rows)} tasks, {len(url_rows)} urls) to {self.database}")
+        return run_id
+
+    # --- Queries ---
+
+    def runs(self, last: int = 20, model: Optional[str] = None) -> pd.DataFrame:
+        """Most recent runs first."""
+        where = "WHERE model = ?" if model else ""
+        return self._df(
+            f"SELECT * EXCLUDE (metadata) FROM runs {where} ORDER BY started_at DESC LIMIT {int(last)}",
+            [model] if model else None,
+        )
+
+    def tasks(self, run_id: str) -> pd.DataFrame:
+        return self._df("SELECT * FROM tasks WHERE run_id = ? ORDER BY task_id", [run_id])
+
+    def trend(self, metric: str = "pass_rate", last: int = 100, model: Optional[str] = None) -> pd.DataFrame:
+        """
+        Evolution of a run metric over the last runs (oldest first), with a 5-run moving average.
+        """
+        if metric not in RUN_METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {RUN_METRICS}")
+        where = "WHERE model = ?" if model else ""
+        return self._df(
+            f"""
+            SELECT run_id, started_at, model, {metric},
+                   avg({metric}) OVER (ORDER BY started_at ROWS BETWEEN 4 PRECEDING AND CURRENT ROW) AS moving_avg
+            FROM (SELECT * FROM runs {where} ORDER BY started_at DESC LIMIT {int(last)})
+            ORDER BY started_at
+            """,
+            [model] if model else None,
+        )
+
+    def domain_stats(self, run_id: Optional[str] = None, limit: int = 20) -> pd.DataFrame:
+        """Most frequent result hosts (of one run, or of all runs)."""
+        where = "WHERE run_id = ?" if run_id else ""
+        return self._df(
+            f"""
+            SELECT host, count(*) AS urls, bool_or(preferred) AS preferred, count(DISTINCT run_id) AS runs
+            FROM urls {where} GROUP BY host ORDER BY urls DESC LIMIT {int(limit)}
+            """,
+            [run_id] if run_id else None,
+        )
+
+    def compare(self, base_run: str, new_run: str) -> Dict[str, Any]:
+        """
+        Diff two runs: metric deltas plus the tasks that regressed (pass -> fail) or got fixed.
+
+        Returns:
+            dict: {"base": {...}, "new": {...}, "delta": {...}, "regressions": [...], "fixes": [...],
+                   "latency_delta_p50": float, "common_tasks": int}
+        """
+        runs = self._df("SELECT * EXCLUDE (metadata) FROM runs WHERE run_id IN (?, ?)", [base_run, new_run])
+        found = set(runs["run_id"])
+        missing = [r for r in (base_run, new_run) if r not in found]
+        if missing:
+            raise KeyError(f"Unknown run(s): {', '.join(missing)}")
+        base = runs[runs["run_id"] == base_run].iloc[0].to_dict()
+        new = runs[runs["run_id"] == new_run].iloc[0].to_dict()
+
+        joined = self._df(
+            """
+            SELECT b.task_id, b.task, b.passed AS base_passed, n.passed AS new_passed,
+                   b.ratio AS base_ratio, n.ratio AS new_ratio,
+                   n.latency_s - b.latency_s AS latency_delta,
+                   n.cost_usd - b.cost_usd AS cost_delta,
+                   n.error AS new_error
+            FROM tasks b JOIN tasks n USING (task_id)
+            WHERE b.run_id = ? AND n.run_id = ?
+            ORDER BY b.task_id
+            """,
+            [base_run, new_run],
+        )
+        columns = ["task_id", "task", "base_ratio", "new_ratio", "new_error"]
+        regressions = joined[joined["base_passed"] & ~joined["new_passed"]][columns]
+        fixes = joined[~joined["base_passed"] & joined["new_passed"]][columns]
+
+        return {
+            "base": base,
+            "new": new,
+            "delta": {m: new[m] - base[m] for m in RUN_METRICS},
+            "common_tasks": len(joined),
+            "latency_delta_p50": float(joined["latency_delta"].median()) if len(joined) else 0.0,
+            "regressions": regressions.to_dict("records"),
+            "fixes": fixes.to_dict("records"),
+        }
+
+    def export_parquet(self, directory: str) -> List[str]:
+        """Write every table to `<directory>/<table>.parquet`."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        with self._lock:
+            for table in ("runs", "tasks", "urls"):
+                path = os.path.join(directory, f"{table}.parquet")
+                self.con.execute(f"COPY {table} TO '{path}' (FORMAT PARQUET)")
+                paths.append(path)
+        return paths
+
+
+def format_comparison(diff: Dict[str, Any]) -> str:
+    """Markdown summary of `ResultsStore.compare`."""
+    base, new, delta = diff["base"], diff["new"], diff["delta"]
+    lines = [
+        f"### Run comparison — {base['run_id']} → {new['run_id']}",
+        f"- Pass rate: {base['pass_rate']:.1%} → {new['pass_rate']:.1%} ({delta['pass_rate']:+.1%})",
+        f"- Mean ratio: {base['mean_ratio']:.2f} → {new['mean_ratio']:.2f} ({delta['mean_ratio']:+.2f})",
+        f"- Latency p50: {base['latency_p50']:.2f}s → {new['latency_p50']:.2f}s ({delta['latency_p50']:+.2f}s)",
+        f"- Latency p95: {base['latency_p95']:.2f}s → {new['latency_p95']:.2f}s ({delta['latency_p95']:+.2f}s)",
+        f"- Tokens: {base['total_tokens']} → {new['total_tokens']} ({delta['total_tokens']:+d})",
+        f"- Cost: ${base['cost_usd']:.4f} → ${new['cost_usd']:.4f} ({delta['cost_usd']:+.4f})",
+        f"- Common tasks: {diff['common_tasks']}, regressions: {len(diff['regressions'])}, fixes: {len(diff['fixes'])}",
+    ]
+    for title, rows in (("Regressions", diff["regressions"]), ("Fixes", diff["fixes"])):
+        if rows:
+            lines += ["", f"**{title}:**"]
+            lines += [f"- {r['task_id']}: ratio {r['base_ratio']:.2f} → {r['new_ratio']:.2f}" for r in rows]
+    return "\n".join(lines)
+
+
+#### MAIN ####
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the evaluation results store.")
+    parser.add_argument("database", help="DuckDB results file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs_parser = commands.add_parser("runs", help="List the most recent runs.")
+    runs_parser.add_argument("--last", type=int, default=20)
+    runs_parser.add_argument("--model")
+
+    compare_parser = commands.add_parser("compare", help="Diff two runs.")
+    compare_parser.add_argument("base_run")
+    compare_parser.add_argument("new_run")
+
+    trend_parser = commands.add_parser("trend", help="Evolution of a metric over the last runs.")
+    trend_parser.add_argument("--metric", default="pass_rate", choices=RUN_METRICS)
+    trend_parser.add_argument("--last", type=int, default=100)
+    trend_parser.add_argument("--model")
+
+    export_parser = commands.add_parser("export", help="Export the tables to Parquet.")
+    export_parser.add_argument("directory")
+
+    args = parser.parse_args()
+
+    with ResultsStore(args.database) as store:
+        if args.command == "runs":
+            print(store.runs(args.last, args.model).to_string(index=False))
+        elif args.command == "compare":
+            print(format_comparison(store.compare(args.base_run, args.new_run)))
+        elif args.command == "trend":
+            print(store.trend(args.metric, args.last, args.model).to_string(index=False))
+        elif args.command == "export":
+            print("\n".join(store.export_parquet(args.directory)))
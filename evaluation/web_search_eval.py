@@ -7,6 +7,7 @@ by companring them to a built-in well-know list of preferred domains.
 
 # --- Standard library 
 from datetime import datetime
+from functools import lru_cache
 import json
 import re
 from loguru import logger
@@ -15,8 +16,11 @@ from loguru import logger
 from aisuite import Client
 
 # --- Local / project ---
+from agentic_learning.core.prefetch import Prefetcher
+from agentic_learning.evaluation.domain_matcher import DomainMatcher, as_matcher
 from agentic_learning.tools import research_tools
 from agentic_learning.utils import utils
+from agentic_learning.utils.config import get_settings
 
 # list of preferred domains for Tavily results
 TOP_DOMAINS = {
@@ -37,8 +41,31 @@ TOP_DOMAINS = {
     "codecademy.com", "datacamp.com"
 }
 
-def find_references(task: str, model: str = "openai:gpt-4o", return_messages: bool = False):
-    """Perform a research task using external tools (arxiv, tavily, wikipedia)."""
+@lru_cache(maxsize=1)
+def references_prefetcher() -> Prefetcher:
+    """Speculative searches of `find_references`, learned from its past runs (see core/prefetch.py)."""
+    return Prefetcher(path=get_settings().cache_dir / "prefetch" / "find_references.json")
+
+
+@lru_cache(maxsize=1)
+def references_tools() -> list:
+    prefetcher = references_prefetcher()
+    return [
+        prefetcher.wrap(research_tools.arxiv_search_tool),
+        prefetcher.wrap(research_tools.tavily_search_tool),
+        prefetcher.wrap(research_tools.wikipedia_search_tool),
+    ]
+
+
+def find_references(task: str, model: str = "openai:gpt-4o", return_messages: bool = False, return_usage: bool = False):
+    """
+    Perform a research task using external tools (arxiv, tavily, wikipedia).
+
+    With `return_usage=True` the token usage is returned too: (content, usage dict) - used by the
+    evaluation runner to track token cost.
+
+    The searches past runs made for their task start with the first model call (prefetch).
+    """
 
     prompt = f"""
     You are a research function with access to:
@@ -53,32 +80,76 @@ def find_references(task: str, model: str = "openai:gpt-4o", return_messages: bo
     """.strip()
 
     messages = [{"role": "user", "content": prompt}]
-    tools = [
-        research_tools.arxiv_search_tool,
-        research_tools.tavily_search_tool,
-        research_tools.wikipedia_search_tool,
-    ]
+    tools = references_tools()
 
     try:
         client = Client()
-        response = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            tools=tools,
-            tool_choice="auto",
-            max_turns=5,
-        )
+        with references_prefetcher().session({"task": task}, tools):
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                tools=tools,
+                tool_choice="auto",
+                max_turns=5,
+            )
         content = response.choices[0].message.content
+        if return_usage:
+            usage = getattr(response, "usage", None)
+            usage = {
+                "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+                "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            }
+            return (content, messages, usage) if return_messages else (content, usage)
         return (content, messages) if return_messages else content
     except Exception as e:
         return f"[Model Error: {e}]"
 
+# Compiled once: matching cost no longer depends on the allowlist size
+TOP_DOMAIN_MATCHER = DomainMatcher(TOP_DOMAINS)
+
+
+def find_references_cascade(
+    task: str, models=("openai:gpt-4o-mini", "openai:gpt-4o"), min_ratio: float = 0.4
+):
+    """
+    `find_references` with a model cascade: the first (cheap) model answers unless less than
+    `min_ratio` of its URLs come from TOP_DOMAINS, then the next model is tried.
+
+    Returns:
+        CascadeResult: text, model that answered, attempts (escalations are tracked per task
+        in integrations/providers/cascade.STATS).
+    """
+    from agentic_learning.integrations.providers.cascade import ModelCascade, domain_check
+
+    cascade = ModelCascade(
+        models,
+        checks=[domain_check(min_ratio, TOP_DOMAIN_MATCHER)],
+        complete=lambda model, prompt: find_references(prompt, model=model),
+    )
+    return cascade.run(task, task="find_references")
+
+URL_PATTERN = re.compile(r'https?://[^\s\]\)>\}]+', flags=re.IGNORECASE)
+
+def score_tavily_results(TOP_DOMAINS, raw: str) -> tuple[list[str], list[bool], float]:
+    """
+    Extract the URLs of a research result and flag the ones from preferred domains.
+
+    Returns:
+        tuple[list[str], list[bool], float]: (urls, preferred flags, preferred ratio)
+    """
+    urls = URL_PATTERN.findall(raw)
+    # Score the whole batch at once (subdomains match, look-alike domains such as notmit.edu do not)
+    preferred = as_matcher(TOP_DOMAINS).match_urls(urls)
+    ratio = sum(preferred) / len(urls) if urls else 0.0
+    return urls, preferred, ratio
+
 def evaluate_tavily_results(TOP_DOMAINS, raw: str, min_ratio=0.4):
     """
     Evaluate whether plain-text research results mostly come from preferred domains.
 
     Args:
-        TOP_DOMAINS (set[str]): Set of preferred domains (e.g., 'arxiv.org', 'nature.com').
+        TOP_DOMAINS (set[str] | DomainMatcher): Preferred domains (e.g., 'arxiv.org', 'nature.com'),
+            or an already compiled DomainMatcher (see evaluation/domain_matcher.py).
         raw (str): Plain text or Markdown containing URLs.
         min_ratio (float): Minimum preferred ratio required to pass (e.g., 0.4 = 40%).
 
@@ -88,9 +159,8 @@ def evaluate_tavily_results(TOP_DOMAINS, raw: str, min_ratio=0.4):
             markdown_report -> Markdown-formatted summary of the evaluation
     """
 
-    # Extract URLs from the text
-    url_pattern = re.compile(r'https?://[^\s\]\)>\}]+', flags=re.IGNORECASE)
-    urls = url_pattern.findall(raw)
+    # Extract URLs from the text and flag the preferred ones
+    urls, preferred, ratio = score_tavily_results(TOP_DOMAINS, raw)
 
     if not urls:
         return False, """### Evaluation — Tavily Preferred Domains
@@ -100,31 +170,26 @@ Please include links in your research results.
 
     # Count preferred vs total
     total = len(urls)
-    preferred_count = 0
-    details = []
-
-    for url in urls:
-        domain = url.split("/")[2]
-        preferred = any(td in domain for td in TOP_DOMAINS)
-        if preferred:
-            preferred_count += 1
-        details.append(f"- {url} → {'✅ PREFERRED' if preferred else '❌ NOT PREFERRED'}")
+    preferred_count = sum(preferred)
 
-    ratio = preferred_count / total if total > 0 else 0.0
     flag = ratio >= min_ratio
 
     # Markdown report
-    report = f"""
-### Evaluation — Tavily Preferred Domains
-- Total results: {total}
-- Preferred results: {preferred_count}
-- Ratio: {ratio:.2%}
-- Threshold: {min_ratio:.0%}
-- Status: {"✅ PASS" if flag else "❌ FAIL"}
-
-**Details:**
-{chr(10).join(details)}
-"""
+    lines = [
+        "",
+        "### Evaluation — Tavily Preferred Domains",
+        f"- Total results: {total}",
+        f"- Preferred results: {preferred_count}",
+        f"- Ratio: {ratio:.2%}",
+        f"- Threshold: {min_ratio:.0%}",
+        f"- Status: {'✅ PASS' if flag else '❌ FAIL'}",
+        "",
+        "**Details:**",
+    ]
+    lines.extend(
+        f"- {url} → {'✅ PREFERRED' if ok else '❌ NOT PREFERRED'}" for url, ok in zip(urls, preferred)
+    )
+    report = "\n".join(lines) + "\n"
     return flag, report
 
 
@@ -138,7 +203,9 @@ if __name__ == "__main__":
     client = Client()
 
     research_task = "Find 2 recent papers about recent developments in agentic ai evaluation methods"
-    research_result = find_references(research_task)
+    cascade_result = find_references_cascade(research_task)
+    research_result = cascade_result.text
+    logger.info(f"Answered by {cascade_result.model} after {len(cascade_result.attempts)} attempt(s)")
 
     logger.info(
         research_result,
@@ -149,5 +216,5 @@ if __name__ == "__main__":
 
     logger.info("<h3>Research Results</h3>" + research_result, title="Research Results")
 
-    flag, report = evaluate_tavily_results(TOP_DOMAINS, research_result)
+    flag, report = evaluate_tavily_results(TOP_DOMAIN_MATCHER, research_result)
     logger.info("<pre>" + report + "</pre>", title="<h3>Evaluation Summary</h3>")
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Anthropic (Claude) adapter for the agent engine.
+
+OpenAI style messages are translated to the Messages API:
+    - system messages -> `system` parameter,
+    - assistant tool_calls -> `tool_use` content blocks,
+    - tool messages -> `tool_result` blocks of a user message (consecutive results are merged,
+      the API requires alternating user / assistant turns).
+
+Streamed events: text_delta -> "text"; tool_use blocks are accumulated from their
+input_json_delta fragments and emitted as "tool_call" when the block stops; input tokens
+(message_start) and output tokens (message_delta) are reported as one "usage" event.
+"""
+
+# --- Standard library ---
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# --- Third-party ---
+from anthropic import AsyncAnthropic
+
+# --- Local / project ---
+from agentic_learning.core.agent import ModelEvent, ToolCall, Usage
+from agentic_learning.integrations.providers.base import BaseProvider
+from agentic_learning.utils.config import get_settings
+
+
+def to_anthropic_messages(messages: List[dict]) -> Tuple[str, List[dict]]:
+    """(system prompt, Anthropic messages) from OpenAI style chat messages."""
+    system, converted = [], []
+
+    def append(role: str, blocks: List[dict]):
+        if converted and converted[-1]["role"] == role:
+            converted[-1]["content"].extend(blocks)
+        else:
+            converted.append({"role": role, "content": blocks})
+
+    for message in messages:
+        role, content = message["role"], message.get("content")
+        if role == "system":
+            system.append(content or "")
+        elif role == "tool":
+            append("user", [{"type": "tool_result", "tool_use_id": message["tool_call_id"], "content": content or ""}])
+        elif role == "assistant":
+            blocks = [{"type": "text", "text": content}] if content else []
+            for call in message.get("tool_calls") or []:
+                arguments = call["function"].get("arguments") or "{}"
+                blocks.append({
+                    "type": "tool_use",
+                    "id": call["id"],
+                    "name": call["function"]["name"],
+                    "input": json.loads(arguments) if isinstance(arguments, str) else arguments,
+                })
+            append("assistant", blocks)
+        else:
+            blocks = content if isinstance(content, list) else [{"type": "text", "text": content or ""}]
+            append("user", blocks)
+    return "\n\n".join(system), converted
+
+
+def to_anthropic_tools(tools: Optional[List[dict]]) -> List[dict]:
+    return [
+        {
+            "name": t["function"]["name"],
+            "description": t["function"].get("description", ""),
+            "input_schema": t["function"].get("parameters", {"type": "object", "properties": {}}),
+        }
+        for t in tools or []
+    ]
+
+
+class AnthropicChatModel(BaseProvider):
+    """Streaming Claude messages."""
+
+    provider = "anthropic"
+
+    def __init__(self, model: str = "claude-sonnet-4-5", client: Optional[AsyncAnthropic] = None, **options):
+        options.setdefault("max_tokens", 4096)  # Required by the Messages API
+        super().__init__(model, **options)
+        self._client = client
+
+    @property
+    def client(self) -> AsyncAnthropic:
+        if self._client is None:
+            self._client = AsyncAnthropic(api_key=get_settings().api_key("anthropic"), max_retries=0)
+        return self._client
+
+    async def _stream(self, messages: List[dict], tools: Optional[List[dict]]) -> AsyncIterator[ModelEvent]:
+        system, converted = to_anthropic_messages(messages)
+        params = dict(self.options)
+        if system:
+            params["system"] = system
+        if tools:
+            params["tools"] = to_anthropic_tools(tools)
+
+        raw = await self.client.messages.with_raw_response.create(
+            model=self.model, messages=converted, stream=True, **params
+        )
+        self.observe(raw.headers)
+        response = await raw.parse()
+
+        blocks: Dict[int, dict] = {}
+        input_tokens = output_tokens = 0
+        async for event in response:
+            if event.type == "message_start":
+                input_tokens = event.message.usage.input_tokens or 0
+            elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+                blocks[event.index] = {"id": event.content_block.id, "name": event.content_block.name, "json": []}
+            elif event.type == "content_block_delta":
+                if event.delta.type == "text_delta":
+                    yield ModelEvent("text", event.delta.text)
+                elif event.delta.type == "input_json_delta" and event.index in blocks:
+                    blocks[event.index]["json"].append(event.delta.partial_json)
+            elif event.type == "content_block_stop" and event.index in blocks:
+                block = blocks.pop(event.index)
+                yield ModelEvent("tool_call", ToolCall(block["id"], block["name"], "".join(block["json"]) or "{}"))
+            elif event.type == "message_delta" and event.usage:
+                output_tokens = event.usage.output_tokens or 0
+
+        yield ModelEvent("usage", Usage(input_tokens, output_tokens))
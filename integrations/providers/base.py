@@ -0,0 +1,215 @@
+"""
+Base class of the model provider adapters (OpenAI, Anthropic, Gemini, Mistral).
+
+Every adapter implements `_stream(messages, tools)`: it translates the OpenAI style messages and
+tool schemas used by the agent engine (./core/agent.py) to its SDK, and yields the engine events
+("text" deltas, complete "tool_call"s, "usage"). `BaseProvider.stream` wraps it with:
+
+    - a per-provider rate limit: one AdaptiveRateLimiter (./utils/rate_limit.py) shared by all
+      the models of a provider. A request slot and the estimated tokens of the turn are taken
+      before every request, the estimate is corrected with the reported usage, and adapters
+      feed the rate-limit headers of their responses back with `observe(headers)`,
+    - retries with jittered exponential backoff on 429 / 5xx / connection errors. A turn is only
+      retried if nothing was streamed yet (a half-streamed turn cannot be replayed silently).
+      A 429 pauses the shared limiter, so concurrent callers back off together,
+    - usage reporting: the token usage of every turn is added to `provider.usage`.
+
+Errors that remain after the retries are raised as ProviderError, with the HTTP status, so that
+the registry (./registry.py) can fail over to another provider.
+"""
+
+# --- Standard library ---
+import asyncio
+import json
+from typing import AsyncIterator, List, Mapping, Optional
+
+# --- Third-party ---
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.core.agent import ModelEvent, Usage
+from agentic_learning.utils.config import get_settings
+from agentic_learning.utils.rate_limit import (
+    AdaptiveRateLimiter,
+    RetryPolicy,
+    parse_duration,
+    parse_rate_limit_headers,
+    shared_limiter,
+)
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Default client-side limits (requests per minute), overridable in the settings and per model
+DEFAULT_REQUESTS_PER_MINUTE = {
+    "openai": 500,
+    "anthropic": 50,
+    "gemini": 300,
+    "mistral": 300,
+}
+
+# Tier 1 style tokens per minute (None: learnt from the headers)
+DEFAULT_TOKENS_PER_MINUTE = {
+    "openai": 30_000,
+    "anthropic": 30_000,
+    "gemini": 250_000,
+    "mistral": None,
+}
+
+
+def provider_limiter(
+    provider: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> AdaptiveRateLimiter:
+    """The limiter shared by all the models (and ADK agents) of a provider."""
+    settings = get_settings()
+    return shared_limiter(
+        provider,
+        requests_per_minute
+        or settings.requests_per_minute.get(provider)
+        or DEFAULT_REQUESTS_PER_MINUTE.get(provider, 60),
+        tokens_per_minute or settings.tokens_per_minute.get(provider) or DEFAULT_TOKENS_PER_MINUTE.get(provider),
+    )
+
+
+def estimate_tokens(messages: List[dict], tools: Optional[List[dict]] = None, max_output: int = 0) -> int:
+    """Rough token cost of a request (~4 characters per token) used to reserve rate-limit tokens."""
+    size = len(json.dumps(messages, default=str)) + (len(json.dumps(tools)) if tools else 0)
+    return size // 4 + max_output
+
+
+class ProviderError(Exception):
+    """A provider call failed (after the retries, if the error was retryable)."""
+
+    def __init__(
+        self,
+        provider: str,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        transient: bool = False,
+    ):
+        super().__init__(f"[{provider}] {message}")
+        self.provider = provider
+        self.status = status
+        self.retry_after = retry_after
+        self.transient = transient  # Connection error / timeout (no HTTP status)
+
+    @property
+    def retryable(self) -> bool:
+        return self.transient or self.status in RETRYABLE_STATUS
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Connection errors and timeouts (the SDKs name them *Connection* / *Timeout*)."""
+    if isinstance(exc, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return any(word in cls.__name__ for cls in type(exc).__mro__ for word in ("Connection", "Timeout"))
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """HTTP status of an SDK exception (openai, anthropic, google-genai and mistralai conventions)."""
+    for attr in ("status_code", "status", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def error_headers(exc: BaseException) -> Optional[Mapping[str, str]]:
+    return getattr(getattr(exc, "response", None), "headers", None)
+
+
+def error_retry_after(exc: BaseException) -> Optional[float]:
+    """Server requested delay: retry-after headers, or the RetryInfo detail of Google errors."""
+    headers = error_headers(exc)
+    if headers:
+        retry_after = parse_rate_limit_headers(headers).get("retry_after")
+        if retry_after is not None:
+            return retry_after
+    details = getattr(exc, "details", None)
+    error = details.get("error", details) if isinstance(details, dict) else None
+    for detail in (error or {}).get("details", []) if isinstance(error, dict) else []:
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            return parse_duration(detail["retryDelay"])
+    return None
+
+
+class BaseProvider:
+    """Streaming chat model with rate limiting, jittered retries and usage accounting."""
+
+    provider: str = "base"
+
+    def __init__(
+        self,
+        model: str,
+        retry: Optional[RetryPolicy] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        **options,
+    ):
+        """
+        Args:
+            model: Provider model name (without the "provider:" prefix).
+            retry: Retry policy (default: from the settings, 5 attempts with full jitter).
+            requests_per_minute: Initial client-side limit of the provider (first model created wins,
+                then adapted from the response headers).
+            tokens_per_minute: Same for tokens.
+            **options: Generation options forwarded to the SDK (temperature, max_tokens...).
+        """
+        self.model = model
+        self.retry = retry or get_settings().retry_policy()
+        self.limiter = provider_limiter(self.provider, requests_per_minute, tokens_per_minute)
+        self.options = options
+        self.usage = Usage()
+        self.calls = 0
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.provider}:{self.model})"
+
+    def _stream(self, messages: List[dict], tools: Optional[List[dict]]) -> AsyncIterator[ModelEvent]:
+        raise NotImplementedError
+
+    def observe(self, headers: Optional[Mapping[str, str]]):
+        """Feed the rate-limit headers of a response to the shared limiter."""
+        self.limiter.update(headers)
+
+    def _as_provider_error(self, exc: BaseException) -> ProviderError:
+        if isinstance(exc, ProviderError):
+            return exc
+        return ProviderError(
+            self.provider,
+            f"{type(exc).__name__}: {exc}",
+            error_status(exc),
+            error_retry_after(exc),
+            transient=is_transient(exc),
+        )
+
+    async def stream(self, messages: List[dict], tools: Optional[List[dict]] = None) -> AsyncIterator[ModelEvent]:
+        estimate = estimate_tokens(messages, tools, self.options.get("max_tokens") or 0)
+        for attempt in range(self.retry.attempts):
+            await self.limiter.acquire(estimate)
+            self.calls += 1
+            started = False
+            try:
+                async for event in self._stream(messages, tools):
+                    started = True
+                    if event.type == "usage":
+                        self.usage = self.usage + event.data
+                        self.limiter.settle(estimate, event.data.total_tokens)
+                    yield event
+                return
+            except (asyncio.CancelledError, GeneratorExit):
+                raise
+            except Exception as e:
+                error = self._as_provider_error(e)
+                self.observe(error_headers(e))
+                if error.status == 429 and error.retry_after:
+                    self.limiter.pause(error.retry_after)
+                if started or not error.retryable or attempt == self.retry.attempts - 1:
+                    raise error from e
+                delay = self.retry.delay(attempt, error.retry_after)
+                logger.warning(f"{self!r}: {error} (status {error.status}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
@@ -0,0 +1,331 @@
+"""
+Model cascade: a cheap model first, a larger one only when the output fails validation.
+
+Most calls of the patterns do not need the largest model: a small model writes valid JSON,
+runnable chart code or a well sourced answer most of the time, at a fraction of the latency
+and cost. `ModelCascade` tries the models in order (cheapest first) and runs the checkers on
+every output; the first output passing all of them is returned, otherwise the next model is
+called. When every model fails, the output of the last one is returned with `passed=False`.
+
+Checkers (output -> CheckResult, or a bool):
+
+    - json_check(schema):            JSON object valid against a pydantic model / type, or a
+                                     JSON schema dict (jsonschema, imported on first use)
+    - code_check(namespace):         the <execute_python> / fenced code runs without error
+    - judge_check(rubric, min_score): LLMJudge score (./evaluation/judges.py)
+    - domain_check(min_ratio):       share of URLs from preferred domains (`score_tavily_results`,
+                                     ./evaluation/web_search_eval.py)
+
+Escalations are tracked per task (CascadeStats): runs, escalation and failure rates, model
+serving the answer, calls and median latency. A task that escalates almost every time
+(`skip_rate` over at least `min_runs` runs) starts directly with the model that usually
+answers it, probing the cheap models again every `probe_every` runs. Only the runs starting
+with the first model (probes included) count for the escalation rate, over the last `recent`
+of them: a skipped run says nothing about the cheap model, and once the probes pass again the
+rate drops and the task goes back to the cheap model.
+
+    cascade = ModelCascade(["gpt-4o-mini", "gpt-4o"], checks=[json_check(Reflection)])
+    result = cascade.run(prompt, task="reflection")
+    result.text, result.model, cascade.stats.summary()
+"""
+
+# --- Standard library ---
+import asyncio
+import re
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+# --- Third-party ---
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.utils.config import get_settings
+
+
+@dataclass
+class CheckResult:
+    passed: bool
+    reason: str = ""
+    score: Optional[float] = None
+
+
+Checker = Callable[[str], Union[CheckResult, bool]]
+
+
+def _run_check(check: Checker, output: str) -> CheckResult:
+    try:
+        result = check(output)
+    except Exception as e:
+        message = " ".join(str(e).split())[:300]  # One line (pydantic / jsonschema errors span several)
+        return CheckResult(False, f"{getattr(check, '__name__', 'check')}: {type(e).__name__}: {message}")
+    return result if isinstance(result, CheckResult) else CheckResult(bool(result))
+
+
+# ================================
+# Checkers
+# ================================
+
+_FENCE_RE = re.compile(r"```(?:json|python)?\s*([\s\S]*?)```")
+_EXECUTE_RE = re.compile(r"<execute_python>([\s\S]*?)</execute_python>")
+
+
+def json_check(schema: Any) -> Checker:
+    """Output is a JSON object valid against `schema` (pydantic model / type, or JSON schema dict)."""
+    if isinstance(schema, dict):
+        import jsonschema
+
+        validator = jsonschema.Draft202012Validator(schema)
+
+        def validate(data):
+            errors = sorted(validator.iter_errors(data), key=lambda e: list(e.path))
+            if errors:
+                raise ValueError(errors[0].message)
+    else:
+        from pydantic import TypeAdapter
+
+        validate = TypeAdapter(schema).validate_python
+
+    def check_json(output: str) -> CheckResult:
+        from agentic_learning.evaluation.judges import parse_json_object
+
+        validate(parse_json_object(output))
+        return CheckResult(True)
+
+    return check_json
+
+
+def code_check(namespace: Optional[Callable[[], dict]] = None) -> Checker:
+    """
+    The code of the output runs without error.
+
+    Args:
+        namespace: Factory of the globals of the run (e.g. `lambda: {"df": df}`), a fresh dict
+            per check. The code really runs (side effects included): only for trusted sandboxes.
+    """
+
+    def check_code(output: str) -> CheckResult:
+        match = _EXECUTE_RE.search(output) or _FENCE_RE.search(output)
+        code = (match.group(1) if match else output).strip()
+        if not code:
+            return CheckResult(False, "no code")
+        exec(compile(code, "<cascade>", "exec"), namespace() if namespace else {})
+        return CheckResult(True)
+
+    return check_code
+
+
+def judge_check(rubric: str, min_score: float = 7.0, judge=None) -> Checker:
+    """LLMJudge score of the output (0-10) >= `min_score`."""
+
+    def check_judge(output: str) -> CheckResult:
+        nonlocal judge
+        if judge is None:
+            from agentic_learning.evaluation.judges import LLMJudge
+
+            judge = LLMJudge()
+        score = judge.score([(rubric, output)])[0]
+        if score.score is None:
+            return CheckResult(False, f"judge failed: {score.reason}")
+        return CheckResult(score.score >= min_score, score.reason, score.score)
+
+    return check_judge
+
+
+def domain_check(min_ratio: float = 0.4, domains=None, min_urls: int = 1) -> Checker:
+    """Share of the output URLs from preferred domains >= `min_ratio` (default: TOP_DOMAINS)."""
+
+    def check_domains(output: str) -> CheckResult:
+        from agentic_learning.evaluation.web_search_eval import TOP_DOMAIN_MATCHER, score_tavily_results
+
+        urls, _, ratio = score_tavily_results(domains or TOP_DOMAIN_MATCHER, output)
+        if len(urls) < min_urls:
+            return CheckResult(False, f"{len(urls)} URL(s), {min_urls} required", 0.0)
+        return CheckResult(ratio >= min_ratio, f"preferred domain ratio {ratio:.0%}", ratio)
+
+    return check_domains
+
+
+# ================================
+# Statistics
+# ================================
+
+class CascadeStats:
+    """
+    Escalation statistics per task (thread safe, last `window` latencies kept).
+
+    `escalated` / `tried` count the runs starting with the first model only; the escalation
+    rate is computed over the last `recent` of them (skipped runs are counted in `skipped`).
+    """
+
+    def __init__(self, window: int = 1000, recent: int = 50):
+        self._lock = threading.Lock()
+        self.runs: Counter = Counter()
+        self.tried: Counter = Counter()
+        self.skipped: Counter = Counter()
+        self.escalated: Counter = Counter()
+        self.outcomes: Dict[str, deque] = defaultdict(lambda: deque(maxlen=recent))
+        self.failed: Counter = Counter()
+        self.served: Dict[str, Counter] = defaultdict(Counter)
+        self.calls: Dict[str, Counter] = defaultdict(Counter)
+        self.latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, task: str, result: "CascadeResult", first_model: str, skipped: bool = False):
+        """Records a run (`skipped`: it did not start with `first_model`, no escalation counted)."""
+        with self._lock:
+            self.runs[task] += 1
+            if skipped:
+                self.skipped[task] += 1
+            else:
+                escalated = result.model != first_model
+                self.tried[task] += 1
+                self.escalated[task] += escalated
+                self.outcomes[task].append(escalated)
+            self.failed[task] += not result.passed
+            self.served[task][result.model] += 1
+            self.calls[task].update(attempt.model for attempt in result.attempts)
+            self.latencies[task].append(result.seconds)
+
+    def escalation_rate(self, task: str) -> float:
+        """Escalation rate over the recent runs starting with the first model."""
+        with self._lock:
+            outcomes = self.outcomes.get(task)
+            return sum(outcomes) / len(outcomes) if outcomes else 0.0
+
+    def usual_model(self, task: str) -> Optional[str]:
+        with self._lock:
+            served = self.served.get(task)
+            return served.most_common(1)[0][0] if served else None
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                task: {
+                    "runs": runs,
+                    "skipped": self.skipped[task],
+                    "escalation_rate": round(self.escalated[task] / self.tried[task], 3) if self.tried[task] else 0.0,
+                    "failure_rate": round(self.failed[task] / runs, 3),
+                    "median_seconds": round(statistics.median(self.latencies[task]), 3),
+                    "served_by": dict(self.served[task]),
+                    "calls": dict(self.calls[task]),
+                }
+                for task, runs in self.runs.items()
+            }
+
+
+# Process wide statistics: cascades built per call still add up per task
+STATS = CascadeStats()
+
+
+# ================================
+# Cascade
+# ================================
+
+@dataclass
+class Attempt:
+    model: str
+    passed: bool
+    reasons: List[str]
+    seconds: float
+
+
+@dataclass
+class CascadeResult:
+    text: str
+    model: str  # Model of the returned output
+    passed: bool  # False: no model passed the checks (output of the last one)
+    attempts: List[Attempt] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def _default_complete(model: str, prompt: str) -> str:
+    from agentic_learning.utils.llm import get_response
+
+    return get_response(model, prompt)
+
+
+class ModelCascade:
+    """Tries the models cheapest first, escalating when an output fails a checker."""
+
+    def __init__(
+        self,
+        models: Optional[Sequence[str]] = None,
+        checks: Sequence[Checker] = (),
+        complete: Callable[[str, str], str] = _default_complete,
+        stats: Optional[CascadeStats] = None,
+        skip_rate: float = 0.9,
+        min_runs: int = 20,
+        probe_every: int = 10,
+    ):
+        """
+        Args:
+            models: Models, cheapest first (default: `settings.cascade_models`).
+            checks: Checkers every output must pass (none: the first model always answers).
+            complete: `complete(model, prompt) -> text` (default: utils.llm.get_response).
+            stats: Statistics to record to (default: the process wide STATS).
+            skip_rate: Escalation rate above which a task starts with its usual model.
+            min_runs: Runs of a task starting with the first model before its escalation rate is used.
+            probe_every: A skipping task still tries the cheap models once every N runs.
+        """
+        self.models = list(models or get_settings().cascade_models)
+        if not self.models:
+            raise ValueError("ModelCascade needs at least one model")
+        self.checks = list(checks)
+        self.complete = complete
+        self.stats = STATS if stats is None else stats
+        self.skip_rate = skip_rate
+        self.min_runs = min_runs
+        self.probe_every = probe_every
+
+    def __repr__(self) -> str:
+        return f"ModelCascade({' -> '.join(self.models)})"
+
+    def _start(self, task: str) -> int:
+        """Index of the first model to try for `task`."""
+        if (
+            self.stats.tried[task] < self.min_runs
+            or self.stats.runs[task] % self.probe_every == 0
+            or self.stats.escalation_rate(task) < self.skip_rate
+        ):
+            return 0
+        usual = self.stats.usual_model(task)
+        return self.models.index(usual) if usual in self.models else 0
+
+    def run(self, prompt: str, task: str = "default", checks: Optional[Sequence[Checker]] = None) -> CascadeResult:
+        """Output of the first model passing the checks (`checks` overrides the cascade's)."""
+        checks = self.checks if checks is None else list(checks)
+        started = time.monotonic()
+        attempts: List[Attempt] = []
+        answer = None  # (text, model) of the last model that answered
+        start = self._start(task)
+        for model in self.models[start:]:
+            call_started = time.monotonic()
+            try:
+                text = self.complete(model, prompt)
+            except Exception as e:
+                attempts.append(Attempt(model, False, [f"{type(e).__name__}: {e}"], time.monotonic() - call_started))
+                logger.warning(f"Cascade {task}: {model} failed ({e}), escalating")
+                continue
+            answer = (text, model)
+            failures = [r.reason or "failed" for r in (_run_check(c, text) for c in checks) if not r.passed]
+            attempts.append(Attempt(model, not failures, failures, time.monotonic() - call_started))
+            if not failures:
+                break
+            logger.info(f"Cascade {task}: {model} output rejected ({'; '.join(failures)}), escalating")
+
+        if answer is None:
+            raise RuntimeError(f"Cascade {task}: every model failed: {[a.reasons for a in attempts]}")
+        text, model = answer
+        passed = attempts[-1].passed
+        result = CascadeResult(text, model, passed, attempts, time.monotonic() - started)
+        self.stats.record(task, result, self.models[0], skipped=start > 0)
+        return result
+
+    async def arun(self, prompt: str, task: str = "default", checks: Optional[Sequence[Checker]] = None) -> CascadeResult:
+        return await asyncio.to_thread(self.run, prompt, task, checks)
+
+    def __call__(self, prompt: str, task: str = "default") -> str:
+        return self.run(prompt, task).text
@@ -0,0 +1,121 @@
+"""
+Google Gemini adapter for the agent engine (google-genai SDK, async streaming).
+
+OpenAI style messages are translated to genai Contents:
+    - system messages -> `system_instruction`,
+    - assistant messages -> "model" contents (text + function_call parts),
+    - tool messages -> "user" contents with function_response parts (merged per turn).
+
+Gemini returns complete function calls (no argument fragments), sometimes without an id: one
+is generated. Their thought signatures are kept by call id and sent back with the history, as
+the API requires for thinking models. The usage metadata of the last chunk (cumulative) is
+reported once, at the end of the stream; the HTTP headers of the first chunk feed the limiter.
+"""
+
+# --- Standard library ---
+import json
+import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# --- Third-party ---
+from google import genai
+from google.genai import types
+
+# --- Local / project ---
+from agentic_learning.core.agent import ModelEvent, ToolCall, Usage
+from agentic_learning.integrations.providers.base import BaseProvider
+from agentic_learning.utils.config import get_settings
+
+
+class GeminiChatModel(BaseProvider):
+    """Streaming Gemini generate_content."""
+
+    provider = "gemini"
+
+    def __init__(self, model: str = "gemini-2.5-flash", client: Optional[genai.Client] = None, **options):
+        super().__init__(model, **options)
+        self._client = client
+        self._signatures: Dict[str, bytes] = {}
+
+    @property
+    def client(self) -> genai.Client:
+        if self._client is None:
+            self._client = genai.Client(api_key=get_settings().api_key("google"))
+        return self._client
+
+    def _to_contents(self, messages: List[dict]) -> Tuple[Optional[str], List[types.Content]]:
+        system, contents = [], []
+
+        def append(role: str, parts: List[types.Part]):
+            if contents and contents[-1].role == role:
+                contents[-1].parts.extend(parts)
+            else:
+                contents.append(types.Content(role=role, parts=parts))
+
+        for message in messages:
+            role, content = message["role"], message.get("content")
+            if role == "system":
+                system.append(content or "")
+            elif role == "tool":
+                try:
+                    response = json.loads(content) if content else {}
+                except json.JSONDecodeError:
+                    response = content
+                if not isinstance(response, dict):
+                    response = {"result": response}
+                append("user", [types.Part(function_response=types.FunctionResponse(
+                    id=message.get("tool_call_id"), name=message.get("name", ""), response=response,
+                ))])
+            elif role == "assistant":
+                parts = [types.Part(text=content)] if content else []
+                for call in message.get("tool_calls") or []:
+                    arguments = call["function"].get("arguments") or "{}"
+                    parts.append(types.Part(
+                        function_call=types.FunctionCall(
+                            id=call["id"],
+                            name=call["function"]["name"],
+                            args=json.loads(arguments) if isinstance(arguments, str) else arguments,
+                        ),
+                        thought_signature=self._signatures.get(call["id"]),
+                    ))
+                append("model", parts)
+            else:
+                append("user", [types.Part(text=content or "")])
+        return ("\n\n".join(system) or None), contents
+
+    async def _stream(self, messages: List[dict], tools: Optional[List[dict]]) -> AsyncIterator[ModelEvent]:
+        system, contents = self._to_contents(messages)
+        config = types.GenerateContentConfig(system_instruction=system, **self.options)
+        if tools:
+            config.tools = [types.Tool(function_declarations=[
+                types.FunctionDeclaration(
+                    name=t["function"]["name"],
+                    description=t["function"].get("description", ""),
+                    parameters_json_schema=t["function"].get("parameters"),
+                )
+                for t in tools
+            ])]
+
+        usage, observed = None, False
+        stream = await self.client.aio.models.generate_content_stream(model=self.model, contents=contents, config=config)
+        async for chunk in stream:
+            if chunk.sdk_http_response and not observed:
+                self.observe(chunk.sdk_http_response.headers)
+                observed = True
+            if chunk.usage_metadata:
+                usage = chunk.usage_metadata
+            if not chunk.candidates or not chunk.candidates[0].content:
+                continue
+            for part in chunk.candidates[0].content.parts or []:
+                if part.function_call:
+                    call_id = part.function_call.id or f"call_{uuid.uuid4().hex[:12]}"
+                    if part.thought_signature:
+                        self._signatures[call_id] = part.thought_signature
+                    yield ModelEvent("tool_call", ToolCall(
+                        call_id, part.function_call.name, json.dumps(part.function_call.args or {}),
+                    ))
+                elif part.text and not part.thought:
+                    yield ModelEvent("text", part.text)
+
+        if usage:
+            yield ModelEvent("usage", Usage(usage.prompt_token_count or 0, usage.candidates_token_count or 0))
@@ -0,0 +1,109 @@
+"""
+Rate limiting and retries for the Google ADK agents (Gemini models).
+
+ADK agents call Gemini through google-genai, outside of the provider adapters, so they get:
+
+    - `retry_options()`: the shared HttpRetryOptions, built from the same RetryPolicy as the
+      adapters (exp_base 2, 30s cap, jitter). The options previously copied in every agent
+      (exp_base=7) could back off for 7^4 seconds during a 429 storm.
+    - `RateLimitPlugin`: an ADK plugin taking a request slot and the estimated tokens from the
+      shared "gemini" limiter before every model call (before_model_callback), settling them
+      with the reported usage (after_model_callback), and pausing the limiter on a 429
+      (on_model_error_callback). Agents running in parallel, or in other runners of the process,
+      queue on the limiter instead of all hitting the quota at once.
+
+    runner = InMemoryRunner(agent=root_agent, plugins=[RateLimitPlugin()])
+    agent = Agent(model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_options()), ...)
+"""
+
+# --- Standard library ---
+from typing import Dict, Optional, Tuple
+
+# --- Third-party ---
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.genai import types
+
+# --- Local / project ---
+from agentic_learning.integrations.providers.base import (
+    RETRYABLE_STATUS,
+    error_retry_after,
+    error_status,
+    provider_limiter,
+)
+from agentic_learning.utils.config import get_settings
+from agentic_learning.utils.rate_limit import AdaptiveRateLimiter, RetryPolicy
+
+
+def retry_options(policy: Optional[RetryPolicy] = None) -> types.HttpRetryOptions:
+    """HttpRetryOptions of the Gemini models, from a RetryPolicy (default: the settings one)."""
+    policy = policy or get_settings().retry_policy()
+    return types.HttpRetryOptions(
+        attempts=policy.attempts,
+        initial_delay=policy.initial_delay,
+        max_delay=policy.max_delay,
+        exp_base=policy.exp_base,
+        jitter=1.0,
+        http_status_codes=sorted(RETRYABLE_STATUS),
+    )
+
+
+def estimate_request_tokens(llm_request: LlmRequest) -> int:
+    """~4 characters per token over the text of the contents and the system instruction."""
+    size = 0
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                size += len(part.text)
+            elif part.function_call or part.function_response:
+                size += len(str(part.function_call or part.function_response))
+    config = llm_request.config
+    if config and isinstance(config.system_instruction, str):
+        size += len(config.system_instruction)
+    max_output = (config.max_output_tokens if config else None) or 0
+    return size // 4 + max_output
+
+
+class RateLimitPlugin(BasePlugin):
+    """Throttles every model call of a runner through a shared AdaptiveRateLimiter."""
+
+    def __init__(self, limiter: Optional[AdaptiveRateLimiter] = None, name: str = "rate_limit"):
+        """
+        Args:
+            limiter: Limiter to use (default: the process wide "gemini" limiter, shared with
+                GeminiChatModel).
+            name: Plugin name.
+        """
+        super().__init__(name=name)
+        self.limiter = limiter or provider_limiter("gemini")
+        self._pending: Dict[Tuple[str, str], int] = {}
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        estimate = estimate_request_tokens(llm_request)
+        self._pending[(callback_context.invocation_id, callback_context.agent_name)] = estimate
+        await self.limiter.acquire(estimate)
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None  # Streamed chunk: the final response settles the call
+        # Popped even without usage metadata: the entry would otherwise stay forever
+        estimate = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), 0)
+        usage = llm_response.usage_metadata
+        if usage:
+            self.limiter.settle(estimate, usage.total_token_count or 0)
+        return None
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> Optional[LlmResponse]:
+        self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if error_status(error) == 429:
+            self.limiter.pause(error_retry_after(error) or get_settings().retry_initial_delay)
+        return None
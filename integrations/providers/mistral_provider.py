@@ -0,0 +1,80 @@
+"""
+Mistral adapter for the agent engine (mistralai v1 SDK, `chat.stream_async`).
+
+The Mistral chat format is close to OpenAI's: messages and tool schemas are passed as-is.
+Stream chunks wrap an OpenAI like completion chunk in `.data`; tool calls usually arrive
+complete, but are accumulated by index like the OpenAI adapter, and their arguments may be a
+dict instead of a JSON string.
+
+The SDK is imported on first use: it is an optional dependency of the project (`mistralai>=1.0`:
+the `Mistral` client is imported from the package, or from `mistralai.client` as in 3.x; the
+0.x SDK has none).
+"""
+
+# --- Standard library ---
+import json
+from typing import AsyncIterator, Dict, List, Optional
+
+# --- Local / project ---
+from agentic_learning.core.agent import ModelEvent, ToolCall, Usage
+from agentic_learning.integrations.providers.base import BaseProvider
+from agentic_learning.utils.config import get_settings
+
+
+class MistralChatModel(BaseProvider):
+    """Streaming Mistral chat completions."""
+
+    provider = "mistral"
+
+    def __init__(self, model: str = "mistral-large-latest", client=None, **options):
+        super().__init__(model, **options)
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            try:
+                from mistralai import Mistral
+            except ImportError:
+                try:
+                    from mistralai.client import Mistral
+                except ImportError as e:
+                    raise ImportError(
+                        "The Mistral provider requires mistralai>=1.0 (no `Mistral` client found in the "
+                        "installed SDK): pip install -U 'mistralai>=1.0'"
+                    ) from e
+
+            self._client = Mistral(api_key=get_settings().api_key("mistral"))
+        return self._client
+
+    async def _stream(self, messages: List[dict], tools: Optional[List[dict]]) -> AsyncIterator[ModelEvent]:
+        params = dict(self.options)
+        if tools:
+            params.update(tools=tools, tool_choice=params.get("tool_choice", "auto"))
+
+        response = await self.client.chat.stream_async(model=self.model, messages=messages, **params)
+
+        calls: Dict[int, dict] = {}
+        async for event in response:
+            chunk = event.data
+            if chunk.usage:
+                yield ModelEvent("usage", Usage(chunk.usage.prompt_tokens or 0, chunk.usage.completion_tokens or 0))
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if isinstance(delta.content, str) and delta.content:
+                yield ModelEvent("text", delta.content)
+            for position, fragment in enumerate(delta.tool_calls or []):
+                index = fragment.index if fragment.index is not None else position
+                call = calls.setdefault(index, {"id": "", "name": "", "arguments": []})
+                if fragment.id:
+                    call["id"] = fragment.id
+                if fragment.function.name:
+                    call["name"] = fragment.function.name
+                arguments = fragment.function.arguments
+                if arguments:
+                    call["arguments"].append(arguments if isinstance(arguments, str) else json.dumps(arguments))
+
+        for index in sorted(calls):
+            call = calls[index]
+            yield ModelEvent("tool_call", ToolCall(call["id"], call["name"], "".join(call["arguments"]) or "{}"))
@@ -0,0 +1,96 @@
+"""
+OpenAI chat model adapter for the agent engine (./core/agent.py).
+
+Streams a chat completion and turns it into engine events:
+    - "text":      content deltas, as they arrive,
+    - "tool_call": complete ToolCall objects (the argument fragments of a call are accumulated
+                   by index and emitted once the stream ends),
+    - "usage":     token usage of the turn (stream_options.include_usage).
+
+Rate limiting, retries and usage accounting come from BaseProvider (./base.py).
+"""
+
+# --- Standard library ---
+from typing import AsyncIterator, Dict, List, Optional
+
+# --- Third-party ---
+from openai import AsyncOpenAI
+
+# --- Local / project ---
+from agentic_learning.core.agent import ModelEvent, ToolCall, Usage
+from agentic_learning.integrations.providers.base import BaseProvider
+from agentic_learning.utils.config import get_settings
+
+
+class OpenAIChatModel(BaseProvider):
+    """Streaming OpenAI chat completions (any OpenAI compatible endpoint via `base_url`)."""
+
+    provider = "openai"
+
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        client: Optional[AsyncOpenAI] = None,
+        base_url: Optional[str] = None,
+        **options,
+    ):
+        """
+        Args:
+            model: Model name.
+            client: Shared AsyncOpenAI client (created on first use otherwise).
+            base_url: OpenAI compatible endpoint (default: settings.openai_base_url).
+            **options: BaseProvider options (retry, requests_per_minute) and extra chat
+                completion parameters (temperature, max_tokens...).
+        """
+        super().__init__(model, **options)
+        self._client = client
+        self.base_url = base_url
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        if self._client is None:
+            # Retries are handled by BaseProvider (jittered, shared with the failover logic)
+            settings = get_settings()
+            self._client = AsyncOpenAI(
+                api_key=settings.api_key("openai"),
+                base_url=self.base_url or settings.openai_base_url,
+                max_retries=0,
+            )
+        return self._client
+
+    async def _stream(self, messages: List[dict], tools: Optional[List[dict]]) -> AsyncIterator[ModelEvent]:
+        params = dict(self.options)
+        if tools:
+            params.update(tools=tools, tool_choice=params.get("tool_choice", "auto"))
+
+        raw = await self.client.chat.completions.with_raw_response.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **params,
+        )
+        self.observe(raw.headers)
+        response = raw.parse()
+
+        calls: Dict[int, dict] = {}
+        async for chunk in response:
+            if chunk.usage:
+                yield ModelEvent("usage", Usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens))
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                yield ModelEvent("text", delta.content)
+            for fragment in delta.tool_calls or []:
+                call = calls.setdefault(fragment.index, {"id": "", "name": "", "arguments": []})
+                if fragment.id:
+                    call["id"] = fragment.id
+                if fragment.function and fragment.function.name:
+                    call["name"] = fragment.function.name
+                if fragment.function and fragment.function.arguments:
+                    call["arguments"].append(fragment.function.arguments)
+
+        for index in sorted(calls):
+            call = calls[index]
+            yield ModelEvent("tool_call", ToolCall(call["id"], call["name"], "".join(call["arguments"]) or "{}"))
@@ -0,0 +1,109 @@
+"""
+Model registry: model name -> provider adapter, with failover.
+
+Routing is a dictionary lookup on the first dash-separated token of the model name
+("claude-sonnet-4-5" -> "claude" -> anthropic), instead of a chain of substring tests. An
+explicit "provider:model" form ("openai:my-finetune") always wins. Adapter modules are imported
+on first use, so routing a name does not import every SDK.
+
+`get_model(model, fallbacks=[...])` returns a FailoverModel when fallbacks are given: a turn
+that fails on a retryable error (429 / 5xx / connection, after the provider retries) BEFORE
+anything was streamed is replayed on the next model.
+
+    model = get_model("gpt-4o", fallbacks=["claude-sonnet-4-5", "gemini-2.5-flash"])
+    agent = Agent(model, tools=RESEARCH_TOOLS)
+"""
+
+# --- Standard library ---
+import importlib
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+# --- Third-party ---
+from loguru import logger
+
+# --- Local / project ---
+from agentic_learning.core.agent import ModelEvent, Usage
+from agentic_learning.integrations.providers.base import BaseProvider, ProviderError
+
+PROVIDERS: Dict[str, str] = {
+    "openai": "agentic_learning.integrations.providers.openai_provider:OpenAIChatModel",
+    "anthropic": "agentic_learning.integrations.providers.anthropic_provider:AnthropicChatModel",
+    "gemini": "agentic_learning.integrations.providers.gemini_provider:GeminiChatModel",
+    "mistral": "agentic_learning.integrations.providers.mistral_provider:MistralChatModel",
+}
+
+# First token of the model name -> provider
+_PREFIXES: Dict[str, str] = {
+    **dict.fromkeys(("gpt", "chatgpt", "o1", "o3", "o4", "openai", "text", "davinci"), "openai"),
+    **dict.fromkeys(("claude", "anthropic"), "anthropic"),
+    **dict.fromkeys(("gemini", "google"), "gemini"),
+    **dict.fromkeys(("mistral", "codestral", "open", "ministral", "magistral", "pixtral", "devstral"), "mistral"),
+}
+
+
+def split_model(model: str) -> Tuple[str, str]:
+    """(provider, model name) of "provider:model" or of a bare model name (routed by prefix)."""
+    provider, sep, name = model.partition(":")
+    if sep and provider in PROVIDERS:
+        return provider, name
+    prefix = model.split("-", 1)[0].lower()
+    return _PREFIXES.get(prefix, "openai"), model  # OpenAI compatible by default
+
+
+def provider_of(model: str) -> str:
+    return split_model(model)[0]
+
+
+def provider_class(provider: str) -> type:
+    try:
+        module, _, name = PROVIDERS[provider].partition(":")
+    except KeyError:
+        raise ValueError(f"Unknown provider {provider!r}, expected one of {sorted(PROVIDERS)}") from None
+    return getattr(importlib.import_module(module), name)
+
+
+def register_provider(name: str, path: str, prefixes: Sequence[str] = ()):
+    """Register an adapter ("package.module:Class") and the model name prefixes routed to it."""
+    PROVIDERS[name] = path
+    _PREFIXES.update(dict.fromkeys(prefixes, name))
+
+
+class FailoverModel:
+    """Chat model trying each model in turn on retryable provider errors."""
+
+    def __init__(self, models: Sequence[BaseProvider]):
+        if not models:
+            raise ValueError("FailoverModel needs at least one model")
+        self.models = list(models)
+
+    def __repr__(self) -> str:
+        return f"FailoverModel({', '.join(map(repr, self.models))})"
+
+    @property
+    def usage(self) -> Usage:
+        total = Usage()
+        for model in self.models:
+            total = total + model.usage
+        return total
+
+    async def stream(self, messages: List[dict], tools: Optional[List[dict]] = None) -> AsyncIterator[ModelEvent]:
+        for i, model in enumerate(self.models):
+            started = False
+            try:
+                async for event in model.stream(messages, tools):
+                    started = True
+                    yield event
+                return
+            except ProviderError as e:
+                if started or not e.retryable or i == len(self.models) - 1:
+                    raise
+                logger.warning(f"{model!r} failed ({e}), failing over to {self.models[i + 1]!r}")
+
+
+def get_model(model: str, fallbacks: Sequence[str] = (), **options):
+    """Adapter for `model` ("gpt-4o", "anthropic:claude-sonnet-4-5"...), with optional fallbacks."""
+    models = []
+    for name in (model, *fallbacks):
+        provider, model_name = split_model(name)
+        models.append(provider_class(provider)(model_name, **options))
+    return models[0] if len(models) == 1 else FailoverModel(models)
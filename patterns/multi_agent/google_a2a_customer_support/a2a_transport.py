@@ -0,0 +1,216 @@
+"""
+Shared A2A transport for the customer support example.
+
+Every A2A hop used to pay a full connection setup: `requests.get` for the agent card and a
+private `httpx.AsyncClient` per `RemoteA2aAgent`. This module provides:
+
+1- One pooled `httpx.AsyncClient` per event loop (keep-alive + HTTP/2 when `h2` is installed).
+   With HTTP/2 concurrent sub-agent calls are multiplexed as streams over the same connection
+   (the HTTP/2 replacement for request pipelining), so a customer support fan-out to the product
+   catalog does not serialize on TCP/TLS handshakes. Without `h2` the pool falls back to
+   parallel HTTP/1.1 keep-alive connections.
+
+2- An agent-card cache that honors `Cache-Control` (max-age, no-cache, no-store), `Expires`,
+   and revalidates stale entries with `ETag` / `Last-Modified` conditional requests (304).
+
+3- `build_remote_a2a_agent` that wires both into a `RemoteA2aAgent`.
+
+NOTE: an `httpx.AsyncClient` is bound to the event loop it is used in, hence the per-loop pool.
+Build the remote agents inside the running loop (see support_agent.py).
+"""
+
+# --- Standard library ---
+import asyncio
+import copy
+import importlib.util
+import re
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+# --- Third-party ---
+import httpx
+import requests
+from a2a.types import AgentCard
+from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH, RemoteA2aAgent
+from requests.adapters import HTTPAdapter
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Pool sizing: enough keep-alive connections for a support fan-out, bounded to protect the backend
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+# Same default as RemoteA2aAgent: remote agents run a full LLM turn
+A2A_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# Used when the server sends no caching headers at all
+DEFAULT_CARD_TTL = 60.0
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled `httpx.AsyncClient` of the running event loop (created on first use)."""
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        client = _clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=POOL_LIMITS, timeout=A2A_TIMEOUT)
+            _clients[loop] = client
+        return client
+
+
+async def close_async_client() -> None:
+    """Close the pooled client of the running event loop (call it before the loop ends)."""
+    with _clients_lock:
+        client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _card_url(url: str) -> str:
+    """Accept either the agent base URL or the full agent card URL."""
+    url = url.rstrip("/")
+    return url if url.endswith(AGENT_CARD_WELL_KNOWN_PATH) else f"{url}{AGENT_CARD_WELL_KNOWN_PATH}"
+
+
+class AgentCardCache:
+    """
+    HTTP cache for A2A agent cards, shared by sync (requests) and async (httpx) callers.
+    """
+
+    def __init__(self, default_ttl: float = DEFAULT_CARD_TTL):
+        self.default_ttl = default_ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        # Pooled sync session (used by scripts / list_distant_agents)
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+    # --- Cache policy ---
+
+    def _expires_at(self, headers) -> Optional[float]:
+        """Absolute expiry time from the response headers (None = must revalidate every time)."""
+        cache_control = headers.get("cache-control", "").lower()
+        if "no-cache" in cache_control or "no-store" in cache_control:
+            return None
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            age = float(headers.get("age", 0) or 0)
+            return time.time() + max(0.0, float(match.group(1)) - age)
+        if headers.get("expires"):
+            try:
+                return parsedate_to_datetime(headers["expires"]).timestamp()
+            except (TypeError, ValueError):
+                return time.time()  # Invalid Expires means "already expired"
+        return time.time() + self.default_ttl
+
+    def _fresh(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(url)
+        if entry and entry["expires_at"] is not None and entry["expires_at"] > time.time():
+            return entry["card"]
+        return None
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        entry = self._entries.get(url)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _store(self, url: str, status_code: int, headers, body) -> Dict[str, Any]:
+        with self._lock:
+            if status_code == 304 and url in self._entries:
+                entry = self._entries[url]
+                entry["expires_at"] = self._expires_at(headers)
+                entry["etag"] = headers.get("etag", entry.get("etag"))
+                return entry["card"]
+
+            card = body()
+            if "no-store" not in headers.get("cache-control", "").lower():
+                self._entries[url] = {
+                    "card": card,
+                    "etag": headers.get("etag"),
+                    "last_modified": headers.get("last-modified"),
+                    "expires_at": self._expires_at(headers),
+                }
+            return card
+
+    # --- Fetch ---
+
+    def get(self, url: str, timeout: float = 5.0) -> Dict[str, Any]:
+        """Return the agent card JSON for `url` (base URL or card URL), revalidating if stale."""
+        url = _card_url(url)
+        card = self._fresh(url)
+        if card is not None:
+            return card
+
+        response = self._session.get(url, headers=self._conditional_headers(url), timeout=timeout)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self._store(url, response.status_code, response.headers, response.json)
+
+    async def aget(self, url: str) -> Dict[str, Any]:
+        """Async version of `get`, using the pooled client of the running loop."""
+        url = _card_url(url)
+        card = self._fresh(url)
+        if card is not None:
+            return card
+
+        response = await get_async_client().get(url, headers=self._conditional_headers(url), timeout=5.0)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self._store(url, response.status_code, response.headers, response.json)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_card_url(url), None)
+
+
+# Process-wide cache instance
+card_cache = AgentCardCache()
+
+
+def parse_agent_card(card_json: Dict[str, Any]) -> AgentCard:
+    """Build an `AgentCard` from its JSON (a2a-sdk 0.x pydantic model or 1.x protobuf message)."""
+    if hasattr(AgentCard, "model_validate"):
+        return AgentCard.model_validate(card_json)
+    from a2a.client.card_resolver import parse_agent_card as parse_v1_card
+
+    # The 1.x parser rewrites legacy fields in place: keep the cached JSON intact
+    return parse_v1_card(copy.deepcopy(card_json))
+
+
+async def build_remote_a2a_agent(name: str, url: str, description: str = "", **kwargs) -> RemoteA2aAgent:
+    """
+    Create a `RemoteA2aAgent` that shares the pooled transport and the agent-card cache.
+
+    Args:
+        name: Local name of the remote agent.
+        url: Base URL of the A2A server (or its agent card URL).
+        description: Description used by the parent agent to decide when to delegate.
+        **kwargs: Extra `RemoteA2aAgent` arguments.
+
+    Returns:
+        RemoteA2aAgent: Agent proxy with a resolved card (no extra fetch on first call).
+    """
+    card = parse_agent_card(await card_cache.aget(url))
+    return RemoteA2aAgent(
+        name=name,
+        agent_card=card,
+        description=description,
+        httpx_client=get_async_client(),
+        **kwargs,
+    )
@@ -0,0 +1,181 @@
+"""
+Product catalog backend for the Product Catalog Agent (product_agent.py).
+
+The catalog is stored in DuckDB (in-memory by default, or a database file / CSV for real data).
+At load time three in-memory indexes are built so that lookups never hit the database:
+
+    - exact index:  normalized product name -> product info (dict, O(1))
+    - prefix index: sorted normalized names, searched with bisect ("macbook" -> "macbook pro 14")
+    - fuzzy index:  character trigram -> product ids, used to rank candidates for misspelled
+                    names ("samsng galaxy" -> "samsung galaxy s24"), re-ranked with difflib.
+
+Only an exact name or a unique prefix resolves to a product. A fuzzy hit is never answered as
+the product ("iPhone 16 Pro" is not the iPhone 15 Pro): it is only offered as a "Did you mean"
+suggestion, and miss responses list a bounded number of them, whatever the catalog size.
+"""
+
+# --- Standard library ---
+import re
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# --- Third-party ---
+import duckdb
+import pandas as pd
+
+# Mock product catalog - in production, this would be the vendor's product database
+DEFAULT_PRODUCTS = [
+    ("iPhone 15 Pro", "iPhone 15 Pro, $999, Low Stock (8 units), 128GB, Titanium finish"),
+    ("Samsung Galaxy S24", "Samsung Galaxy S24, $799, In Stock (31 units), 256GB, Phantom Black"),
+    ("Dell XPS 15", 'Dell XPS 15, $1,299, In Stock (45 units), 15.6" display, 16GB RAM, 512GB SSD'),
+    ("MacBook Pro 14", 'MacBook Pro 14", $1,999, In Stock (22 units), M3 Pro chip, 18GB RAM, 512GB SSD'),
+    ("Sony WH-1000XM5", "Sony WH-1000XM5 Headphones, $399, In Stock (67 units), Noise-canceling, 30hr battery"),
+    ("iPad Air", 'iPad Air, $599, In Stock (28 units), 10.9" display, 64GB'),
+    ("LG UltraWide 34", 'LG UltraWide 34" Monitor, $499, Out of Stock, Expected: Next week'),
+]
+
+MAX_SUGGESTIONS = 5
+
+# Trigrams shared by more products than this are too common to discriminate (e.g. "pro")
+_MAX_POSTING = 5000
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, drop quotes and collapse whitespace."""
+    return _SPACES_RE.sub(" ", name.lower().replace('"', " ").replace("'", " ")).strip()
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class ProductCatalog:
+    """DuckDB-backed product catalog with exact, prefix and fuzzy in-memory indexes."""
+
+    def __init__(self, database: str = ":memory:", fuzzy_cutoff: float = 0.6):
+        self.con = duckdb.connect(database)
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.con.execute(
+            "CREATE TABLE IF NOT EXISTS products (key VARCHAR PRIMARY KEY, name VARCHAR, info VARCHAR)"
+        )
+        self._build_indexes()
+
+    # --- Loading ---
+
+    def add_products(self, products: Iterable[Tuple[str, str]]) -> None:
+        """Insert or replace (name, info) rows, then rebuild the indexes."""
+        frame = pd.DataFrame(list(products), columns=["name", "info"], dtype=object)
+        if frame.empty:
+            return
+        frame.insert(0, "key", frame["name"].map(normalize_name))
+        # One statement for the whole batch (the last row of a duplicated name wins, as row by row)
+        frame = frame.drop_duplicates("key", keep="last")
+        self.con.register("new_products", frame)
+        try:
+            self.con.execute("INSERT OR REPLACE INTO products SELECT key, name, info FROM new_products")
+        finally:
+            self.con.unregister("new_products")
+        self._build_indexes()
+
+    def load_csv(self, csv_path: str) -> None:
+        """Bulk load a CSV file with `name` and `info` columns (fast path for large catalogs)."""
+        self.con.execute(
+            """
+            INSERT OR REPLACE INTO products
+            SELECT lower(regexp_replace(trim(replace(replace(name, '"', ' '), '''', ' ')), '\\s+', ' ', 'g')),
+                   name, info
+            FROM read_csv_auto(?)
+            """,
+            [csv_path],
+        )
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        rows = self.con.execute("SELECT key, name, info FROM products ORDER BY key").fetchall()
+
+        self._keys: List[str] = [key for key, _, _ in rows]  # Sorted: doubles as the prefix index
+        self._names: List[str] = [name for _, name, _ in rows]
+        self._infos: List[str] = [info for _, _, info in rows]
+        self._by_key: Dict[str, int] = {key: i for i, key in enumerate(self._keys)}
+
+        postings: Dict[str, List[int]] = {}
+        for i, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, []).append(i)
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # --- Lookup ---
+
+    def _prefix_matches(self, key: str, limit: int) -> List[int]:
+        start = bisect_left(self._keys, key)
+        matches = []
+        for i in range(start, min(start + limit, len(self._keys))):
+            if not self._keys[i].startswith(key):
+                break
+            matches.append(i)
+        return matches
+
+    def _fuzzy_matches(self, key: str, limit: int) -> List[Tuple[float, int]]:
+        grams = _trigrams(key)
+        counts = Counter()
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting and len(posting) <= _MAX_POSTING:
+                counts.update(posting)
+
+        # Re-rank the best trigram candidates with an edit-based similarity
+        scored = []
+        for i, _ in counts.most_common(4 * limit):
+            scored.append((SequenceMatcher(None, key, self._keys[i]).ratio(), i))
+        scored.sort(reverse=True)
+        return scored[:limit]
+
+    def find(self, product_name: str) -> Tuple[Optional[int], List[int]]:
+        """
+        Resolve a product name.
+
+        Only an exact name or a unique prefix resolves; fuzzy matches (similarity >=
+        `fuzzy_cutoff`) are only suggestions.
+
+        Returns:
+            (product id or None, suggested product ids) - suggestions only on a miss.
+        """
+        key = normalize_name(product_name)
+        if key in self._by_key:
+            return self._by_key[key], []
+
+        prefix = self._prefix_matches(key, MAX_SUGGESTIONS) if key else []
+        if len(prefix) == 1:
+            return prefix[0], []
+
+        fuzzy = self._fuzzy_matches(key, MAX_SUGGESTIONS) if key else []
+        suggestions = list(dict.fromkeys(prefix + [i for score, i in fuzzy if score >= self.fuzzy_cutoff]))
+        suggestions = suggestions[:MAX_SUGGESTIONS]
+        return None, suggestions
+
+    def lookup(self, product_name: str) -> str:
+        """Agent-facing answer for one product (bounded size on a miss)."""
+        product_id, suggestions = self.find(product_name)
+        if product_id is not None:
+            return f"Product: {self._infos[product_id]}"
+        if suggestions:
+            names = ", ".join(self._names[i] for i in suggestions)
+            return f"Sorry, I don't have information for {product_name}. Did you mean: {names}?"
+        return f"Sorry, I don't have information for {product_name}."
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> ProductCatalog:
+    """Process-wide catalog, loaded once (seeded with the mock products)."""
+    catalog = ProductCatalog()
+    catalog.add_products(DEFAULT_PRODUCTS)
+    return catalog
@@ -0,0 +1,37 @@
+"""
+Request coalescing in front of the remote Product Catalog Agent.
+
+During traffic spikes many customers ask about the same hot products at once, and each
+question used to trigger its own A2A round trip (and LLM turn) on the product agent.
+
+`CoalescingAgentTool` exposes the remote agent as a tool whose calls go through a
+`SingleFlight` (see ./utils/cache.py): identical in-flight requests (same normalized request
+text) share one upstream call, and the answer is served from a short TTL cache afterwards.
+"""
+
+# --- Standard library ---
+import json
+from typing import Any, Optional
+
+# --- Third-party ---
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.tool_context import ToolContext
+
+# --- Local / project ---
+from agentic_learning.utils.cache import SingleFlight, normalize_query
+
+
+class CoalescingAgentTool(AgentTool):
+    """`AgentTool` sharing one upstream call between identical concurrent requests."""
+
+    def __init__(self, agent: BaseAgent, flight: Optional[SingleFlight] = None, ttl: float = 30.0, **kwargs):
+        super().__init__(agent, **kwargs)
+        self.flight = flight or SingleFlight(ttl=ttl)
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        request = args.get("request") if "request" in args else json.dumps(args, sort_keys=True)
+        key = (self.name, normalize_query(request))
+        return await self.flight.do(
+            key, lambda: super(CoalescingAgentTool, self).run_async(args=args, tool_context=tool_context)
+        )
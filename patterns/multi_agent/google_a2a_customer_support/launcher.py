@@ -0,0 +1,268 @@
+"""
+Launcher for the A2A Product Catalog Agent server (product_agent.py).
+
+Replaces the "spawn and poll the agent card every 5 seconds" startup with:
+
+1- Readiness signaling: the launcher opens a local TCP socket and passes its address to the
+   server (env var `A2A_READY_ADDR`). Every uvicorn worker sends `READY <pid>` as soon as its
+   lifespan startup is done and its port accepts connections, so `start()` returns right when the
+   backend is up (no fixed sleeps).
+
+2- Multi-worker uvicorn: the server runs `--workers N` processes sharing the listening socket,
+   so the A2A backend scales across cores.
+
+3- Graceful shutdown: SIGTERM first (uvicorn drains in-flight requests), SIGKILL after a timeout.
+
+4- Health-checked restarts: a monitor thread fetches the agent card periodically and restarts
+   the server if the process died or the health check failed `max_failures` times in a row.
+"""
+
+# --- Standard library ---
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+# --- Third-party ---
+import requests
+from loguru import logger
+
+READY_ENV_VAR = "A2A_READY_ADDR"
+AGENT_CARD_PATH = "/.well-known/agent-card.json"
+
+_POSIX = hasattr(os, "killpg")
+
+
+#### SERVER SIDE (runs inside every uvicorn worker) ####
+
+def _send_ready(ready_addr: str) -> None:
+    host, port = ready_addr.rsplit(":", 1)
+    with socket.create_connection((host, int(port)), timeout=5) as conn:
+        conn.sendall(f"READY {os.getpid()}\n".encode())
+
+
+async def _notify_when_listening(ready_addr: str, host: str, port: int) -> None:
+    # The lifespan startup completes before uvicorn binds its socket in single-worker mode:
+    # wait until the port accepts connections before reporting ready.
+    host = "127.0.0.1" if host in ("0.0.0.0", "") else host
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            break
+        except OSError:
+            await asyncio.sleep(0.01)
+    await asyncio.to_thread(_send_ready, ready_addr)
+
+
+class ReadinessMiddleware:
+    """ASGI wrapper reporting readiness to the launcher once the app lifespan has started."""
+
+    def __init__(self, app, host: str, port: int):
+        self.app = app
+        self.host = host
+        self.port = port
+        self._tasks = set()
+
+    async def __call__(self, scope, receive, send):
+        ready_addr = os.environ.get(READY_ENV_VAR)
+        if scope["type"] != "lifespan" or not ready_addr:
+            return await self.app(scope, receive, send)
+
+        async def send_wrapper(message):
+            await send(message)
+            if message["type"] == "lifespan.startup.complete":
+                task = asyncio.create_task(_notify_when_listening(ready_addr, self.host, self.port))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        return await self.app(scope, receive, send_wrapper)
+
+
+#### LAUNCHER SIDE ####
+
+class A2AServerLauncher:
+    """
+    Start, monitor and stop an A2A server script.
+
+    Usage:
+        with A2AServerLauncher(script_path, port=8005, workers=2) as launcher:
+            ...  # the server is ready here
+    """
+
+    def __init__(
+        self,
+        script_path: str,
+        host: str = "localhost",
+        port: int = 8005,
+        workers: int = 1,
+        startup_timeout: float = 60.0,
+        health_interval: float = 5.0,
+        max_failures: int = 3,
+        shutdown_timeout: float = 10.0,
+        log_path: Optional[str] = None,
+    ):
+        self.script_path = script_path
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.startup_timeout = startup_timeout
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self.shutdown_timeout = shutdown_timeout
+        self.log_path = log_path
+
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self._session = requests.Session()
+        self._stop_event = threading.Event()
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # --- Lifecycle ---
+
+    def start(self) -> bool:
+        """Start the server, wait for readiness and start the health monitor. Returns True if ready."""
+        ready = self._spawn()
+        if self.health_interval and self._monitor_thread is None:
+            self._stop_event.clear()
+            self._monitor_thread = threading.Thread(target=self._monitor, name="a2a-health", daemon=True)
+            self._monitor_thread.start()
+        return ready
+
+    def stop(self) -> None:
+        """Stop the health monitor and shut the server down gracefully."""
+        self._stop_event.set()
+        if self._monitor_thread is not None:
+            self._monitor_thread.join(timeout=self.health_interval + 1)
+            self._monitor_thread = None
+        self._terminate()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _spawn(self) -> bool:
+        with self._lock:
+            with socket.create_server(("127.0.0.1", 0)) as ready_server:
+                ready_server.settimeout(self.startup_timeout)
+                ready_addr = "127.0.0.1:%d" % ready_server.getsockname()[1]
+
+                output = open(self.log_path, "ab") if self.log_path else subprocess.DEVNULL
+                started = time.perf_counter()
+                self.process = subprocess.Popen(
+                    [
+                        sys.executable,
+                        self.script_path,
+                        "--host", self.host,
+                        "--port", str(self.port),
+                        "--workers", str(self.workers),
+                    ],
+                    cwd=os.path.dirname(os.path.abspath(self.script_path)),
+                    stdout=output,
+                    stderr=output,
+                    # Pass environment variables (including GOOGLE_API_KEY) and the readiness address
+                    env={**os.environ, READY_ENV_VAR: ready_addr},
+                    # Own process group: the workers can be signaled (or reaped) together with their supervisor
+                    start_new_session=_POSIX,
+                )
+                if output is not subprocess.DEVNULL:
+                    output.close()
+
+                ready_pids = self._wait_ready(ready_server, started)
+
+            elapsed = time.perf_counter() - started
+            if len(ready_pids) < self.workers:
+                logger.warning(
+                    f"⚠️ A2A server {self.url}: {len(ready_pids)}/{self.workers} workers ready after {elapsed:.2f}s"
+                )
+                return bool(ready_pids)
+
+            logger.info(f"✅ A2A server {self.url} ready in {elapsed:.2f}s ({self.workers} workers)")
+            return True
+
+    def _wait_ready(self, ready_server: socket.socket, started: float) -> set:
+        ready_pids = set()
+        while len(ready_pids) < self.workers:
+            remaining = self.startup_timeout - (time.perf_counter() - started)
+            if remaining <= 0 or self.process.poll() is not None:
+                break
+            ready_server.settimeout(min(remaining, 0.5))
+            try:
+                conn, _ = ready_server.accept()
+            except socket.timeout:
+                continue  # Re-check the process is still alive
+            with conn:
+                conn.settimeout(5)
+                message = conn.recv(64).decode(errors="ignore").split()
+                if len(message) == 2 and message[0] == "READY":
+                    ready_pids.add(message[1])
+        return ready_pids
+
+    def _signal(self, sig: int) -> None:
+        try:
+            if _POSIX:
+                os.killpg(self.process.pid, sig)
+            else:
+                self.process.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _terminate(self) -> None:
+        with self._lock:
+            if self.process is None:
+                return
+            if self.process.poll() is not None:
+                # The supervisor died: reap workers it may have orphaned (they would keep the port)
+                self._signal(signal.SIGKILL)
+                self.process = None
+                return
+            # uvicorn handles SIGTERM gracefully (stop accepting, drain requests, run lifespan shutdown)
+            self._signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=self.shutdown_timeout)
+            except subprocess.TimeoutExpired:
+                logger.warning("⚠️ A2A server did not stop in time, killing it.")
+                self._signal(signal.SIGKILL)
+                self.process.wait()
+            self.process = None
+
+    # --- Health ---
+
+    def health_check(self) -> bool:
+        """True if the process is alive and serves its agent card."""
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            return self._session.get(f"{self.url}{AGENT_CARD_PATH}", timeout=2).status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+
+    def _monitor(self) -> None:
+        failures = 0
+        while not self._stop_event.wait(self.health_interval):
+            if self.health_check():
+                failures = 0
+                continue
+
+            failures += 1
+            dead = self.process is None or self.process.poll() is not None
+            if dead or failures >= self.max_failures:
+                logger.warning(f"⚠️ A2A server unhealthy ({failures} failed checks), restarting...")
+                self._terminate()
+                if not self._stop_event.is_set():
+                    self._spawn()
+                    self.restarts += 1
+                failures = 0
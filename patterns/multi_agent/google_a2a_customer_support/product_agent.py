@@ -1,32 +1,23 @@
-
-
-import json
-import requests
-import subprocess
-import time
-import uuid
+import argparse
+import os
 import uvicorn
 from google.adk.agents import LlmAgent
-from google.adk.agents.remote_a2a_agent import (
-    RemoteA2aAgent,
-    AGENT_CARD_WELL_KNOWN_PATH,
-)
 
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
 from google.adk.models.google_llm import Gemini
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+from agentic_learning.integrations.providers.google_adk import retry_options
 
 # Hide additional warnings in the notebook
 import warnings
 warnings.filterwarnings("ignore")
+from agentic_learning.patterns.multi_agent.google_a2a_customer_support.catalog import get_catalog
+from agentic_learning.patterns.multi_agent.google_a2a_customer_support.launcher import ReadinessMiddleware
 from agentic_learning.utils.utils import load_env
 
 ##### TOOLS ######
 
-# Define a product catalog lookup tool
-# In a real system, this would query the vendor's product database
+# Product catalog lookup tools
+# The catalog (./catalog.py) is loaded once per process into DuckDB + in-memory indexes
 def get_product_info(product_name: str) -> str:
     """Get product information for a given product.
 
@@ -36,39 +27,37 @@ def get_product_info(product_name: str) -> str:
     Returns:
         Product information as a string
     """
-    # Mock product catalog - in production, this would query a real database
-    product_catalog = {
-        "iphone 15 pro": "iPhone 15 Pro, $999, Low Stock (8 units), 128GB, Titanium finish",
-        "samsung galaxy s24": "Samsung Galaxy S24, $799, In Stock (31 units), 256GB, Phantom Black",
-        "dell xps 15": 'Dell XPS 15, $1,299, In Stock (45 units), 15.6" display, 16GB RAM, 512GB SSD',
-        "macbook pro 14": 'MacBook Pro 14", $1,999, In Stock (22 units), M3 Pro chip, 18GB RAM, 512GB SSD',
-        "sony wh-1000xm5": "Sony WH-1000XM5 Headphones, $399, In Stock (67 units), Noise-canceling, 30hr battery",
-        "ipad air": 'iPad Air, $599, In Stock (28 units), 10.9" display, 64GB',
-        "lg ultrawide 34": 'LG UltraWide 34" Monitor, $499, Out of Stock, Expected: Next week',
-    }
+    return get_catalog().lookup(product_name)
 
-    product_lower = product_name.lower().strip()
 
-    if product_lower in product_catalog:
-        return f"Product: {product_catalog[product_lower]}"
-    else:
-        available = ", ".join([p.title() for p in product_catalog.keys()])
-        return f"Sorry, I don't have information for {product_name}. Available products: {available}"
+def get_products_info(product_names: list[str]) -> list[str]:
+    """Get product information for several products at once.
 
+    Args:
+        product_names: Names of the products (e.g., ["Dell XPS 15", "MacBook Pro 14"])
 
+    Returns:
+        Product information for each product, in the same order
+    """
+    catalog = get_catalog()
+    return [catalog.lookup(name) for name in product_names]
 
 
 ######## Main Agent ########
 
-if __name__ == "__main__":
+# Import string of the app factory: uvicorn needs it to start several worker processes
+APP_FACTORY = "agentic_learning.patterns.multi_agent.google_a2a_customer_support.product_agent:create_app"
+
+
+def create_app():
+    """Build the A2A application of the Product Catalog Agent (called once per uvicorn worker)."""
     load_env()
 
-    retry_config = types.HttpRetryOptions(
-        attempts=5,  # Maximum retry attempts
-        exp_base=7,  # Delay multiplier
-        initial_delay=1,
-        http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
-    )
+    # The public host/port are set by the __main__ section below (inherited by the workers)
+    host = os.environ.get("A2A_HOST", "localhost")
+    port = int(os.environ.get("A2A_PORT", "8005"))
+
+    retry_config = retry_options()
 
     # Create the Product Catalog Agent
     # This agent specializes in providing product information from the vendor's catalog
@@ -80,19 +69,31 @@ if __name__ == "__main__":
         You are a product catalog specialist from an external vendor.
         When asked about products, use the get_product_info tool to fetch data from the catalog.
         Provide clear, accurate product information including price, availability, and specs.
-        If asked about multiple products, look up each one.
+        If asked about multiple products, look them all up in one get_products_info call.
         Be professional and helpful.
         """,
-        tools=[get_product_info],  # Register the product lookup tool
+        tools=[get_product_info, get_products_info],  # Register the product lookup tools
     )
-        
+
     # Convert the product catalog agent to an A2A-compatible application
     # This creates a FastAPI/Starlette app that:
     #   1. Serves the agent at the A2A protocol endpoints
     #   2. Provides an auto-generated agent card
     #   3. Handles A2A communication protocol
-    product_catalog_a2a_app = to_a2a(
-        product_catalog_agent, port=8005  # Port where this agent will be served
-    )
-    
-    uvicorn.run(product_catalog_a2a_app, host="0.0.0.0", port=8005)
\ No newline at end of file
+    product_catalog_a2a_app = to_a2a(product_catalog_agent, host=host, port=port)
+
+    # Report readiness to the launcher (no-op when started by hand)
+    return ReadinessMiddleware(product_catalog_a2a_app, host=host, port=port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the Product Catalog Agent over A2A.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8005)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ["A2A_HOST"] = args.host
+    os.environ["A2A_PORT"] = str(args.port)
+
+    uvicorn.run(APP_FACTORY, factory=True, host=args.host, port=args.port, workers=args.workers)
@@ -10,31 +10,44 @@ the workflow by either:
 2- Orchestrate sub-agents **Sequential Workflow**, where the steps are deterministics 
 whereas in the first case is up to the aget to decide about the order.
 
+3- Compile a declarative **Pipeline** (./pipeline.py): the steps declare the state keys they read
+and write, independent steps run in parallel and no coordinator LLM turn is spent between steps.
+Here the summary and the source extraction (a plain function) both run after the research:
+
+SequentialAgent[ ResearchAgent, ParallelAgent[SummarizerAgent | sources] ]
+
 """
 
 from google.adk.agents import Agent, SequentialAgent, ParallelAgent, LoopAgent
 from google.adk.models.google_llm import Gemini
 from google.adk.runners import InMemoryRunner
 from google.adk.tools import AgentTool, FunctionTool, google_search
-from google.genai import types
+from agentic_learning.integrations.providers.google_adk import RateLimitPlugin, retry_options
+from agentic_learning.patterns.multi_agent.pipeline import Pipeline, Step
 from agentic_learning.utils import utils
 import asyncio
 import os
+import re
+
+
+def extract_sources(research_findings):
+    """URLs cited in the research findings (function step of the pipeline, no LLM call)."""
+    return list(dict.fromkeys(re.findall(r"https?://[^\s)\]>\"']+", research_findings or "")))
 
-async def agents_as_tools_workflow(is_sub_agents_mode=True):
-    """Run the Research Pipeline using Agents as Tools.
-    Drawback is that the call and call order is not deterministic.
-    Prefer Sequential Pattern for deterministic call order.
+
+async def agents_as_tools_workflow(mode="pipeline"):
+    """Run the Research Pipeline.
+
+    mode:
+        "tools": a coordinator agent calls the agents as tools. Drawback is that the call and call
+                 order is not deterministic, and every step costs a coordinator turn.
+        "sequential": SequentialAgent, deterministic call order.
+        "pipeline": declarative pipeline compiled to Sequential / Parallel agents.
     """
     api_key = os.environ["GOOGLE_API_KEY"] 
     print(f"✅ Gemini API key setup complete: {api_key}")
 
-    retry_config=types.HttpRetryOptions(
-        attempts=5,  # Maximum retry attempts
-        exp_base=7,  # Delay multiplier
-        initial_delay=1,
-        http_status_codes=[429, 500, 503, 504], # Retry on these HTTP errors
-    )
+    retry_config=retry_options()
 
     # Research Agent: Its job is to use the google_search tool and present findings.
     research_agent = Agent(
@@ -69,9 +82,18 @@ async def agents_as_tools_workflow(is_sub_agents_mode=True):
 
     print("✅ summarizer_agent created.")
 
-    if is_sub_agents_mode :
+    if mode == "sequential":
         root_agent = SequentialAgent(name="ResearchCoordinator", sub_agents=[research_agent, summarizer_agent])
-    else :
+    elif mode == "pipeline":
+        # research_findings flows from ResearchAgent to both the summarizer ({research_findings}) and extract_sources.
+        pipeline = Pipeline([
+            Step("research", agent=research_agent),
+            Step("summarize", agent=summarizer_agent),
+            Step("sources", fn=extract_sources, inputs=["research_findings"], output="sources"),
+        ])
+        print(f"✅ Pipeline plan: {pipeline.plan()}")
+        root_agent = pipeline.compile("ResearchCoordinator")
+    elif mode == "tools":
         # Root Coordinator: Orchestrates the workflow by calling the sub-agents as tools.
         root_agent = Agent(
         
@@ -91,10 +113,12 @@ async def agents_as_tools_workflow(is_sub_agents_mode=True):
         # We wrap the sub-agents in `AgentTool` to make them callable tools for the root agent.
         tools=[AgentTool(research_agent), AgentTool(summarizer_agent)],
     )
+    else:
+        raise ValueError(f"Unknown mode: {mode!r}")
     
     print("✅ root_agent created.")
 
-    runner = InMemoryRunner(agent=root_agent)
+    runner = InMemoryRunner(agent=root_agent, plugins=[RateLimitPlugin()])
 
     response = await runner.run_debug(
         "What are the latest advancements in agentic AI ?"
@@ -106,4 +130,4 @@ async def agents_as_tools_workflow(is_sub_agents_mode=True):
 
 if __name__ == "__main__":
     utils.load_env()
-    asyncio.run(agents_as_tools_workflow(True))
+    asyncio.run(agents_as_tools_workflow("pipeline"))
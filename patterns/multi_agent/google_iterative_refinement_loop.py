@@ -2,49 +2,36 @@
 1- Writer Agent: Writes a draft of a short story
 2- Critic Agent: Reviews and critiques the short story to suggest improvements
 
-SequentialAgent[InitialWriterAgent -> [CriticAgent <-> RefinerAgentWorkflow]]
+SequentialAgent[InitialWriterAgent -> RefinementLoopAgent[CriticAgent <-> RefinerAgent]]
 
+The loop (./refinement_loop.py) stops in code: on an "APPROVED" critique (no refiner call, no
+exit_loop tool), when the refiner stops changing the story, or when the token / time budget is
+spent. The critic runs on `settings.critic_model` (AGENTIC_CRITIC_MODEL).
 """
 
 from loguru import logger
 from agentic_learning.utils.utils import load_env
-from google.adk.agents import Agent, SequentialAgent, LoopAgent
+from agentic_learning.utils.config import get_settings
+from google.adk.agents import Agent, SequentialAgent
 from google.adk.models.google_llm import Gemini
 from google.adk.runners import InMemoryRunner
-from google.genai import types
-from google.adk.tools import FunctionTool
+from agentic_learning.integrations.providers.google_adk import RateLimitPlugin, retry_options
+from agentic_learning.patterns.multi_agent.refinement_loop import RefinementLoopAgent
 
 import asyncio
 
 
-# This is the function that the RefinerAgent will call to exit the loop.
-# The LoopAgent itself doesn't automatically know that "APPROVED" means "stop."
-# It needs an agent to give it an explicit signal to terminate the loop.
-# We do this in two parts:
-# A simple Python function that the LoopAgent understands as an "exit" signal.
-# An agent that can call that function when the right condition is met.
-def exit_loop():
-    """Call this function ONLY when the critique is 'APPROVED', indicating the story is finished and no more changes are needed."""
-    return {"status": "approved", "message": "Story approved. Exiting refinement loop."}
-
-    logger.info("✅ exit_loop function created.")
-
-
 if __name__ == "__main__":
     load_env()
 
-    retry_config=types.HttpRetryOptions(
-        attempts=5,  # Maximum retry attempts
-        exp_base=7,  # Delay multiplier
-        initial_delay=1,
-        http_status_codes=[429, 500, 503, 504], # Retry on these HTTP errors
-    )
+    retry_config=retry_options()
+    settings = get_settings()
 
     # This agent runs ONCE at the beginning to create the first draft.
     initial_writer_agent = Agent(
         name="InitialWriterAgent",
         model=Gemini(
-            model="gemini-2.5-flash-lite",
+            model=settings.gemini_model,
             retry_options=retry_config
         ),
         instruction="""Based on the user's prompt, write the first draft of a short story (around 100-150 words).
@@ -55,10 +42,11 @@ if __name__ == "__main__":
     logger.info("✅ initial_writer_agent created.")
 
     # This agent's only job is to provide feedback or the approval signal. It has no tools.
+    # Answering "APPROVED" or a few suggestions does not need the writer's model: it runs on the critic model.
     critic_agent = Agent(
         name="CriticAgent",
         model=Gemini(
-            model="gemini-2.5-flash-lite",
+            model=settings.critic_model,
             retry_options=retry_config
         ),
     instruction="""You are a constructive story critic. Review the story provided below.
@@ -72,12 +60,12 @@ if __name__ == "__main__":
 
     logger.info("✅ critic_agent created.")
 
-    # This agent refines the story based on critique OR calls the exit_loop function.
-    # NOTE: exit_loop is wrapped into a **FunctionTool** to be used as a tool by the agent.
+    # This agent refines the story based on the critique. It is only called when the critique is not an approval:
+    # the loop agent checks "APPROVED" itself, no exit_loop tool is needed.
     refiner_agent = Agent(
         name="RefinerAgent",
         model=Gemini(
-            model="gemini-2.5-flash-lite",
+            model=settings.gemini_model,
             retry_options=retry_config
         ),
         instruction="""You are a story refiner. You have a story draft and critique.
@@ -85,22 +73,23 @@ if __name__ == "__main__":
         Story Draft: {current_story}
         Critique: {critique}
         
-        Your task is to analyze the critique.
-        - IF the critique is EXACTLY "APPROVED", you MUST call the `exit_loop` function and nothing else.
-        - OTHERWISE, rewrite the story draft to fully incorporate the feedback from the critique.""",
+        Rewrite the story draft to fully incorporate the feedback from the critique.
+        Output only the story text, with no introduction or explanation.""",
         output_key="current_story",  # It overwrites the story with the new, refined version.
-        tools=[
-            FunctionTool(exit_loop)
-        ],  # The tool is now correctly initialized with the function reference.
     )
 
     logger.info("✅ refiner_agent created.")
 
-    # The LoopAgent contains the agents that will run repeatedly: Critic -> Refiner.
-    story_refinement_loop = LoopAgent(
+    # The RefinementLoopAgent runs Critic -> Refiner until approval, a plateau or a budget is reached.
+    story_refinement_loop = RefinementLoopAgent(
         name="StoryRefinementLoop",
-        sub_agents=[critic_agent, refiner_agent],
+        critic=critic_agent,
+        refiner=refiner_agent,
+        draft_key="current_story",
+        critique_key="critique",
         max_iterations=2,  # Prevents infinite loops
+        max_tokens=20_000,
+        max_seconds=120,
     )
 
     # The root agent is a SequentialAgent that defines the overall workflow: Initial Write -> Refinement Loop.
@@ -111,9 +100,9 @@ if __name__ == "__main__":
 
     logger.info("✅ Loop and Sequential Agents created.")
 
-    runner = InMemoryRunner(agent=root_agent)
+    runner = InMemoryRunner(agent=root_agent, plugins=[RateLimitPlugin()])
     response = asyncio.run(runner.run_debug(
         "Write a short story about a lighthouse keeper who discovers a mysterious, glowing map"
     ))
 
-    logger.info("✅ Response: ", response)
\ No newline at end of file
+    logger.info(f"✅ Response: {response}")
\ No newline at end of file
@@ -1,121 +1,55 @@
 """ Implements an example of Parallel (Concurrent) agents to run parallel search for
-three different topics the combine them with an aggregator agent.
+several topics then combine them with an aggregator agent.
 
-1- There is one agent for each topic and all run in parallel under a ParallelAgent.
+1- There is one researcher agent for each topic, run in parallel under ParallelAgents of at most
+   `--fan-out` agents (./map_reduce.py).
 
-2- The final result is combined in an aggregator agent as a SequentialAgent.
+2- The findings are combined by reducer agents (at most `--reduce-width` findings each) and a final
+   aggregator agent, in a SequentialAgent.
 
-SequantialAgent[ ParallelAgent[tech_researcher|health_researcher|finance_researcher], aggregator_agent]
+With the three default topics:
+SequantialAgent[ ParallelAgent[Researcher_0|Researcher_1|Researcher_2], Final ]
+
+With more topics, waves of researchers alternate with the reducers of the previous wave:
+SequantialAgent[ Map_0, ParallelAgent[Reducers of wave 0 | Researchers of wave 1], ..., Final ]
 """
 from loguru import logger
 from  agentic_learning.utils.utils import load_env
-from google.adk.agents import Agent, SequentialAgent, ParallelAgent
-from google.adk.models.google_llm import Gemini
 from google.adk.runners import InMemoryRunner
-from google.adk.tools import AgentTool, FunctionTool, google_search
-from google.genai import types
+from agentic_learning.integrations.providers.google_adk import RateLimitPlugin
+from agentic_learning.patterns.multi_agent.map_reduce import build_map_reduce_agent
+import argparse
 import asyncio
 
-if __name__ == "__main__":
-    load_env()
-
-    retry_config=types.HttpRetryOptions(
-        attempts=5,  # Maximum retry attempts
-        exp_base=7,  # Delay multiplier
-        initial_delay=1,
-        http_status_codes=[429, 500, 503, 504], # Retry on these HTTP errors
-    )
-
-    # 1- Tech Researcher: Focuses on AI and ML trends.
-    tech_researcher = Agent(
-        name="TechResearcher",
-        model=Gemini(
-            model="gemini-2.5-flash-lite",
-            retry_options=retry_config
-        ),
-        instruction="""Research the latest AI/ML trends. Include 3 key developments,
-    the main companies involved, and the potential impact. Keep the report very concise (100 words).""",
-        tools=[google_search],
-        output_key="tech_research",  # The result of this agent will be stored in the session state with this key.
-    )
-
-    logger.info("✅ tech_researcher created.")
-
-    # 2- Health Researcher: Focuses on medical breakthroughs.
-    health_researcher = Agent(
-        name="HealthResearcher",
-        model=Gemini(
-            model="gemini-2.5-flash-lite",
-            retry_options=retry_config
-        ),
-        instruction="""Research recent medical breakthroughs. Include 3 significant advances,
-    their practical applications, and estimated timelines. Keep the report concise (100 words).""",
-        tools=[google_search],
-        output_key="health_research",  # The result will be stored with this key.
-    )
+TOPICS = [
+    "AI/ML trends (3 key developments, the main companies involved)",
+    "Medical breakthroughs (3 significant advances, their practical applications and timelines)",
+    "Fintech trends (3 key trends, their market implications and future outlook)",
+]
 
-    logger.info("✅ health_researcher created.")
 
-    # 3-  Finance Researcher: Focuses on fintech trends.
-    finance_researcher = Agent(
-        name="FinanceResearcher",
-        model=Gemini(
-            model="gemini-2.5-flash-lite",
-            retry_options=retry_config
-        ),
-        instruction="""Research current fintech trends. Include 3 key trends,
-    their market implications, and the future outlook. Keep the report concise (100 words).""",
-        tools=[google_search],
-        output_key="finance_research",  # The result will be stored with this key.
-    )
-
-    logger.info("✅ finance_researcher created.")
-
-    # The AggregatorAgent runs *after* the parallel step to synthesize the results.
-    # NOTE: It uses placeholders {tech_research} {health_research} {finance_research} 
-    # (which are the **output** names of each of the parallel agents) to inject 
-    # the outputs from the parallel agents.
-    aggregator_agent = Agent(
-        name="AggregatorAgent",
-        model=Gemini(
-            model="gemini-2.5-flash-lite",
-            retry_options=retry_config
-        ),
-        # It uses placeholders to inject the outputs from the parallel agents, which are now in the session state.
-        instruction="""Combine these three research findings into a single executive summary:
-
-        **Technology Trends:**
-        {tech_research}
-        
-        **Health Breakthroughs:**
-        {health_research}
-        
-        **Finance Innovations:**
-        {finance_research}
-        
-        Your summary should highlight common themes, surprising connections, and the most important key takeaways from all three reports. The final summary should be around 200 words.""",
-        output_key="executive_summary",  # This will be the final output of the entire system.
-    )
-
-    logger.info("✅ aggregator_agent created.")
+#### MAIN ####
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel multi-topic research with a map-reduce agent")
+    parser.add_argument("--topics", nargs="+", default=TOPICS, help="Topics to research")
+    parser.add_argument("--fan-out", type=int, default=8, help="Maximum number of researchers running at once")
+    parser.add_argument("--reduce-width", type=int, default=5, help="Maximum number of findings per reducer")
+    args = parser.parse_args()
 
-    # The ParallelAgent runs all its sub-agents simultaneously.
-    parallel_research_team = ParallelAgent(
-        name="ParallelResearchTeam",
-        sub_agents=[tech_researcher, health_researcher, finance_researcher],
-    )
+    load_env()
 
-    # This SequentialAgent defines the high-level workflow: run the parallel team first, then run the aggregator.
-    root_agent = SequentialAgent(
+    root_agent = build_map_reduce_agent(
+        args.topics,
+        fan_out=args.fan_out,
+        reduce_width=args.reduce_width,
         name="ResearchSystem",
-        sub_agents=[parallel_research_team, aggregator_agent],
     )
 
-    logger.info("✅ Parallel and Sequential Agents created.")
+    logger.info(f"✅ Map-reduce agent created for {len(args.topics)} topics.")
 
-    runner = InMemoryRunner(agent=root_agent)
+    runner = InMemoryRunner(agent=root_agent, plugins=[RateLimitPlugin()])
     response = asyncio.run( runner.run_debug(
-        "Run the daily executive briefing on Tech, Health, and Finance"
+        "Run the daily executive briefing on: " + "; ".join(args.topics)
     ))
 
-    logger.info("✅ Response: ", response)
+    logger.info(f"✅ Response: {response}")
@@ -0,0 +1,192 @@
+"""
+Map-reduce research agents: N topics, bounded fan-out, hierarchical reduction.
+
+`build_map_reduce_agent` turns a list of topics into an ADK agent tree:
+
+    - Map: one researcher per topic, writing to its own generated state key (`map_<i>`).
+      Researchers run in waves of at most `fan_out` agents (a ParallelAgent per wave), so 50+
+      topics never open 50+ concurrent model calls / searches.
+    - Reduce: a reducer summarizes at most `reduce_width` findings into a partial summary
+      (`reduce_<level>_<i>`). As soon as `reduce_width` findings are ready, their reducer runs
+      in parallel with the researchers of the next wave: partial results are folded while the
+      map is still running. Reducers count in the `fan_out` budget (a wave with 2 reducers
+      starts `fan_out - 2` researchers).
+    - The partial summaries are reduced level by level (a tree of width `reduce_width`) until a
+      final agent writes `output_key`. No prompt ever holds more than `reduce_width` findings.
+    - A reducer clears the keys it consumed (set to None) so the session state only holds the
+      findings that are still waiting to be reduced.
+
+With `len(topics) <= reduce_width` the tree is the classic one:
+SequentialAgent[ ParallelAgent[researchers], final_agent ].
+
+    agent = build_map_reduce_agent(topics, fan_out=8, reduce_width=5)
+    runner = InMemoryRunner(agent=agent, plugins=[RateLimitPlugin()])
+"""
+
+# --- Standard library ---
+import re
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# --- Third-party ---
+from google.adk.agents import Agent, ParallelAgent, SequentialAgent
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.google_llm import Gemini
+from google.adk.tools import google_search
+
+# --- Local / project ---
+from agentic_learning.integrations.providers.google_adk import retry_options
+from agentic_learning.utils.config import get_settings
+
+MAP_INSTRUCTION = """Research the latest developments on: {topic}.
+Include 3 key points, the main actors involved, and the potential impact. Keep the report very concise (100 words)."""
+
+REDUCE_INSTRUCTION = """Condense these research findings into one partial summary, keeping the key facts
+of every topic and noting common themes (around 150 words):
+
+{findings}"""
+
+FINAL_INSTRUCTION = """Combine these research findings into a single executive summary:
+
+{findings}
+
+Your summary should highlight common themes, surprising connections, and the most important key takeaways
+from all the reports. The final summary should be around 200 words."""
+
+# (label shown to the reducer, state key)
+Finding = Tuple[str, str]
+
+
+def _chunks(items: Sequence, size: int) -> List[list]:
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def _literal(text: str) -> str:
+    # Braces would be read as state placeholders by ADK
+    return re.sub(r"[{}]", "", text)
+
+
+def _findings_block(findings: Sequence[Finding]) -> str:
+    # Optional placeholders: a failed researcher leaves its key empty instead of failing the reducer
+    return "\n\n".join(f"**{_literal(label)}:**\n{{{key}?}}" for label, key in findings)
+
+
+def _clear_keys(keys: Sequence[str]) -> Callable[[CallbackContext], None]:
+    def callback(callback_context: CallbackContext):
+        for key in keys:
+            callback_context.state[key] = None
+
+    return callback
+
+
+def _group(name: str, agents: List[BaseAgent]) -> BaseAgent:
+    return agents[0] if len(agents) == 1 else ParallelAgent(name=name, sub_agents=agents)
+
+
+def build_map_reduce_agent(
+    topics: Sequence[str],
+    map_instruction: str = MAP_INSTRUCTION,
+    reduce_instruction: str = REDUCE_INSTRUCTION,
+    final_instruction: str = FINAL_INSTRUCTION,
+    fan_out: int = 8,
+    reduce_width: int = 5,
+    model: Optional[str] = None,
+    tools: Optional[list] = None,
+    output_key: str = "executive_summary",
+    name: str = "MapReduceResearch",
+) -> SequentialAgent:
+    """
+    Args:
+        topics: One researcher per topic.
+        map_instruction: Researcher instruction, `{topic}` is replaced by the topic.
+        reduce_instruction: Intermediate reducer instruction, `{findings}` is replaced by the
+            findings it summarizes.
+        final_instruction: Instruction of the final agent (same `{findings}` placeholder).
+        fan_out: Maximum number of agents (researchers and reducers) running at once.
+        reduce_width: Maximum number of findings given to one reducer.
+        model: Gemini model (default: `settings.gemini_model`).
+        tools: Researcher tools (default: google_search).
+        output_key: State key of the final summary.
+        name: Name of the root agent (also prefixes the sub-agent names).
+    """
+    if not topics:
+        raise ValueError("at least one topic is required")
+    if fan_out < 1:
+        raise ValueError(f"fan_out must be >= 1, got {fan_out}")
+    if reduce_width < 2:
+        raise ValueError(f"reduce_width must be >= 2, got {reduce_width}")
+
+    llm = Gemini(model=model or get_settings().gemini_model, retry_options=retry_options())
+    tools = [google_search] if tools is None else tools
+
+    def researcher(index: int, topic: str) -> Agent:
+        return Agent(
+            name=f"{name}_Researcher_{index}",
+            model=llm,
+            instruction=map_instruction.replace("{topic}", _literal(topic)),
+            tools=list(tools),
+            output_key=f"map_{index}",
+        )
+
+    def reducer(agent_name: str, findings: Sequence[Finding], key: str, instruction: str) -> Agent:
+        keys = [finding_key for _, finding_key in findings]
+        return Agent(
+            name=agent_name,
+            model=llm,
+            instruction=instruction.replace("{findings}", _findings_block(findings)),
+            output_key=key,
+            after_agent_callback=_clear_keys(keys),
+        )
+
+    findings: List[Finding] = [(topic, f"map_{i}") for i, topic in enumerate(topics)]
+
+    # Small enough for one prompt: map, then the final agent
+    if len(findings) <= reduce_width:
+        waves = _chunks(list(enumerate(topics)), fan_out)
+        stages = [_group(f"{name}_Map_{w}", [researcher(i, t) for i, t in wave]) for w, wave in enumerate(waves)]
+        final = reducer(f"{name}_Final", findings, output_key, final_instruction)
+        return SequentialAgent(name=name, sub_agents=[*stages, final])
+
+    # Level 1: the findings ready so far are reduced while the next wave is researched
+    stages: List[BaseAgent] = []
+    partials: List[Finding] = []
+    pending: List[BaseAgent] = []  # Reducers whose findings are ready
+    ready: List[Finding] = []  # Findings not given to a reducer yet
+
+    def reduce_ready(flush: bool = False):
+        nonlocal ready
+        while len(ready) >= reduce_width or (flush and ready):
+            group, ready = ready[:reduce_width], ready[reduce_width:]
+            key = f"reduce_1_{len(partials)}"
+            label = ", ".join(_literal(label) for label, _ in group)
+            pending.append(reducer(f"{name}_Reducer_1_{len(partials)}", group, key, reduce_instruction))
+            partials.append((label, key))
+
+    queue = list(enumerate(topics))
+    w = 0
+    while queue:
+        running, pending = pending[:fan_out], pending[fan_out:]
+        wave, queue = queue[:fan_out - len(running)], queue[fan_out - len(running):]
+        stages.append(_group(f"{name}_Map_{w}", [*running, *(researcher(i, t) for i, t in wave)]))
+        ready.extend(findings[i] for i, _ in wave)
+        reduce_ready()
+        w += 1
+    reduce_ready(flush=True)
+    for r, batch in enumerate(_chunks(pending, fan_out)):
+        stages.append(_group(f"{name}_Reduce_1_{r}", batch))
+
+    # Upper levels: a tree of reducers until the final agent can take every partial summary
+    level = 1
+    while len(partials) > reduce_width:
+        level += 1
+        reducers, next_partials = [], []
+        for i, group in enumerate(_chunks(partials, reduce_width)):
+            key = f"reduce_{level}_{i}"
+            reducers.append(reducer(f"{name}_Reducer_{level}_{i}", group, key, reduce_instruction))
+            next_partials.append((f"Part {i + 1}", key))
+        for r, batch in enumerate(_chunks(reducers, fan_out)):
+            stages.append(_group(f"{name}_Reduce_{level}_{r}", batch))
+        partials = next_partials
+
+    stages.append(reducer(f"{name}_Final", partials, output_key, final_instruction))
+    return SequentialAgent(name=name, sub_agents=stages)
@@ -0,0 +1,185 @@
+"""
+Declarative agent pipelines compiled to a deterministic ADK agent tree.
+
+A coordinator LLM calling sub-agents through AgentTool spends a model round trip per step only
+to decide what to call next, and may call them in any order. When the data flow is known, it
+can be declared instead: every step names the state keys it reads and the key it writes, and
+the pipeline compiles the DAG into SequentialAgent / ParallelAgent stages:
+
+    - Agent steps: an LlmAgent, reading the `{placeholders}` of its instruction and writing its
+      `output_key` (both inferred, or given explicitly).
+    - Function steps: a plain (sync or async) function called with the values of its inputs
+      as keyword arguments, its result written to the state (a `state_delta` event, no LLM).
+    - Steps are grouped by topological level: the steps of a level are independent and run in
+      a ParallelAgent, levels run in sequence. Values pass through the session state
+      (`research_findings` -> `{research_findings}`), with no coordinator in between.
+
+`validate()` (called by `compile()`) rejects duplicate names or outputs, inputs
+that no step produces (and that are not declared as pipeline `inputs`), agents used twice and
+cycles.
+
+    pipeline = Pipeline([
+        Step("research", agent=research_agent),                   # -> research_findings
+        Step("summarize", agent=summarizer_agent),                # {research_findings} -> final_summary
+        Step("sources", fn=extract_sources, inputs=["research_findings"], output="sources"),
+    ])
+    pipeline.plan()       # [["research"], ["summarize", "sources"]]
+    root_agent = pipeline.compile("ResearchPipeline")
+"""
+
+# --- Standard library ---
+import inspect
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Sequence
+
+# --- Third-party ---
+from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from pydantic import ConfigDict
+
+# Same variables as the ADK instruction templating: {key} or {key?}, not {artifact.x}
+_PLACEHOLDER = re.compile(r"(?<![\$\{\\])\{+\s*([A-Za-z_][A-Za-z0-9_]*)(\?)?\s*\}+")
+
+
+class PipelineError(ValueError):
+    """Invalid pipeline (see `Pipeline.validate`)."""
+
+
+@dataclass
+class Step:
+    """One node of a pipeline: an agent or a function (exactly one of them)."""
+
+    name: str
+    agent: Optional[BaseAgent] = None
+    fn: Optional[Callable[..., Any]] = None
+    inputs: Optional[List[str]] = None  # None: the instruction placeholders of an LlmAgent ("key?": optional)
+    output: Optional[str] = None  # None: the output_key of an LlmAgent
+
+    def __post_init__(self):
+        if (self.agent is None) == (self.fn is None):
+            raise PipelineError(f"step {self.name!r}: give either an agent or a function")
+        if not self.name.isidentifier():
+            raise PipelineError(f"step {self.name!r}: the name must be a valid identifier")
+        if self.inputs is None:
+            self.inputs = instruction_keys(self.agent) if self.agent is not None else []
+        if self.output is None and isinstance(self.agent, LlmAgent):
+            self.output = self.agent.output_key
+        if self.fn is not None and self.output is None:
+            raise PipelineError(f"step {self.name!r}: a function step needs an output key")
+
+
+def instruction_keys(agent: BaseAgent) -> List[str]:
+    """State keys read by the (string) instruction of an LlmAgent ("key?" for optional ones)."""
+    instruction = getattr(agent, "instruction", None)
+    if not isinstance(instruction, str):
+        return []
+    return list(dict.fromkeys(name + optional for name, optional in _PLACEHOLDER.findall(instruction)))
+
+
+def _key(name: str) -> str:
+    return name.rstrip("?")
+
+
+class FunctionStep(BaseAgent):
+    """Calls a function with state values and writes its result to the state."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    fn: Callable[..., Any]
+    inputs: List[str]
+    output: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        result = self.fn(**{_key(key): state.get(_key(key)) for key in self.inputs})
+        if inspect.isawaitable(result):
+            result = await result
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.output: result}),
+        )
+
+
+class Pipeline:
+    """DAG of steps wired by state keys (see the module docstring)."""
+
+    def __init__(self, steps: Sequence[Step], inputs: Sequence[str] = ()):
+        """
+        Args:
+            steps: Pipeline steps, in any order.
+            inputs: State keys set before the pipeline runs (not produced by a step).
+        """
+        self.steps = list(steps)
+        self.inputs = list(inputs)
+
+    def _producers(self) -> Dict[str, Step]:
+        producers: Dict[str, Step] = {}
+        for step in self.steps:
+            if step.output is None:
+                continue
+            if step.output in producers:
+                raise PipelineError(
+                    f"steps {producers[step.output].name!r} and {step.name!r} both write {step.output!r}"
+                )
+            producers[step.output] = step
+        return producers
+
+    def validate(self) -> None:
+        names = [step.name for step in self.steps]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise PipelineError(f"duplicate step names: {duplicates}")
+        agents = [id(step.agent) for step in self.steps if step.agent is not None]
+        if len(agents) != len(set(agents)):
+            raise PipelineError("an agent instance can only be used by one step")
+        producers = self._producers()
+        for step in self.steps:
+            missing = [
+                key for key in step.inputs
+                if not key.endswith("?") and key not in producers and key not in self.inputs
+            ]
+            if missing:
+                raise PipelineError(f"step {step.name!r} reads {missing}, produced by no step")
+        self.plan()
+
+    def _dependencies(self) -> Dict[str, set]:
+        producers = self._producers()
+        return {
+            step.name: {producers[_key(key)].name for key in step.inputs if _key(key) in producers} - {step.name}
+            for step in self.steps
+        }
+
+    def plan(self) -> List[List[str]]:
+        """Step names by topological level (the steps of a level are independent)."""
+        dependencies = self._dependencies()
+        done: set = set()
+        levels: List[List[str]] = []
+        while len(done) < len(dependencies):
+            level = [name for name, deps in dependencies.items() if name not in done and deps <= done]
+            if not level:
+                cycle = sorted(name for name in dependencies if name not in done)
+                raise PipelineError(f"cycle between the steps {cycle}")
+            levels.append(level)
+            done.update(level)
+        return levels
+
+    def compile(self, name: str = "Pipeline") -> SequentialAgent:
+        """ADK agent running the plan: a SequentialAgent of levels, a ParallelAgent per wide level."""
+        self.validate()
+        by_name = {step.name: step for step in self.steps}
+
+        def node(step: Step) -> BaseAgent:
+            if step.agent is not None:
+                return step.agent
+            return FunctionStep(name=step.name, fn=step.fn, inputs=step.inputs, output=step.output)
+
+        stages: List[BaseAgent] = []
+        for index, level in enumerate(self.plan()):
+            nodes = [node(by_name[step_name]) for step_name in level]
+            stages.append(nodes[0] if len(nodes) == 1 else ParallelAgent(name=f"{name}_Level_{index}", sub_agents=nodes))
+        return SequentialAgent(name=name, sub_agents=stages)
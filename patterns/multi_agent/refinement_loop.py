@@ -0,0 +1,144 @@
+"""
+Refinement loop with deterministic exit, plateau detection and budgets.
+
+A LoopAgent[critic, refiner] only stops when the refiner calls an `exit_loop` tool after an
+exact "APPROVED": an approval costs a refiner call, a tool round trip and a second refiner call,
+and a critic that keeps nitpicking runs until `max_iterations`. `RefinementLoopAgent` runs the
+same two agents but decides in code:
+
+    - Approval: the critique is checked with a regex (starts with the approval phrase, any case,
+      markdown / quotes ignored). An approved draft ends the loop without calling the refiner.
+    - Plateau: the new draft is compared to the previous one (difflib ratio). A refiner that no
+      longer changes the draft (ratio >= `plateau_ratio`) ends the loop.
+    - Budgets: the tokens reported by the critic and refiner calls (`max_tokens`) and the wall
+      time of the loop (`max_seconds`) are checked before every call, so the last call can
+      overshoot them; `max_iterations` bounds the number of critiques.
+
+The critic only answers "APPROVED" or a few suggestions: it has its own model setting
+(`settings.critic_model`, a lite model by default), independent of the writer and refiner.
+
+Why the loop stopped is written to the session state (`<name>_stats`: iterations, stop reason,
+tokens, seconds).
+
+    loop = RefinementLoopAgent(name="StoryRefinementLoop", critic=critic_agent, refiner=refiner_agent,
+                               draft_key="current_story", critique_key="critique", max_tokens=20_000)
+"""
+
+# --- Standard library ---
+import difflib
+import re
+import time
+from typing import AsyncGenerator, Optional
+
+# --- Third-party ---
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from loguru import logger
+from pydantic import ConfigDict
+
+
+def is_approved(critique: Optional[str], phrase: str = "APPROVED") -> bool:
+    """True if the critique starts with `phrase` ("APPROVED", "**Approved.**", ...)."""
+    if not critique:
+        return False
+    return re.match(rf"^[\W_]*{re.escape(phrase)}\b", critique.strip(), re.IGNORECASE) is not None
+
+
+def similarity(previous: str, current: str) -> float:
+    """difflib ratio of two drafts (1.0: identical), compared word by word."""
+    return difflib.SequenceMatcher(None, previous.split(), current.split(), autojunk=False).ratio()
+
+
+class RefinementLoopAgent(BaseAgent):
+    """Critic -> refiner loop deciding approval, plateau and budgets in code."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    critic: BaseAgent
+    refiner: BaseAgent
+    draft_key: str
+    critique_key: str
+    approval_phrase: str = "APPROVED"
+    max_iterations: int = 3
+    plateau_ratio: float = 0.95
+    max_tokens: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+    def __init__(self, *, name: str, critic: BaseAgent, refiner: BaseAgent, **kwargs):
+        """
+        Args:
+            name: Agent name.
+            critic: Agent writing the critique of the draft to `critique_key`.
+            refiner: Agent rewriting the draft (`draft_key`) from the critique.
+            draft_key: State key of the draft (written by the previous agent and the refiner).
+            critique_key: State key of the critique.
+            approval_phrase: Critique prefix meaning "no more changes".
+            max_iterations: Maximum number of critiques.
+            plateau_ratio: Similarity between two drafts above which the loop stops.
+            max_tokens: Token budget of the loop (critic + refiner calls), None: unlimited.
+                Checked before each call: the loop can overshoot it by up to one call (e.g. a
+                whole refiner call started with 1 token left).
+            max_seconds: Wall time budget of the loop, None: unlimited (checked the same way).
+        """
+        super().__init__(name=name, critic=critic, refiner=refiner, sub_agents=[critic, refiner], **kwargs)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        start = time.monotonic()
+        tokens = 0
+        iterations = 0
+        reason = "max_iterations"
+
+        def budget_exceeded() -> Optional[str]:
+            if self.max_tokens is not None and tokens >= self.max_tokens:
+                return "token_budget"
+            if self.max_seconds is not None and time.monotonic() - start >= self.max_seconds:
+                return "time_budget"
+            return None
+
+        while iterations < self.max_iterations:
+            reason = budget_exceeded()
+            if reason:
+                break
+            iterations += 1
+
+            async for event in self.critic.run_async(ctx):
+                tokens += _event_tokens(event)
+                yield event
+            if is_approved(ctx.session.state.get(self.critique_key), self.approval_phrase):
+                reason = "approved"
+                break
+
+            reason = budget_exceeded()
+            if reason:
+                break
+            previous = str(ctx.session.state.get(self.draft_key) or "")
+            async for event in self.refiner.run_async(ctx):
+                tokens += _event_tokens(event)
+                yield event
+            ratio = similarity(previous, str(ctx.session.state.get(self.draft_key) or ""))
+            if ratio >= self.plateau_ratio:
+                reason = "plateau"
+                break
+            reason = "max_iterations"
+
+        stats = {
+            "iterations": iterations,
+            "stop_reason": reason,
+            "tokens": tokens,
+            "seconds": round(time.monotonic() - start, 3),
+        }
+        logger.info(f"{self.name}: {stats}")
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={f"{self.name}_stats": stats}),
+        )
+
+
+def _event_tokens(event: Event) -> int:
+    usage = event.usage_metadata
+    if usage is None or event.partial:
+        return 0
+    return usage.total_token_count or 0
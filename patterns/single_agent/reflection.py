@@ -24,6 +24,7 @@ import os
 import re
 import json
 import pandas as pd
+from agentic_learning.integrations.providers.cascade import STATS, ModelCascade, code_check
 from agentic_learning.utils import utils
 
 #=== PROMPTS  TEMPLATES  ===
@@ -119,15 +120,35 @@ def load_and_prepare_data(csv_path: str) -> pd.DataFrame:
     return df
 
 
-def generate_chart_code(instruction: str, model: str, out_path_v1: str) -> str:
-    """Generate Python code to make a plot with matplotlib using tag-based wrapping."""
+def generate_chart_code(instruction: str, model: "str | ModelCascade", out_path_v1: str) -> str:
+    """Generate Python code to make a plot with matplotlib using tag-based wrapping.
+
+    `model` can be a ModelCascade: a cheap model writes the code first, a larger one only if
+    the code fails the cascade checks.
+    """
 
     prompt = INITIAL_PROMPT.format(instruction=instruction, out_path_v1=out_path_v1)
 
+    if isinstance(model, ModelCascade):
+        return model.run(prompt, task="chart_code").text
+
     response = utils.get_response(model, prompt)
 
     return response
 
+
+def generate_and_run_chart_code(
+    instruction: str, cascade: ModelCascade, out_path_v1: str, df: pd.DataFrame
+) -> tuple[str, bool]:
+    """Generate the V1 code with a cascade checking that it runs on `df`.
+
+    The check executes the code (saving `out_path_v1`), so the chart of a passing answer is
+    already there. Returns the code and whether it ran without error.
+    """
+    prompt = INITIAL_PROMPT.format(instruction=instruction, out_path_v1=out_path_v1)
+    result = cascade.run(prompt, task="chart_code", checks=[*cascade.checks, code_check(lambda: {"df": df.copy()})])
+    return result.text, result.passed
+
 def reflect_on_image_and_regenerate(
     chart_path: str,
     instruction: str,
@@ -211,17 +232,22 @@ def run_workflow(
 
     # 1) Generate code (V1)
     utils.print_html("Step 1: Generating chart code (V1)… 📈")
-    code_v1 = generate_chart_code(
-        instruction=user_instructions,
-        model=generation_model,
-        out_path_v1=out_v1,
-    )
+    if isinstance(generation_model, ModelCascade):
+        # The cascade check already ran the code on df (and saved out_v1) when it passed
+        code_v1, executed = generate_and_run_chart_code(user_instructions, generation_model, out_v1, df)
+    else:
+        code_v1 = generate_chart_code(
+            instruction=user_instructions,
+            model=generation_model,
+            out_path_v1=out_v1,
+        )
+        executed = False
     utils.print_html(code_v1, title="LLM output with first draft code (V1)")
 
     # 2) Execute V1 (hard-coded: extract <execute_python> block and run immediately)
     utils.print_html("Step 2: Executing chart code (V1)… 💻")
     match = re.search(r"<execute_python>([\s\S]*?)</execute_python>", code_v1)
-    if match:
+    if match and not executed:
         initial_code = match.group(1).strip()
         exec_globals = {"df": df}
         exec(initial_code, exec_globals)
@@ -262,9 +288,15 @@ if __name__ == "__main__":
     # Load coffee sales data from the data folder relative to this script location
     csv_path = os.path.join(os.path.dirname(__file__), "data", "coffee_sales.csv")
 
+    # Chart code: gpt-4o-mini first, o4-mini only when the code fails on the dataset
+    # (run_workflow checks the code on the DataFrame it already loaded)
+    generation_model = ModelCascade(["gpt-4o-mini", "o4-mini"])
+
     run_workflow(
         dataset_path=csv_path,
         user_instructions="Create a plot comparing Q1 coffee sales in 2024 and 2025 using the data in coffee_sales.csv.",
-        generation_model="gpt-o4-mini",
+        generation_model=generation_model,
         reflection_model="gpt-o4-mini",
-    )
\ No newline at end of file
+    )
+
+    utils.print_html(STATS.summary(), title="Model cascade (escalations per task)")
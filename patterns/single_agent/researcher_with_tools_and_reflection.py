@@ -5,28 +5,58 @@ Build a sequential workflow of three agents to :
 
 1- generate a research report using Arxiv and Tavily tools
 2- Reflect on the first report and generate a second report
+   (an LLM judge, ./evaluation/judges.py, keeps the revision only if it is better)
 3- Generate a final HTML report based on the second report
 
 The HTML report is generated under ./data/output/researcher_with_tools_and_reflection.html
 """
 
+from agentic_learning.core.agent import Agent, AgentResult, Budget
+from agentic_learning.core.prefetch import Prefetcher
+from agentic_learning.core.tool import ToolRegistry
+from agentic_learning.evaluation.judges import LLMJudge, REPORT_RUBRIC, parse_json_object
 from agentic_learning.tools import research_tools
+from agentic_learning.integrations.providers.cascade import ModelCascade, json_check
+from agentic_learning.integrations.providers.openai_provider import OpenAIChatModel
+from agentic_learning.utils.config import get_settings
+from functools import lru_cache
 from openai import OpenAI
-import json
+from pydantic import BaseModel
+from typing import Sequence
+import asyncio
 import os
 
 #### TOOLS ####
 
-# Tool mapping
-TOOL_MAPPING = {
-    "tavily_search_tool": research_tools.tavily_search_tool,
-    "arxiv_search_tool": research_tools.arxiv_search_tool,
-}
+# Tool mapping: name -> tool dispatch with validated arguments (see core/tool.py)
+TOOL_MAPPING = ToolRegistry([research_tools.tavily_search_tool, research_tools.arxiv_search_tool])
+
+
+@lru_cache(maxsize=1)
+def research_prefetcher() -> Prefetcher:
+    """Speculative arXiv / Tavily searches of the report agent, learned from its past runs (see core/prefetch.py)."""
+    return Prefetcher(path=get_settings().cache_dir / "prefetch" / "research_report.json")
+
+
+RESEARCH_SYSTEM_PROMPT = (
+    "You are a research assistant that can search the web and arXiv to write detailed, "
+    "accurate, and properly sourced research reports.\n\n"
+    "🔍 Use tools when appropriate (e.g., to find scientific papers or web content).\n"
+    "📚 Cite sources whenever relevant. Do NOT omit citations for brevity.\n"
+    "🌐 When possible, include full URLs (arXiv links, web sources, etc.).\n"
+    "✍️ Use an academic tone, organize output into clearly labeled sections, and include "
+    "inline citations or footnotes as needed.\n"
+    "🚫 Do not include placeholder text such as '(citation needed)' or '(citations omitted)'."
+)
 
 def generate_research_report_with_tools(prompt: str, model: str = "gpt-4o") -> str:
     """
     Generates a research report using OpenAI's tool-calling with arXiv and Tavily tools.
 
+    The tool-calling loop is the shared agent engine (core/agent.py): streamed model turns,
+    concurrent tool calls, and a budget of 3 turns. The searches the first turn usually asks
+    for (learned from the previous runs) are started with it.
+
     Args:
         prompt (str): The user prompt.
         model (str): OpenAI model name.
@@ -34,98 +64,42 @@ def generate_research_report_with_tools(prompt: str, model: str = "gpt-4o") -> s
     Returns:
         str: Final assistant research report text.
     """
-    messages = [
-        {
-            "role": "system",
-            "content": (
-                "You are a research assistant that can search the web and arXiv to write detailed, "
-                "accurate, and properly sourced research reports.\n\n"
-                "🔍 Use tools when appropriate (e.g., to find scientific papers or web content).\n"
-                "📚 Cite sources whenever relevant. Do NOT omit citations for brevity.\n"
-                "🌐 When possible, include full URLs (arXiv links, web sources, etc.).\n"
-                "✍️ Use an academic tone, organize output into clearly labeled sections, and include "
-                "inline citations or footnotes as needed.\n"
-                "🚫 Do not include placeholder text such as '(citation needed)' or '(citations omitted)'."
-            )
-        },
-        {"role": "user", "content": prompt}
-    ]
-
-    # List of available tools
-    tools = [research_tools.arxiv_tool_def, research_tools.tavily_tool_def]
-
-    # Maximum number of turns
-    max_turns = 3
-    
-    CLIENT = OpenAI()
+    agent = Agent(
+        model=OpenAIChatModel(model, temperature=1),
+        tools=TOOL_MAPPING,
+        system_prompt=RESEARCH_SYSTEM_PROMPT,
+        budget=Budget(max_turns=3),
+        prefetcher=research_prefetcher(),
+    )
 
-    # Iterate for max_turns iterations
-    for _ in range(max_turns):
+    async def run() -> AgentResult:
+        async for event in agent.astream(prompt):
+            if event.type == "tool_call":
+                print(f"🛠️ {event.data.name}({event.data.arguments})")
+            elif event.type == "done":
+                return event.data
 
-        ### START CODE HERE ###
+    result = asyncio.run(run())
+    if result.stop_reason == "final_answer":
+        print("✅ Final answer:")
+        print(result.text)
+    return result.text
 
-        # Chat with the LLM via the client and set the correct arguments. 
-        # Make sure to let the LLM choose tools automatically.
-        response = CLIENT.chat.completions.create( 
-            model=model,
-            messages=messages,
-            tools=tools,
-            tool_choice="auto",
-            temperature=1, 
-        ) 
-
-        ### END CODE HERE ###
-
-        # Get the response from the LLM and append to messages
-        msg = response.choices[0].message 
-        messages.append(msg) 
-
-        # Stop when the assistant returns a final answer (no tool calls)
-        if not msg.tool_calls:      
-            final_text = msg.content
-            print("✅ Final answer:")
-            print(final_text)
-            break
-
-        # Execute tool calls and append results
-        for call in msg.tool_calls:
-            tool_name = call.function.name
-            args = json.loads(call.function.arguments)
-            print(f"🛠️ {tool_name}({args})")
-
-            try:
-                tool_func = TOOL_MAPPING[tool_name]
-                result = tool_func(**args)
-            except Exception as e:
-                result = {"error": str(e)}
-
-            ### START CODE HERE ###
-
-            # Keep track of tool use in a new message
-            new_msg = { 
-                # Set role to "tool" (plain string) to signal a tool was used
-                "role": "tool",
-                # As stated in the markdown when inspecting the ChatCompletionMessage object 
-                # every call has an attribute called id
-                "tool_call_id": call.id,
-                # The name of the tool was already defined above, use that variable
-                "name": tool_name,
-                # Pass the result of calling the tool to json.dumps
-                "content": json.dumps(result)
-            }
-
-            ### END CODE HERE ###
-
-            # Append to messages
-            messages.append(new_msg)
-
-    return final_text
-
-def reflection_and_rewrite(report, model: str = "gpt-4o-mini", temperature: float = 0.3) -> dict:
+class ReflectionOutput(BaseModel):
+    reflection: str
+    revised_report: str
+
+
+def reflection_and_rewrite(
+    report, model: str = "gpt-4o-mini", temperature: float = 0.3, escalate_to: Sequence[str] = ("gpt-4o",)
+) -> dict:
     """
     Generates a structured reflection AND a revised research report.
     Accepts raw text OR the messages list returned by generate_research_report_with_tools.
 
+    `model` answers first; the `escalate_to` models are only called if its output is not the
+    expected JSON object (model cascade, integrations/providers/cascade.py).
+
     Returns:
         dict with keys:
           - "reflection": structured reflection text
@@ -164,29 +138,32 @@ def reflection_and_rewrite(report, model: str = "gpt-4o-mini", temperature: floa
     
     CLIENT = OpenAI()
 
-    # Get a response from the LLM
-    response = CLIENT.chat.completions.create( 
-        # Pass in the model
-        model=model,
-        messages=[ 
-            # System prompt is already defined
-            {"role": "system", "content": "You are an academic reviewer and editor."},
-            # Add user prompt
-            {"role": "user", "content": user_prompt},
-        ],
-        # Set the temperature equal to the temperature parameter passed to the function
-        temperature=temperature
-    )
+    def complete(model_name: str, prompt: str) -> str:
+        # Get a response from the LLM
+        response = CLIENT.chat.completions.create( 
+            # Pass in the model
+            model=model_name,
+            messages=[ 
+                # System prompt is already defined
+                {"role": "system", "content": "You are an academic reviewer and editor."},
+                # Add user prompt
+                {"role": "user", "content": prompt},
+            ],
+            # Set the temperature equal to the temperature parameter passed to the function
+            temperature=temperature
+        )
+        return response.choices[0].message.content
 
     ### END CODE HERE ###
 
-    # Extract output
-    llm_output = response.choices[0].message.content.strip()
+    # Extract output (cheap model first, escalated when the JSON is invalid)
+    cascade = ModelCascade([model, *escalate_to], checks=[json_check(ReflectionOutput)], complete=complete)
+    llm_output = cascade.run(user_prompt, task="reflection_and_rewrite").text.strip()
 
     # Check if output is valid JSON
     try:
-        data = json.loads(llm_output)
-    except json.JSONDecodeError:
+        data = parse_json_object(llm_output)
+    except ValueError:
         raise Exception("The output of the LLM was not valid JSON. Adjust your prompt.")
 
     return {
@@ -268,8 +245,14 @@ if __name__ == "__main__":
     print(reflection_text['revised_report'], "\n")
 
 
+    # 2b) Keep the revision only if a judge prefers it (cached: re-runs cost no extra call)
+    judge = LLMJudge(cache_path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "judge_cache.jsonl"))
+    reports = [preliminary_report, reflection_text['revised_report']]
+    best_report = reports[judge.compare(REPORT_RUBRIC, *reports)]
+    print(f"=== Judge prefers the {'revised' if best_report is reports[1] else 'preliminary'} report ===\n")
+
     # 3) Convert the report to HTML (use the TEXT and correct function name)
-    html = convert_report_to_html(reflection_text['revised_report'])
+    html = convert_report_to_html(best_report)
 
     print("=== Generated HTML (preview) ===\n")
     print((html or "")[:600], "\n... [truncated]\n")
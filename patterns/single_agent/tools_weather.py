@@ -10,21 +10,23 @@ Three Tools are involved:
 """
 
 import aisuite as ai
-import requests
 import os
 from datetime import datetime
+from functools import lru_cache
 from loguru import logger
 
+from agentic_learning.tools.output_sink import OutputSink
+from agentic_learning.tools.weather import weather_report
 
-def get_output_paths():
- # Get this script's directory
+
+@lru_cache(maxsize=1)
+def get_output_sink() -> OutputSink:
+    """Output directory (./data/output) and file prefix (script name), resolved and created once."""
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Get the script name
     script_name = os.path.basename(__file__).split(".")[0]
-    outut_dir = os.path.join(script_dir, "data", "output")
-    os.makedirs(outut_dir, exist_ok=True)
-    return outut_dir, script_name
-    
+    return OutputSink(os.path.join(script_dir, "data", "output"), prefix=script_name)
+
+
 def get_current_time():
     """
     Returns the current time as a string.
@@ -45,39 +47,11 @@ tools = [{
 
 def get_weather_from_ip():
     """
-    Gets the current, high, and low temperature in Fahrenheit for the user's
+    Gets the current, high, and low temperature in Celsius for the user's
     location and returns it to the user.
     """
-    loc_response = requests.get('https://ipinfo.io/json').json()
-    logger.debug(loc_response)
-    # Get location coordinates from the IP address
-    lat, lon = loc_response['loc'].split(',')
-
-    # Set parameters for the weather API call
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "current": "temperature_2m",
-        "daily": "temperature_2m_max,temperature_2m_min",
-        "temperature_unit": "celsius",
-        "timezone": "auto"
-    }
-
-    # Get weather data
-    weather_data = requests.get("https://api.open-meteo.com/v1/forecast", params=params).json()
-
-    # get Today's date
-    today_date = datetime.now().strftime("%Y-%m-%d")
-
-    # Format and return the simplified string
-    return (
-        f"Country: {loc_response['country']}, "
-        f"City: {loc_response['region']}, "
-        f"Date: {today_date}, "
-        f"Current: {weather_data['current']['temperature_2m']}°C, "
-        f"High: {weather_data['daily']['temperature_2m_max'][0]}°C, "
-        f"Low: {weather_data['daily']['temperature_2m_min'][0]}°C"
-    )
+    # Location and forecast are cached (see tools/weather.py): repeated calls stay in memory
+    return weather_report(unit="celsius")
 
 # Write a text file
 def write_txt_file(file_name: str, content: str):
@@ -89,13 +63,8 @@ def write_txt_file(file_name: str, content: str):
     Returns:
         str: Path to the written file.
     """
-    output_dir, output_prefix = get_output_paths()
-
-    file_path = f"{output_dir}/{output_prefix}_{file_name}"
-   
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(content)
-    return file_path
+    # Atomic write (temp file + rename); errors are raised to the caller, as the path is returned
+    return str(get_output_sink().write(file_name, content))
 
 
 ### MAIN ###
@@ -0,0 +1,60 @@
+"""
+Smoke test of the A2A transport (./patterns/multi_agent/google_a2a_customer_support/): launch the
+Product Catalog Agent server and build the remote agent from its cached agent card.
+
+No model call is made: the agent card is served without a model round trip.
+"""
+
+# --- Standard library ---
+import asyncio
+import os
+import socket
+
+# --- Third-party ---
+import pytest
+
+# --- Local / project ---
+from agentic_learning.patterns.multi_agent.google_a2a_customer_support import a2a_transport, product_agent
+from agentic_learning.patterns.multi_agent.google_a2a_customer_support.launcher import A2AServerLauncher
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def server(tmp_path_factory):
+    os.environ.setdefault("GOOGLE_API_KEY", "test-key")  # The card is served without a model call
+    launcher = A2AServerLauncher(
+        product_agent.__file__,
+        host="127.0.0.1",
+        port=free_port(),
+        startup_timeout=60.0,
+        health_interval=0,
+        log_path=str(tmp_path_factory.mktemp("a2a") / "server.log"),
+    )
+    if not launcher.start():
+        launcher.stop()
+        pytest.fail(f"the product agent server did not start (see {launcher.log_path})")
+    yield launcher
+    launcher.stop()
+
+
+def test_build_remote_agent_from_launched_server(server):
+    async def build():
+        try:
+            return await a2a_transport.build_remote_a2a_agent(
+                "product_catalog_agent", server.url, description="Remote product catalog"
+            )
+        finally:
+            await a2a_transport.close_async_client()
+
+    a2a_transport.card_cache.invalidate()
+    agent = asyncio.run(build())
+
+    assert agent.name == "product_catalog_agent"
+    assert agent.description == "Remote product catalog"
+    card_json = a2a_transport.card_cache.get(server.url)  # Served from the cache
+    assert a2a_transport.parse_agent_card(card_json).name == card_json["name"] == "product_catalog_agent"
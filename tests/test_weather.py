@@ -0,0 +1,132 @@
+"""
+Weather data layer (./tools/weather.py) against a local stub of ipinfo.io / open-meteo.
+
+The stub counts the upstream requests: the TTL cache, SingleFlight and bulk paths must save them.
+"""
+
+# --- Standard library ---
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# --- Third-party ---
+import pytest
+
+# --- Local / project ---
+from agentic_learning.tools import weather
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests: list = []
+    delay = 0.0
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        type(self).requests.append((url.path, query))
+        time.sleep(type(self).delay)
+        if url.path == "/json":
+            body = {"loc": "48.85,2.35", "city": "Paris", "region": "Ile-de-France", "country": "FR"}
+        else:
+            now = int(time.time())
+            items = [
+                {
+                    "current": {"time": now, "interval": 900, "temperature_2m": 12.5},
+                    "current_units": {"temperature_2m": "°C"},
+                    "daily": {"temperature_2m_max": [15.0], "temperature_2m_min": [8.0]},
+                }
+                for _ in query["latitude"].split(",")
+            ]
+            body = items[0] if len(items) == 1 else items
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(weather, "IPINFO_URL", f"{base}/json")
+    monkeypatch.setattr(weather, "FORECAST_URL", f"{base}/v1/forecast")
+    StubHandler.requests = []
+    StubHandler.delay = 0.0
+    weather._locations.cache.clear()
+    weather._forecasts.cache.clear()
+    yield StubHandler
+    server.shutdown()
+    server.server_close()
+
+
+def forecast_requests(handler) -> list:
+    return [query for path, query in handler.requests if path == "/v1/forecast"]
+
+
+def test_forecast_is_cached_until_the_next_update(stub):
+    first = weather.get_forecast(48.8566, 2.3522)
+    second = weather.get_forecast(48.8571, 2.3519)  # Same key at COORDINATE_PRECISION
+
+    assert first == second
+    assert first.current == 12.5 and first.unit == "°C"
+    assert len(forecast_requests(stub)) == 1
+    assert 0 < weather.forecast_ttl(first) <= 900
+
+
+def test_location_is_cached(stub):
+    assert weather.get_location().city == "Paris"
+    assert weather.weather_report().startswith("Country: FR")
+    assert [path for path, _ in stub.requests].count("/json") == 1
+
+
+def test_concurrent_lookups_share_one_request(stub):
+    stub.delay = 0.2
+
+    async def run():
+        try:
+            return await asyncio.gather(*(weather.aget_forecast(48.85, 2.35) for _ in range(10)))
+        finally:
+            await weather.close_async_client()
+
+    forecasts = asyncio.run(run())
+
+    assert len(set(forecasts)) == 1
+    assert len(forecast_requests(stub)) == 1
+
+
+def test_async_client_is_per_loop(stub):
+    async def client_of_loop():
+        client = weather.async_client()
+        assert weather.async_client() is client
+        await weather.close_async_client()
+        return client
+
+    first, second = asyncio.run(client_of_loop()), asyncio.run(client_of_loop())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
+
+
+def test_bulk_fetches_missing_locations_in_one_request(stub):
+    cached = weather.get_forecast(48.85, 2.35)
+    forecasts = weather.get_forecasts([(48.85, 2.35), (51.51, -0.13), (40.71, -74.01)])
+
+    assert forecasts[0] == cached
+    assert [(f.latitude, f.longitude) for f in forecasts[1:]] == [(51.51, -0.13), (40.71, -74.01)]
+    requests = forecast_requests(stub)
+    assert len(requests) == 2
+    assert requests[1]["latitude"] == "51.51,40.71"
+
+    again = asyncio.run(weather.aget_forecasts([(51.51, -0.13), (40.71, -74.01)]))
+    assert again == forecasts[1:]
+    assert len(forecast_requests(stub)) == 2
@@ -0,0 +1,208 @@
+"""
+Output sink: files produced by agents and tools, written off the caller's thread.
+
+An OutputSink owns one output directory, resolved and created once. Writes go through a
+single background writer thread (FIFO, so the writes of a file keep their order):
+
+    - `write(name, content)`:  atomic overwrite. The content goes to a temporary file of the
+                               same directory, which then replaces the target (os.replace):
+                               readers see the old file or the new one, never a partial one.
+    - `append(name, content)`: appended to the file (created if needed).
+    - `submit(...)` / `awrite(...)`: the same, without waiting (concurrent Future / awaitable),
+                               so an agent event loop never blocks on disk I/O.
+    - `stream(name)`:          incremental writer buffering chunks in memory and handing them to
+                               the writer thread by blocks; the file is published atomically
+                               when the stream is closed (or appended to with `atomic=False`).
+
+    sink = OutputSink("data/output", prefix="tools_weather")
+    path = sink.write("note.txt", text)
+    await sink.awrite("report.md", markdown)
+    with sink.stream("log.txt") as out:
+        for line in lines:
+            out.write(line)
+"""
+
+# --- Standard library ---
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+# --- Third-party ---
+from loguru import logger
+
+
+class OutputSink:
+    """Output directory with atomic, append and streaming writes done by a background thread."""
+
+    def __init__(self, directory: str | Path, prefix: str = "", encoding: str = "utf-8", fsync: bool = False):
+        """
+        Args:
+            directory: Output directory (created once, here).
+            prefix: Prefix of the file names ("<prefix>_<name>").
+            encoding: Text encoding.
+            fsync: Flush the data to disk before publishing a file (durability over speed).
+        """
+        self.directory = Path(directory).resolve()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.encoding = encoding
+        self.fsync = fsync
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        # Only the base name: a tool argument cannot escape the output directory
+        name = os.path.basename(name)
+        return self.directory / (f"{self.prefix}_{name}" if self.prefix else name)
+
+    # --- Writes (run on the writer thread) ---
+
+    def _replace(self, path: Path, content: str | bytes):
+        data = content.encode(self.encoding) if isinstance(content, str) else content
+        fd, temp = tempfile.mkstemp(dir=self.directory, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            _publish(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+        return path
+
+    def _append(self, path: Path, content: str | bytes):
+        data = content.encode(self.encoding) if isinstance(content, str) else content
+        with open(path, "ab") as f:
+            f.write(data)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        return path
+
+    # --- Public API ---
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="output-sink")
+            return self._executor
+
+    def submit(self, name: str, content: str | bytes, mode: str = "w") -> "Future[Path]":
+        """Queue a write ("w": atomic overwrite, "a": append) and return its Future (the file path)."""
+        if mode not in ("w", "a"):
+            raise ValueError(f"mode must be 'w' or 'a', got {mode!r}")
+        path = self.path(name)
+        future = self.executor.submit(self._replace if mode == "w" else self._append, path, content)
+        future.add_done_callback(_log_failure)
+        return future
+
+    def write(self, name: str, content: str | bytes) -> Path:
+        """Atomically write `content` to `name` (overwrites) and return the path."""
+        return self.submit(name, content, "w").result()
+
+    def append(self, name: str, content: str | bytes) -> Path:
+        return self.submit(name, content, "a").result()
+
+    async def awrite(self, name: str, content: str | bytes, mode: str = "w") -> Path:
+        return await asyncio.wrap_future(self.submit(name, content, mode))
+
+    def stream(self, name: str, atomic: bool = True, buffer_size: int = 64 * 1024) -> "SinkStream":
+        return SinkStream(self, name, atomic, buffer_size)
+
+    def flush(self):
+        """Wait for every queued write."""
+        self.executor.submit(lambda: None).result()
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SinkStream:
+    """Buffered incremental writer of an OutputSink (see `OutputSink.stream`)."""
+
+    def __init__(self, sink: OutputSink, name: str, atomic: bool = True, buffer_size: int = 64 * 1024):
+        self.sink = sink
+        self.path = sink.path(name)
+        self.atomic = atomic
+        self.buffer_size = buffer_size
+        self._buffer: List[str | bytes] = []
+        self._buffered = 0
+        self._futures: List[Future] = []
+        self._closed = False
+        if atomic:
+            # Chunks accumulate in a temporary file, published by os.replace on close
+            fd, temp = tempfile.mkstemp(dir=sink.directory, prefix=f".{self.path.name}.", suffix=".tmp")
+            os.close(fd)
+            self._target = Path(temp)
+        else:
+            self._target = self.path
+
+    def write(self, chunk: str | bytes):
+        if self._closed:
+            raise ValueError("write to a closed stream")
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self.buffer_size:
+            self._hand_off()
+
+    def _hand_off(self):
+        if not self._buffer:
+            return
+        encoding = self.sink.encoding
+        data = b"".join(chunk.encode(encoding) if isinstance(chunk, str) else chunk for chunk in self._buffer)
+        self._buffer, self._buffered = [], 0
+        self._futures.append(self.sink.executor.submit(self.sink._append, self._target, data))
+
+    def close(self, publish: bool = True) -> Path:
+        """Write the remaining chunks, wait for them and (atomic mode) publish the file."""
+        if self._closed:
+            return self.path
+        self._closed = True
+        self._hand_off()
+        try:
+            for future in self._futures:
+                future.result()
+            if self.atomic:
+                if publish:
+                    self.sink.executor.submit(_publish, self._target, self.path).result()
+                else:
+                    os.unlink(self._target)
+        except BaseException:
+            if self.atomic and self._target.exists():
+                os.unlink(self._target)
+            raise
+        return self.path
+
+    def __enter__(self) -> "SinkStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # An interrupted atomic stream leaves the previous file untouched
+        self.close(publish=exc_type is None)
+
+
+def _publish(temp: str | Path, path: Path):
+    # mkstemp files are private (0600): keep the mode of the replaced file, or the usual 0644
+    os.chmod(temp, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+    os.replace(temp, path)
+
+
+def _log_failure(future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Output sink write failed: {future.exception()!r}")
@@ -1,22 +1,34 @@
 # ================================
 # Standard library imports
 # ================================
-import os
-from pathlib import Path
 import xml.etree.ElementTree as ET
+from functools import lru_cache
 
 # ================================
 # Third-party imports
 # ================================
 import requests
+import wikipedia
 from tavily import TavilyClient
-from dotenv import load_dotenv
 
 # ================================
+# Local / project imports
+# ================================
+from agentic_learning.core.tool import ToolRegistry, tool
+from agentic_learning.utils.cache import coalesce
+from agentic_learning.utils.config import get_settings
+
+# ================================
+
+# Identical searches (same normalized query and arguments) running at the same time, or repeated
+# within SEARCH_TTL seconds, share one upstream request
+SEARCH_TTL = 300
+
+
+def _error_ttl(results: list[dict]) -> float:
+    # Errors are returned as results (LLM-friendly): never cache them
+    return 0 if any("error" in r for r in results) else SEARCH_TTL
 
-# Load .env from the project root (one level up from tools/)
-_project_root = Path(__file__).resolve().parent.parent
-load_dotenv(_project_root / ".env")
 
 session = requests.Session()
 session.headers.update(
@@ -24,14 +36,23 @@ session.headers.update(
 )
 
 
+@tool
+@coalesce(ttl=SEARCH_TTL, ttl_of=_error_ttl)
 def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
     """
-    Searches arXiv for research papers matching the given query.
+    Searches for research papers on arXiv by query string.
+
+    Args:
+        query (str): Search keywords for research papers.
+        max_results (int): Maximum number of results to return.
+
+    Returns:
+        list[dict]: Papers with title, authors, published date, url, summary and pdf link.
     """
     url = f"https://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results={max_results}"
 
     try:
-        response = session.get(url, timeout=30)
+        response = session.get(url, timeout=get_settings().http_timeout)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         return [{"error": str(e)}]
@@ -73,57 +94,37 @@ def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
         return [{"error": f"Parsing failed: {str(e)}"}]
 
 
-arxiv_tool_def = {
-    "type": "function",
-    "function": {
-        "name": "arxiv_search_tool",
-        "description": "Searches for research papers on arXiv by query string.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search keywords for research papers.",
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "Maximum number of results to return.",
-                    "default": 5,
-                },
-            },
-            "required": ["query"],
-        },
-    },
-}
+# Tool definition (generated from the signature and docstring, see core/tool.py)
+arxiv_tool_def = arxiv_search_tool.openai_schema
 
 
+@lru_cache(maxsize=1)
+def tavily_client() -> TavilyClient:
+    """Tavily client built once from the settings (key and optional base URL)."""
+    settings = get_settings()
+    api_key = settings.api_key("tavily")
+    if not api_key:
+        raise ValueError("TAVILY_API_KEY not found in environment variables.")
+    return TavilyClient(api_key=api_key, api_base_url=settings.tavily_base_url)
+
+
+@tool
+@coalesce(ttl=SEARCH_TTL, ttl_of=_error_ttl)
 def tavily_search_tool(
     query: str, max_results: int = 5, include_images: bool = False
 ) -> list[dict]:
     """
-    Perform a search using the Tavily API.
+    Performs a general-purpose web search using the Tavily API.
 
     Args:
-        query (str): The search query.
-        max_results (int): Number of results to return (default 5).
+        query (str): Search keywords for retrieving information from the web.
+        max_results (int): Maximum number of results to return.
         include_images (bool): Whether to include image results.
 
     Returns:
         list[dict]: A list of dictionaries with keys like 'title', 'content', and 'url'.
     """
-    params = {}
-    api_key = os.getenv("TAVILY_API_KEY")
-    if not api_key:
-        raise ValueError("TAVILY_API_KEY not found in environment variables.")
-    params["api_key"] = api_key
-
-    # client = TavilyClient(api_key)
-
-    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
-    if api_base_url:
-        params["api_base_url"] = api_base_url
-
-    client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
+    client = tavily_client()
 
     try:
         response = client.search(
@@ -150,42 +151,17 @@ def tavily_search_tool(
         return [{"error": str(e)}]  # For LLM-friendly agents
 
 
-tavily_tool_def = {
-    "type": "function",
-    "function": {
-        "name": "tavily_search_tool",
-        "description": "Performs a general-purpose web search using the Tavily API.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search keywords for retrieving information from the web.",
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "Maximum number of results to return.",
-                    "default": 5,
-                },
-                "include_images": {
-                    "type": "boolean",
-                    "description": "Whether to include image results.",
-                    "default": False,
-                },
-            },
-            "required": ["query"],
-        },
-    },
-}
+tavily_tool_def = tavily_search_tool.openai_schema
 
 ## Wikipedia search tool
 
+@tool
 def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
     """
-    Searches Wikipedia for a summary of the given query.
+    Searches for a Wikipedia article summary by query string.
 
     Args:
-        query (str): Search query for Wikipedia.
+        query (str): Search keywords for the Wikipedia article.
         sentences (int): Number of sentences to include in the summary.
 
     Returns:
@@ -205,28 +181,10 @@ def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
         return [{"error": str(e)}]
 
 # Tool definition
-wikipedia_tool_def = {
-    "type": "function",
-    "function": {
-        "name": "wikipedia_search_tool",
-        "description": "Searches for a Wikipedia article summary by query string.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "query": {
-                    "type": "string",
-                    "description": "Search keywords for the Wikipedia article."
-                },
-                "sentences": {
-                    "type": "integer",
-                    "description": "Number of sentences in the summary.",
-                    "default": 5
-                }
-            },
-            "required": ["query"]
-        }
-    }
-}
+wikipedia_tool_def = wikipedia_search_tool.openai_schema
+
+# Name -> tool dispatch for the tool-calling loops
+RESEARCH_TOOLS = ToolRegistry([arxiv_search_tool, tavily_search_tool, wikipedia_search_tool])
 
 def parse_input(text_or_messages):
     if isinstance(text_or_messages, list):
@@ -0,0 +1,296 @@
+"""
+Weather data layer: IP geolocation (ipinfo.io) and forecasts (open-meteo), cached.
+
+    - One pooled requests.Session (keep-alive, retries with backoff on 429 / 5xx, timeouts)
+      for the sync calls, one httpx.AsyncClient per event loop for the async ones (close it
+      with `close_async_client()` before the loop ends).
+    - IP -> location: a TTLCache with a long TTL (6 hours by default). The location of an IP
+      barely changes, it was fetched again before every forecast.
+    - (lat, lon) -> forecast: cached until open-meteo publishes the next value. The response
+      gives the time of the current value and its update interval (`current.time` +
+      `current.interval`, 15 minutes for most models), the entry expires at the next update.
+    - Both caches sit behind SingleFlight (./utils/cache.py): concurrent identical lookups share
+      one upstream call.
+    - Bulk: `get_forecasts` / `aget_forecasts` fetch every missing location in ONE open-meteo
+      request (comma separated coordinates) and serve the rest from the cache.
+
+    report = weather_report()                   # "Country: FR, City: ..., Current: 12.3°C, ..."
+    forecasts = get_forecasts([(48.85, 2.35), (51.51, -0.13)])
+"""
+
+# --- Standard library ---
+import asyncio
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# --- Third-party ---
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --- Local / project ---
+from agentic_learning.utils.cache import SingleFlight
+from agentic_learning.utils.config import get_settings
+from agentic_learning.utils.rate_limit import parse_duration
+
+IPINFO_URL = "https://ipinfo.io/json"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+LOCATION_TTL = 6 * 3600
+MIN_FORECAST_TTL = 60  # Lower bound when the next update is imminent (or already late)
+COORDINATE_PRECISION = 2  # ~1 km: nearby lookups share a forecast
+
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class Location:
+    latitude: float
+    longitude: float
+    city: str = ""
+    region: str = ""
+    country: str = ""
+    timezone: str = ""
+
+
+@dataclass(frozen=True)
+class Forecast:
+    latitude: float
+    longitude: float
+    current: float
+    high: float
+    low: float
+    unit: str
+    observed_at: float  # Unix time of the current value
+    next_update: float  # Unix time of the next open-meteo update
+
+
+# ================================
+# HTTP clients
+# ================================
+
+@lru_cache(maxsize=1)
+def http_session() -> requests.Session:
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=_RETRY_STATUS,
+        allowed_methods=frozenset({"GET"}),
+        respect_retry_after_header=True,
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    session.headers.update({"User-Agent": "agentic-learning-weather/1.0"})
+    return session
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def async_client() -> httpx.AsyncClient:
+    """Shared AsyncClient of the running event loop (connection pools are bound to a loop)."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            timeout = get_settings().http_timeout
+            client = _async_clients[loop] = httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+                transport=httpx.AsyncHTTPTransport(retries=2),  # Connection errors
+                headers={"User-Agent": "agentic-learning-weather/1.0"},
+            )
+        return client
+
+
+async def close_async_client() -> None:
+    """Close the AsyncClient of the running event loop (call it before the loop ends)."""
+    with _async_clients_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _get(url: str, params: Optional[dict] = None):
+    timeout = get_settings().http_timeout
+    response = http_session().get(url, params=params, timeout=(min(timeout, 5.0), timeout))
+    response.raise_for_status()
+    return response.json()
+
+
+async def _aget(url: str, params: Optional[dict] = None):
+    policy = get_settings().retry_policy()
+    for attempt in range(policy.attempts):
+        response = await async_client().get(url, params=params)
+        if response.status_code not in _RETRY_STATUS or attempt == policy.attempts - 1:
+            response.raise_for_status()
+            return response.json()
+        await asyncio.sleep(policy.delay(attempt, parse_duration(response.headers.get("retry-after"))))
+
+
+# ================================
+# Location
+# ================================
+
+_locations = SingleFlight(ttl=LOCATION_TTL, maxsize=4096)
+
+
+def _ipinfo_url(ip: Optional[str]) -> str:
+    return f"https://ipinfo.io/{ip}/json" if ip else IPINFO_URL
+
+
+def _parse_location(data: dict) -> Location:
+    latitude, longitude = (float(value) for value in data["loc"].split(","))
+    return Location(
+        latitude=latitude,
+        longitude=longitude,
+        city=data.get("city", ""),
+        region=data.get("region", ""),
+        country=data.get("country", ""),
+        timezone=data.get("timezone", ""),
+    )
+
+
+def get_location(ip: Optional[str] = None) -> Location:
+    """Location of `ip` (default: the public IP of this machine)."""
+    return _locations.do_sync(ip or "", lambda: _parse_location(_get(_ipinfo_url(ip))))
+
+
+async def aget_location(ip: Optional[str] = None) -> Location:
+    async def fetch():
+        return _parse_location(await _aget(_ipinfo_url(ip)))
+
+    return await _locations.do(ip or "", fetch)
+
+
+# ================================
+# Forecast
+# ================================
+
+_forecasts = SingleFlight(ttl=15 * 60, maxsize=4096)
+
+Coordinates = Tuple[float, float]
+
+
+def _key(latitude: float, longitude: float, unit: str) -> Tuple[float, float, str]:
+    return round(latitude, COORDINATE_PRECISION), round(longitude, COORDINATE_PRECISION), unit
+
+
+def _forecast_params(keys: Sequence[Tuple[float, float, str]], unit: str) -> dict:
+    return {
+        "latitude": ",".join(str(k[0]) for k in keys),
+        "longitude": ",".join(str(k[1]) for k in keys),
+        "current": "temperature_2m",
+        "daily": "temperature_2m_max,temperature_2m_min",
+        "temperature_unit": unit,
+        "timezone": "auto",
+        "forecast_days": 1,
+        "timeformat": "unixtime",
+    }
+
+
+def _parse_forecast(data: dict, key: Tuple[float, float, str]) -> Forecast:
+    current = data["current"]
+    observed_at = float(current["time"])
+    return Forecast(
+        latitude=key[0],
+        longitude=key[1],
+        current=current["temperature_2m"],
+        high=data["daily"]["temperature_2m_max"][0],
+        low=data["daily"]["temperature_2m_min"][0],
+        unit=data.get("current_units", {}).get("temperature_2m", key[2]),
+        observed_at=observed_at,
+        next_update=observed_at + float(current.get("interval", 900)),
+    )
+
+
+def _parse_forecasts(data, keys: Sequence[Tuple[float, float, str]]) -> List[Forecast]:
+    # One location: a JSON object, several: a list in the request order
+    items = data if isinstance(data, list) else [data]
+    return [_parse_forecast(item, key) for item, key in zip(items, keys)]
+
+
+def forecast_ttl(forecast: Forecast) -> float:
+    """Seconds until open-meteo publishes the next value of this forecast."""
+    return max(forecast.next_update - time.time(), MIN_FORECAST_TTL)
+
+
+def get_forecast(latitude: float, longitude: float, unit: str = "celsius") -> Forecast:
+    key = _key(latitude, longitude, unit)
+    return _forecasts.do_sync(
+        key, lambda: _parse_forecasts(_get(FORECAST_URL, _forecast_params([key], unit)), [key])[0], forecast_ttl
+    )
+
+
+async def aget_forecast(latitude: float, longitude: float, unit: str = "celsius") -> Forecast:
+    key = _key(latitude, longitude, unit)
+
+    async def fetch():
+        return _parse_forecasts(await _aget(FORECAST_URL, _forecast_params([key], unit)), [key])[0]
+
+    return await _forecasts.do(key, fetch, forecast_ttl)
+
+
+def _split_cached(locations: Iterable[Coordinates], unit: str):
+    keys = [_key(latitude, longitude, unit) for latitude, longitude in locations]
+    cached = {key: _forecasts.cache.get(key) for key in dict.fromkeys(keys)}
+    missing = [key for key, forecast in cached.items() if forecast is None]
+    return keys, cached, missing
+
+
+def _store(cached: dict, missing: list, forecasts: List[Forecast]):
+    for key, forecast in zip(missing, forecasts):
+        _forecasts.cache.set(key, forecast, forecast_ttl(forecast))
+        cached[key] = forecast
+
+
+def get_forecasts(locations: Iterable[Coordinates], unit: str = "celsius") -> List[Forecast]:
+    """Forecasts of several (lat, lon), in order: cached ones from memory, the others in one request."""
+    keys, cached, missing = _split_cached(locations, unit)
+    if missing:
+        _store(cached, missing, _parse_forecasts(_get(FORECAST_URL, _forecast_params(missing, unit)), missing))
+    return [cached[key] for key in keys]
+
+
+async def aget_forecasts(locations: Iterable[Coordinates], unit: str = "celsius") -> List[Forecast]:
+    keys, cached, missing = _split_cached(locations, unit)
+    if missing:
+        data = await _aget(FORECAST_URL, _forecast_params(missing, unit))
+        _store(cached, missing, _parse_forecasts(data, missing))
+    return [cached[key] for key in keys]
+
+
+# ================================
+# Report
+# ================================
+
+def format_report(location: Location, forecast: Forecast) -> str:
+    return (
+        f"Country: {location.country}, "
+        f"City: {location.region}, "
+        f"Date: {datetime.now().strftime('%Y-%m-%d')}, "
+        f"Current: {forecast.current}{forecast.unit}, "
+        f"High: {forecast.high}{forecast.unit}, "
+        f"Low: {forecast.low}{forecast.unit}"
+    )
+
+
+def weather_report(ip: Optional[str] = None, unit: str = "celsius") -> str:
+    location = get_location(ip)
+    return format_report(location, get_forecast(location.latitude, location.longitude, unit))
+
+
+async def aweather_report(ip: Optional[str] = None, unit: str = "celsius") -> str:
+    location = await aget_location(ip)
+    return format_report(location, await aget_forecast(location.latitude, location.longitude, unit))
+
+
+def cache_stats() -> dict:
+    return {"locations": dict(_locations.stats), "forecasts": dict(_forecasts.stats)}
@@ -0,0 +1,26 @@
+"""
+Shared helpers. Submodules (and the helpers of the `utils` facade) are imported on first
+access, so that importing the package costs nothing.
+"""
+
+# --- Standard library ---
+import importlib
+
+_SUBMODULES = {"cache", "config", "display", "env", "llm", "rate_limit", "utils"}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    from agentic_learning.utils import utils
+
+    try:
+        return getattr(utils, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+def __dir__():
+    from agentic_learning.utils import utils
+
+    return sorted(set(globals()) | _SUBMODULES | set(utils.__all__))
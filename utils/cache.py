@@ -0,0 +1,238 @@
+"""
+Small caching primitives shared by tools and agents.
+
+    - TTLCache:    bounded LRU cache whose entries expire after a time-to-live.
+    - SingleFlight: request coalescing. Identical in-flight calls (same key) share ONE upstream
+                    call and its result, and the result is kept in a short TTL cache behind it.
+                    Works for coroutines (`do`) and for blocking calls from threads (`do_sync`).
+    - coalesce:    decorator applying a SingleFlight to a sync or async function.
+
+Errors are never cached: every waiter of a failed call gets the exception and the next call
+goes upstream again. A cancelled leader does not cancel its followers: one of them retries the
+call as the new leader.
+"""
+
+# --- Standard library ---
+import asyncio
+import functools
+import inspect
+import json
+import re
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class _LeaderCancelled(Exception):
+    """Set on the shared future when the leading call is cancelled (followers retry)."""
+
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Normalize a free-text query so trivially different phrasings share a key."""
+    return _SPACES_RE.sub(" ", str(text)).strip().lower().rstrip("?!. ")
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a per-entry time-to-live (seconds)."""
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls and cache their results for `ttl` seconds.
+
+    Usage:
+        flight = SingleFlight(ttl=30)
+        result = await flight.do(key, lambda: fetch(query))
+    """
+
+    def __init__(self, ttl: float = 30.0, maxsize: int = 1024):
+        self.cache = TTLCache(ttl=ttl, maxsize=maxsize)
+        # Futures belong to the loop that created them: one in-flight table per event loop
+        self._async_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "cache_hits": 0, "coalesced": 0, "upstream": 0}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        ttl_of: Optional[Callable[[Any], float]] = None,
+    ) -> Any:
+        """
+        Return the result of `fn()`, sharing it with every concurrent call using the same key.
+        `ttl_of(result)` overrides the cache TTL of this result (e.g. until the next data update).
+        """
+        self.stats["calls"] += 1
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._async_inflight.setdefault(loop, {})
+        while True:
+            value = self.cache.get(key, _MISSING)
+            if value is not _MISSING:
+                self.stats["cache_hits"] += 1
+                return value
+
+            future = inflight.get(key)
+            if future is None:
+                break
+            self.stats["coalesced"] += 1
+            try:
+                # shield: a cancelled follower must not cancel the shared upstream call
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue  # The leader was cancelled: the first follower to get here leads the retry
+
+        future = loop.create_future()
+        inflight[key] = future
+        self.stats["upstream"] += 1
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved: no "exception never retrieved" warning without followers
+            raise
+        else:
+            self.cache.set(key, value, ttl_of(value) if ttl_of else None)
+            future.set_result(value)
+            return value
+        finally:
+            if inflight.get(key) is future:
+                del inflight[key]
+
+    def do_sync(self, key: Hashable, fn: Callable[[], Any], ttl_of: Optional[Callable[[Any], float]] = None) -> Any:
+        """Thread-based version of `do` for blocking functions."""
+        with self._lock:
+            self.stats["calls"] += 1
+            value = self.cache.get(key, _MISSING)
+            if value is not _MISSING:
+                self.stats["cache_hits"] += 1
+                return value
+            future = self._sync_inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._sync_inflight[key] = future
+                self.stats["upstream"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.cache.set(key, value, ttl_of(value) if ttl_of else None)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._sync_inflight.pop(key, None)
+
+
+def _call_key(fn: Callable, args: tuple, kwargs: dict) -> str:
+    # Bind to the signature so f("x") and f(query="x") share a key; normalize string arguments
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = {
+        name: normalize_query(value) if isinstance(value, str) else value
+        for name, value in bound.arguments.items()
+        if name != "tool_context"  # ADK injects a per-call context, it is not part of the request
+    }
+    return f"{fn.__qualname__}:{json.dumps(arguments, sort_keys=True, default=str)}"
+
+
+def coalesce(
+    fn: Optional[Callable] = None,
+    *,
+    ttl: float = 30.0,
+    maxsize: int = 1024,
+    ttl_of: Optional[Callable[[Any], float]] = None,
+):
+    """
+    Decorator coalescing identical concurrent calls of a (sync or async) function.
+
+    The wrapper keeps the signature and docstring of `fn`, so it can still be registered
+    as an agent tool (aisuite, ADK FunctionTool, ...). `ttl_of(result)` overrides the cache
+    TTL of a result (<= 0: not cached, e.g. an error returned as a value).
+
+    Example (./tools/research_tools.py):
+        @tool
+        @coalesce(ttl=300, ttl_of=_error_ttl)
+        def tavily_search_tool(query: str, max_results: int = 5): ...
+    """
+    if fn is None:
+        return functools.partial(coalesce, ttl=ttl, maxsize=maxsize, ttl_of=ttl_of)
+
+    flight = SingleFlight(ttl=ttl, maxsize=maxsize)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            return await flight.do(_call_key(fn, args, kwargs), lambda: fn(*args, **kwargs), ttl_of)
+
+        async_wrapper.flight = flight
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return flight.do_sync(_call_key(fn, args, kwargs), lambda: fn(*args, **kwargs), ttl_of)
+
+    wrapper.flight = flight
+    return wrapper
@@ -0,0 +1,142 @@
+"""
+Typed project configuration, resolved once per process.
+
+`get_settings()` loads the project .env (once), reads the environment and returns a frozen
+`Settings` object (cached). Clients and tools take their keys, base URLs, model defaults and
+performance knobs from it instead of calling `os.getenv` on every call:
+
+    API keys      OPENAI_API_KEY, ANTHROPIC_API_KEY, GOOGLE_API_KEY, MISTRAL_API_KEY, TAVILY_API_KEY
+    Base URLs     OPENAI_BASE_URL, DLAI_TAVILY_BASE_URL (or TAVILY_BASE_URL)
+    Models        AGENTIC_DEFAULT_MODEL, AGENTIC_GEMINI_MODEL, AGENTIC_JUDGE_MODEL,
+                  AGENTIC_CRITIC_MODEL (Gemini model of the critics of refinement loops, a
+                  current-generation lite model by default),
+                  AGENTIC_CASCADE_MODELS (model cascade, cheapest first: "gpt-4o-mini,gpt-4o")
+    Retry         AGENTIC_RETRY_ATTEMPTS, AGENTIC_RETRY_INITIAL_DELAY, AGENTIC_RETRY_MAX_DELAY,
+                  AGENTIC_RETRY_EXP_BASE
+    Concurrency   AGENTIC_MAX_CONCURRENT_TOOLS, AGENTIC_HTTP_TIMEOUT,
+                  AGENTIC_REQUESTS_PER_MINUTE / AGENTIC_TOKENS_PER_MINUTE
+                  (JSON or "openai=500,anthropic=50")
+    Cache         AGENTIC_CACHE_DIR, AGENTIC_CACHE_TTL, AGENTIC_CACHE_MAXSIZE
+    Display       AGENTIC_HTML_REPORT (print_html writes to this HTML file instead of the console)
+
+Tests and notebooks can build a Settings directly (`Settings(openai_api_key="...")`) or call
+`get_settings.cache_clear()` after changing the environment.
+"""
+
+# --- Standard library ---
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# --- Third-party ---
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, SecretStr, field_validator
+
+# --- Local / project ---
+from agentic_learning.utils.env import PROJECT_ROOT, load_env
+from agentic_learning.utils.rate_limit import RetryPolicy
+
+
+class Settings(BaseModel):
+    """Frozen configuration (see the module docstring for the environment variables)."""
+
+    model_config = ConfigDict(frozen=True, populate_by_name=True, extra="ignore")
+
+    # --- API keys ---
+    openai_api_key: Optional[SecretStr] = Field(None, validation_alias=AliasChoices("OPENAI_API_KEY"))
+    anthropic_api_key: Optional[SecretStr] = Field(None, validation_alias=AliasChoices("ANTHROPIC_API_KEY"))
+    google_api_key: Optional[SecretStr] = Field(
+        None, validation_alias=AliasChoices("GOOGLE_API_KEY", "GEMINI_API_KEY")
+    )
+    mistral_api_key: Optional[SecretStr] = Field(None, validation_alias=AliasChoices("MISTRAL_API_KEY"))
+    tavily_api_key: Optional[SecretStr] = Field(None, validation_alias=AliasChoices("TAVILY_API_KEY"))
+
+    # --- Base URLs ---
+    openai_base_url: Optional[str] = Field(None, validation_alias=AliasChoices("OPENAI_BASE_URL"))
+    tavily_base_url: Optional[str] = Field(
+        None, validation_alias=AliasChoices("DLAI_TAVILY_BASE_URL", "TAVILY_BASE_URL")
+    )
+
+    # --- Model defaults ---
+    default_model: str = Field("gpt-4o", validation_alias=AliasChoices("AGENTIC_DEFAULT_MODEL"))
+    gemini_model: str = Field("gemini-2.5-flash-lite", validation_alias=AliasChoices("AGENTIC_GEMINI_MODEL"))
+    judge_model: str = Field("gpt-4o-mini", validation_alias=AliasChoices("AGENTIC_JUDGE_MODEL"))
+    critic_model: str = Field("gemini-2.5-flash-lite", validation_alias=AliasChoices("AGENTIC_CRITIC_MODEL"))
+    cascade_models: List[str] = Field(
+        default_factory=lambda: ["gpt-4o-mini", "gpt-4o"], validation_alias=AliasChoices("AGENTIC_CASCADE_MODELS")
+    )
+
+    # --- Retry ---
+    retry_attempts: int = Field(5, ge=1, validation_alias=AliasChoices("AGENTIC_RETRY_ATTEMPTS"))
+    retry_initial_delay: float = Field(
+        1.0, ge=0, validation_alias=AliasChoices("AGENTIC_RETRY_INITIAL_DELAY")
+    )
+    retry_max_delay: float = Field(30.0, ge=0, validation_alias=AliasChoices("AGENTIC_RETRY_MAX_DELAY"))
+    retry_exp_base: float = Field(2.0, ge=1, validation_alias=AliasChoices("AGENTIC_RETRY_EXP_BASE"))
+
+    # --- Concurrency ---
+    max_concurrent_tools: int = Field(8, ge=1, validation_alias=AliasChoices("AGENTIC_MAX_CONCURRENT_TOOLS"))
+    http_timeout: float = Field(30.0, gt=0, validation_alias=AliasChoices("AGENTIC_HTTP_TIMEOUT"))
+    requests_per_minute: Dict[str, float] = Field(
+        default_factory=dict, validation_alias=AliasChoices("AGENTIC_REQUESTS_PER_MINUTE")
+    )
+    tokens_per_minute: Dict[str, float] = Field(
+        default_factory=dict, validation_alias=AliasChoices("AGENTIC_TOKENS_PER_MINUTE")
+    )
+
+    # --- Cache ---
+    cache_dir: Path = Field(PROJECT_ROOT / ".cache", validation_alias=AliasChoices("AGENTIC_CACHE_DIR"))
+    cache_ttl: float = Field(3600.0, ge=0, validation_alias=AliasChoices("AGENTIC_CACHE_TTL"))
+    cache_maxsize: int = Field(1024, ge=1, validation_alias=AliasChoices("AGENTIC_CACHE_MAXSIZE"))
+
+    # --- Display ---
+    html_report: Optional[Path] = Field(None, validation_alias=AliasChoices("AGENTIC_HTML_REPORT"))
+
+    @field_validator("requests_per_minute", "tokens_per_minute", mode="before")
+    @classmethod
+    def _parse_limits(cls, value):
+        """Accept a JSON object or "provider=limit,provider=limit"."""
+        if not isinstance(value, str):
+            return value
+        value = value.strip()
+        if value.startswith("{"):
+            return json.loads(value)
+        return dict(item.split("=", 1) for item in value.split(",") if "=" in item)
+
+    @field_validator("cascade_models", mode="before")
+    @classmethod
+    def _parse_models(cls, value):
+        """Accept a JSON list or "model,model"."""
+        if not isinstance(value, str):
+            return value
+        value = value.strip()
+        if value.startswith("["):
+            return json.loads(value)
+        return [model.strip() for model in value.split(",") if model.strip()]
+
+    @classmethod
+    def from_env(cls, environ: Optional[Dict[str, str]] = None) -> "Settings":
+        """Settings from `environ` (default: os.environ, empty values ignored)."""
+        environ = os.environ if environ is None else environ
+        return cls.model_validate({key: value for key, value in environ.items() if value != ""})
+
+    def api_key(self, provider: str) -> Optional[str]:
+        """Plain API key of a provider ("openai", "anthropic", "google"/"gemini", "mistral", "tavily")."""
+        secret = getattr(self, f"{'google' if provider == 'gemini' else provider}_api_key", None)
+        return secret.get_secret_value() if secret else None
+
+    def retry_policy(self) -> RetryPolicy:
+        return RetryPolicy(
+            attempts=self.retry_attempts,
+            initial_delay=self.retry_initial_delay,
+            max_delay=self.retry_max_delay,
+            exp_base=self.retry_exp_base,
+        )
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """The process settings: .env loaded once, environment parsed once."""
+    load_env()
+    return Settings.from_env()
@@ -0,0 +1,324 @@
+"""
+Rendering of text, images and DataFrames in styled cards (`print_html`).
+
+Cards are built once and handed to a backend:
+
+    - NotebookBackend: IPython display. The stylesheet is emitted once per kernel session
+                       instead of with every card, and `batch()` groups the cards of a block
+                       into ONE output (one display call, one notebook cell output).
+    - ReportBackend:   a single streaming HTML file for scripts and CLI jobs: the stylesheet is
+                       written once at the top, each card is appended and flushed, so the
+                       report can be followed in a browser while the pipeline runs.
+    - ConsoleBackend:  plain text on stdout (outside notebooks, when no report is configured).
+
+The backend is chosen on first use: ReportBackend if `settings.html_report` is set
+(AGENTIC_HTML_REPORT), NotebookBackend inside a Jupyter kernel, ConsoleBackend otherwise;
+`use_backend()` / `use_report(path)` override it.
+
+Images are base64-encoded once per (path, mtime, size) and served from a small LRU cache; URLs
+are referenced as-is. DataFrames are rendered `max_rows` at a time (`page` selects the slice)
+instead of through a full `to_html`.
+"""
+
+# --- Standard library ---
+import atexit
+import base64
+import mimetypes
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from typing import Any, List, Optional
+
+DEFAULT_MAX_ROWS = 50
+
+CSS = """
+<style>
+.pretty-card{
+  font-family: ui-sans-serif, system-ui;
+  border: 2px solid transparent;
+  border-radius: 14px;
+  padding: 14px 16px;
+  margin: 10px 0;
+  background: linear-gradient(#fff, #fff) padding-box,
+              linear-gradient(135deg, #3b82f6, #9333ea) border-box;
+  color: #111;
+  box-shadow: 0 4px 12px rgba(0,0,0,.08);
+}
+.pretty-title{
+  font-weight:700;
+  margin-bottom:8px;
+  font-size:14px;
+  color:#111;
+  padding-bottom: 8px;
+  border-bottom: 1px solid #eee;
+}
+/* 🔒 Only affects INSIDE the card */
+.pretty-card pre,
+.pretty-card code {
+  background: #f3f4f6;
+  color: #111;
+  padding: 8px;
+  border-radius: 8px;
+  display: block;
+  overflow-x: auto;
+  font-size: 13px;
+  white-space: pre-wrap;
+}
+.pretty-card img { max-width: 100%; height: auto; border-radius: 8px; }
+.pretty-card table.pretty-table {
+  border-collapse: collapse;
+  width: 100%;
+  font-size: 13px;
+  color: #111;
+}
+.pretty-card table.pretty-table th,
+.pretty-card table.pretty-table td {
+  border: 1px solid #e5e7eb;
+  padding: 6px 8px;
+  text-align: left;
+}
+.pretty-card table.pretty-table th { background: #f9fafb; font-weight: 600; }
+.pretty-card .pretty-note { color: #6b7280; font-size: 12px; margin-top: 6px; }
+</style>
+"""
+
+
+# ================================
+# Rendering
+# ================================
+
+@lru_cache(maxsize=64)
+def _encode_file(path: str, mtime_ns: int, size: int) -> str:
+    # (mtime_ns, size) are part of the key: a rewritten file is encoded again
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+
+def image_src(image: str) -> str:
+    """`src` of an image: URLs / data URIs as-is, files as a (cached) base64 data URI."""
+    if image.startswith(("http://", "https://", "data:")):
+        return image
+    stat = os.stat(image)
+    media_type = mimetypes.guess_type(image)[0] or "image/png"
+    return f"data:{media_type};base64,{_encode_file(os.path.abspath(image), stat.st_mtime_ns, stat.st_size)}"
+
+
+def render_table(frame, max_rows: Optional[int] = DEFAULT_MAX_ROWS, page: int = 1, index: bool = False) -> str:
+    """HTML of one page of a DataFrame (only that slice is rendered)."""
+    total = len(frame)
+    if not max_rows or total <= max_rows:
+        return frame.to_html(classes="pretty-table", index=index, border=0, escape=False)
+    pages = -(-total // max_rows)
+    page = min(max(page, 1), pages)
+    start = (page - 1) * max_rows
+    table = frame.iloc[start:start + max_rows].to_html(classes="pretty-table", index=index, border=0, escape=False)
+    note = f"Rows {start + 1}–{min(start + max_rows, total)} of {total} (page {page}/{pages})"
+    return f'{table}<div class="pretty-note">{note}</div>'
+
+
+def render_content(
+    content: Any, is_image: bool = False, max_rows: Optional[int] = DEFAULT_MAX_ROWS, page: int = 1
+) -> str:
+    # pandas is only checked for if it was imported by the caller: no import cost for text
+    pd = sys.modules.get("pandas")
+    if is_image and isinstance(content, str):
+        return f'<img src="{image_src(content)}" alt="Image">'
+    if pd is not None and isinstance(content, pd.DataFrame):
+        return render_table(content, max_rows, page)
+    if pd is not None and isinstance(content, pd.Series):
+        return render_table(content.to_frame(), max_rows, page, index=True)
+    return f"<pre><code>{escape(content if isinstance(content, str) else str(content))}</code></pre>"
+
+
+def render_card(
+    content: Any,
+    title: Optional[str] = None,
+    is_image: bool = False,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    page: int = 1,
+) -> str:
+    title_html = f'<div class="pretty-title">{escape(title)}</div>' if title else ""
+    return f'<div class="pretty-card">{title_html}{render_content(content, is_image, max_rows, page)}</div>'
+
+
+# ================================
+# Backends
+# ================================
+
+class NotebookBackend:
+    """IPython display, stylesheet emitted once per session."""
+
+    def __init__(self):
+        self._css_emitted = False
+        self._batch: Optional[List[str]] = None
+
+    def show(self, content: Any, title: Optional[str], is_image: bool, max_rows: Optional[int], page: int):
+        card = render_card(content, title, is_image, max_rows, page)
+        if self._batch is not None:
+            self._batch.append(card)
+        else:
+            self._display(card)
+
+    def _display(self, html: str):
+        from IPython.display import HTML, display
+
+        if not self._css_emitted:
+            html = CSS + html
+            self._css_emitted = True
+        display(HTML(html))
+
+    def reset(self):
+        """Emit the stylesheet again with the next card (e.g. after clearing all outputs)."""
+        self._css_emitted = False
+
+    @contextmanager
+    def batch(self):
+        if self._batch is not None:  # Nested: the outer batch displays everything
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+        finally:
+            cards, self._batch = self._batch, None
+            if cards:
+                self._display("".join(cards))
+
+
+_REPORT_FOOTER = "</body></html>\n"
+
+
+class ReportBackend:
+    """
+    Single HTML report file, written as a stream (one flush per card).
+
+    The file is created on the first card. When the report is closed (e.g. by `use_backend`)
+    and used again, the next cards are appended to it.
+    """
+
+    def __init__(self, path: str | Path, title: str = "Agentic learning report"):
+        self.path = Path(path)
+        self.title = title
+        self._file = None
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._started:
+            # Reopened after close(): drop the footer and append the next cards
+            footer = _REPORT_FOOTER.encode("utf-8")
+            with open(self.path, "rb+") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(size - len(footer), 0))
+                if f.read() == footer:
+                    f.truncate(size - len(footer))
+            self._file = open(self.path, "a", encoding="utf-8")
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(
+            f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{escape(self.title)}</title>'
+            f"{CSS}</head><body>\n"
+        )
+        self._started = True
+        atexit.register(self.close)
+
+    def show(self, content: Any, title: Optional[str], is_image: bool, max_rows: Optional[int], page: int):
+        card = render_card(content, title, is_image, max_rows, page)
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._file.write(card + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.write(_REPORT_FOOTER)
+                self._file.close()
+                self._file = None
+
+    @contextmanager
+    def batch(self):
+        yield
+
+
+class ConsoleBackend:
+    """Plain text output."""
+
+    def show(self, content: Any, title: Optional[str], is_image: bool, max_rows: Optional[int], page: int):
+        if is_image:
+            body = f"[image] {content}"
+        elif hasattr(content, "to_string"):
+            rows = content.head(max_rows) if max_rows else content
+            body = rows.to_string() + (f"\n... {len(content)} rows" if len(rows) < len(content) else "")
+        else:
+            body = str(content)
+        print(f"== {title} ==\n{body}" if title else body, flush=True)
+
+    @contextmanager
+    def batch(self):
+        yield
+
+
+_backend = None
+
+
+def _in_notebook() -> bool:
+    shell = sys.modules.get("IPython")
+    ipython = shell.get_ipython() if shell else None
+    return ipython is not None and "IPKernelApp" in getattr(ipython, "config", {})
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        from agentic_learning.utils.config import get_settings
+
+        report = get_settings().html_report
+        if report:
+            _backend = ReportBackend(report)
+        elif _in_notebook():
+            _backend = NotebookBackend()
+        else:
+            _backend = ConsoleBackend()
+    return _backend
+
+
+def use_backend(backend) -> None:
+    """Route the next cards to `backend` (closing the previous report, if any)."""
+    global _backend
+    if isinstance(_backend, ReportBackend) and _backend is not backend:
+        _backend.close()
+    _backend = backend
+
+
+def use_report(path: str | Path, title: str = "Agentic learning report") -> ReportBackend:
+    backend = ReportBackend(path, title)
+    use_backend(backend)
+    return backend
+
+
+def batch():
+    """Group the cards printed in the block (one notebook output)."""
+    return get_backend().batch()
+
+
+def print_html(
+    content: Any,
+    title: str | None = None,
+    is_image: bool = False,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    page: int = 1,
+):
+    """
+    Pretty-print inside a styled card.
+    - If is_image=True and content is a string: treat as image path/URL and render <img>.
+    - If content is a pandas DataFrame/Series: render `max_rows` rows (page `page`) as an HTML table.
+    - Otherwise (strings/others): show as code/text in <pre><code>.
+    """
+    get_backend().show(content, title, is_image, max_rows, page)
@@ -0,0 +1,19 @@
+"""
+Environment loading: the only utils module the agent scripts need at startup.
+
+Kept free of heavy imports (no SDK, pandas or IPython) so that `load_env()` costs milliseconds;
+python-dotenv itself is imported on the first call.
+"""
+
+# --- Standard library ---
+from pathlib import Path
+
+# Project root (one level up from utils/)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_env(path: str | Path | None = None) -> bool:
+    """Load the .env file of the project root (or `path`) into os.environ. Returns True if found."""
+    from dotenv import load_dotenv
+
+    return load_dotenv(path or PROJECT_ROOT / ".env")
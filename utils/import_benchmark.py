@@ -0,0 +1,74 @@
+"""
+Import-time benchmark of the project entry points.
+
+Every statement runs in a fresh interpreter (`python -X importtime -c <statement>`), several
+times; the median wall time and the slowest top-level imports (cumulative microseconds reported
+by -X importtime) are printed. Used to keep `load_env` and the agent modules fast to start:
+
+    python -m agentic_learning.utils.import_benchmark
+    python -m agentic_learning.utils.import_benchmark --repeat 10 "import agentic_learning.core.agent"
+"""
+
+# --- Standard library ---
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+DEFAULT_STATEMENTS = [
+    "pass",  # Interpreter startup, the baseline
+    "import agentic_learning.utils",
+    "from agentic_learning.utils.utils import load_env",
+    "from agentic_learning.utils.utils import load_env; load_env()",
+    "from agentic_learning.utils.utils import get_response",
+    "from agentic_learning.utils.utils import print_html",
+]
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once(statement: str) -> Tuple[float, Dict[str, int]]:
+    """(wall time in seconds, {top-level module: cumulative µs}) of one fresh interpreter."""
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if process.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{process.stderr[-2000:]}")
+
+    modules = {}
+    for line in process.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        # Only the imports made directly by the statement (depth 1 in the import tree)
+        if match and len(match.group(3)) == 1:
+            modules[match.group(4)] = int(match.group(2))
+    return elapsed, modules
+
+
+def benchmark(statement: str, repeat: int = 5, top: int = 5) -> dict:
+    runs = [run_once(statement) for _ in range(repeat)]
+    wall = [elapsed for elapsed, _ in runs]
+    slowest: List[Tuple[str, int]] = sorted(runs[-1][1].items(), key=lambda item: -item[1])[:top]
+    return {"statement": statement, "median": statistics.median(wall), "min": min(wall), "slowest": slowest}
+
+
+#### MAIN ####
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the import time of project entry points.")
+    parser.add_argument("statements", nargs="*", default=DEFAULT_STATEMENTS, help="Python statements to time.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per statement.")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to show.")
+    args = parser.parse_args()
+
+    for statement in args.statements:
+        result = benchmark(statement, args.repeat, args.top)
+        print(f"{result['median'] * 1000:8.1f} ms (min {result['min'] * 1000:.1f})  {statement}")
+        for module, micros in result["slowest"]:
+            print(f"{'':12}{micros / 1000:8.1f} ms  {module}")
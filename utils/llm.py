@@ -0,0 +1,122 @@
+"""
+Synchronous LLM helpers of the single agent patterns (text and image + text calls).
+
+The OpenAI and Anthropic clients are created on first use from the settings (./config.py) and
+shared by the process.
+"""
+
+# --- Standard library ---
+import base64
+import mimetypes
+import re
+from functools import lru_cache
+
+# --- Third-party ---
+from anthropic import Anthropic
+from openai import OpenAI
+
+# --- Local / project ---
+from agentic_learning.utils.config import get_settings
+
+
+@lru_cache(maxsize=None)
+def openai_client() -> OpenAI:
+    settings = get_settings()
+    return OpenAI(api_key=settings.api_key("openai"), base_url=settings.openai_base_url)
+
+
+@lru_cache(maxsize=None)
+def anthropic_client() -> Anthropic:
+    return Anthropic(api_key=get_settings().api_key("anthropic"))
+
+
+def get_response(model: str, prompt: str) -> str:
+    from agentic_learning.integrations.providers.registry import PROVIDERS, split_model
+
+    explicit = model.partition(":")[0] in PROVIDERS
+    provider, model = split_model(model)
+    if not explicit and ("claude" in model.lower() or "anthropic" in model.lower()):
+        # Names the prefix routing misses ("anthropic/claude-...", "my-claude-proxy") still go to Anthropic
+        provider = "anthropic"
+        if model.lower().startswith("anthropic/"):
+            model = model.split("/", 1)[1]
+    if provider == "anthropic":
+        # Anthropic Claude format
+        message = anthropic_client().messages.create(
+            model=model,
+            max_tokens=1000,
+            messages=[{"role": "user", "content": [{"type": "text", "text": prompt}]}],
+        )
+        return message.content[0].text
+
+    else:
+        # Default to OpenAI format for all other models (gpt-4, o3-mini, o1, etc.)
+        response = openai_client().responses.create(
+            model=model,
+            input=prompt,
+        )
+        return response.output_text
+
+def ensure_execute_python_tags(text: str) -> str:
+    """Normalize code to be wrapped in <execute_python>...</execute_python>."""
+    text = text.strip()
+    # Strip ```python fences if present
+    text = re.sub(r"^```(?:python)?\s*|\s*```$", "", text).strip()
+    if "<execute_python>" not in text:
+        text = f"<execute_python>\n{text}\n</execute_python>"
+    return text
+
+def encode_image_b64(path: str) -> tuple[str, str]:
+    """Return (media_type, base64_str) for an image file path."""
+    mime, _ = mimetypes.guess_type(path)
+    media_type = mime or "image/png"
+    with open(path, "rb") as f:
+        b64 = base64.b64encode(f.read()).decode("utf-8")
+    return media_type, b64
+
+def image_anthropic_call(model_name: str, prompt: str, media_type: str, b64: str) -> str:
+    """
+    Call Anthropic Claude (messages.create) with text+image and return *all* text blocks concatenated.
+    Adds a system message to enforce strict JSON output.
+    """
+    msg = anthropic_client().messages.create(
+        model=model_name,
+        max_tokens=2000,
+        temperature=0,
+        system=(
+            "You are a careful assistant. Respond with a single valid JSON object only. "
+            "Do not include markdown, code fences, or commentary outside JSON."
+        ),
+        messages=[{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {"type": "image", "source": {"type": "base64", "media_type": media_type, "data": b64}},
+            ],
+        }],
+    )
+
+    # Anthropic returns a list of content blocks; collect all text
+    parts = []
+    for block in (msg.content or []):
+        if getattr(block, "type", None) == "text":
+            parts.append(block.text)
+    return "".join(parts).strip()
+
+
+def image_openai_call(model_name: str, prompt: str, media_type: str, b64: str) -> str:
+    data_url = f"data:{media_type};base64,{b64}"
+    resp = openai_client().responses.create(
+        model=model_name,
+        input=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "input_text", "text": prompt},
+                    {"type": "input_image", "image_url": data_url},
+                ],
+            }
+        ],
+    )
+    content = (resp.output_text or "").strip()
+    return content
@@ -0,0 +1,279 @@
+"""
+Client-side rate limiting shared by the model providers.
+
+    - TokenBucket:         `rate` requests per second with bursts up to `capacity`. `acquire`
+                           (async) and `acquire_sync` (threads) wait until a token is available,
+                           so callers are smoothed BEFORE the API answers 429.
+    - AdaptiveRateLimiter: one request bucket and one token bucket (per minute limits), adjusted
+                           from the rate-limit headers of the responses:
+                               x-ratelimit-{limit,remaining,reset}-{requests,tokens}   (OpenAI)
+                               anthropic-ratelimit-{requests,tokens}-{limit,remaining,reset}
+                               retry-after / retry-after-ms, Google RetryInfo.retryDelay
+                           The advertised limits become the bucket rates (minus some headroom),
+                           a lower server `remaining` drains the local bucket, and an exhausted
+                           window or a 429 pauses EVERY caller until the reset: concurrent agents
+                           sharing a limiter stay under the limits instead of bouncing off them.
+    - RetryPolicy:         exponential backoff with full jitter (random delay in [0, backoff]),
+                           so clients that failed together do not retry together.
+
+Limiters are shared per key (provider name) through `shared_limiter`.
+"""
+
+# --- Standard library ---
+import asyncio
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket usable from coroutines and threads."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum burst (default: one second worth of tokens, at least 1).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: Optional[float] = None) -> "TokenBucket":
+        return cls(requests_per_minute / 60.0, burst)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float, capacity: Optional[float] = None):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity if capacity is not None else max(rate, 1.0)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def drain_to(self, tokens: float):
+        """Lower the available tokens to `tokens` (never raises them)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, tokens)
+
+    def refund(self, tokens: float):
+        """Give back (or, if negative, take) tokens after the actual cost of a call is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def _reserve(self, tokens: float) -> float:
+        """Take `tokens` now (possibly going negative) and return how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate if self.rate > 0 else float("inf")
+
+    async def acquire(self, tokens: float = 1.0):
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, tokens: float = 1.0):
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    attempts: int = 5
+    initial_delay: float = 1.0
+    max_delay: float = 30.0
+    exp_base: float = 2.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number `attempt` (0-based). A server `retry_after` is a lower bound."""
+        backoff = min(self.max_delay, self.initial_delay * self.exp_base ** attempt)
+        delay = random.uniform(0, backoff)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_LIMIT_HEADER = re.compile(
+    r"^(?:x-ratelimit-(limit|remaining|reset)-(requests|tokens)"
+    r"|anthropic-ratelimit-(requests|tokens)-(limit|remaining|reset))$"
+)
+
+
+def parse_duration(value) -> Optional[float]:
+    """Seconds in "12", "0.5", "6m0s", "20ms", "23s" or an RFC 3339 reset timestamp."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if parts and "".join(number + unit for number, unit in parts) == text:
+        return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        reset = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset.tzinfo is None:
+        reset = reset.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset - datetime.now(timezone.utc)).total_seconds())
+
+
+def parse_rate_limit_headers(headers: Mapping[str, str]) -> Dict[str, float]:
+    """
+    Normalize provider rate-limit headers to {"limit_requests", "remaining_tokens",
+    "reset_requests", ..., "retry_after"} (resets and retry_after in seconds).
+    """
+    parsed = {}
+    for key, value in headers.items():
+        key = key.lower()
+        if key == "retry-after-ms":
+            seconds = parse_duration(value)
+            if seconds is not None:
+                parsed["retry_after"] = seconds / 1000
+            continue
+        if key == "retry-after":
+            seconds = parse_duration(value)
+            if seconds is not None:
+                parsed.setdefault("retry_after", seconds)
+            continue
+        match = _LIMIT_HEADER.match(key)
+        if not match:
+            continue
+        field, kind = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), match.group(3))
+        number = parse_duration(value) if field == "reset" else _to_float(value)
+        if number is not None:
+            parsed[f"{field}_{kind}"] = number
+    return parsed
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Requests + tokens per minute limiter that follows the provider rate-limit headers."""
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: Optional[float] = None,
+        headroom: float = 0.9,
+    ):
+        """
+        Args:
+            requests_per_minute: Initial request limit (replaced by the advertised one).
+            tokens_per_minute: Initial token limit (None: not limited until advertised).
+            headroom: Fraction of the advertised limits actually used.
+        """
+        self.headroom = headroom
+        self.requests = TokenBucket.per_minute(requests_per_minute, burst=max(1.0, requests_per_minute / 10))
+        self.tokens = TokenBucket.per_minute(tokens_per_minute, burst=tokens_per_minute) if tokens_per_minute else None
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        tpm = f", tpm={self.tokens.rate * 60:.0f}" if self.tokens else ""
+        return f"AdaptiveRateLimiter(rpm={self.requests.rate * 60:.0f}{tpm})"
+
+    def _delay(self, tokens: float) -> float:
+        with self._lock:
+            blocked = self._blocked_until - time.monotonic()
+        delay = max(blocked, self.requests._reserve(1))
+        if self.tokens is not None and tokens:
+            # A request larger than the whole bucket would wait forever: cap it to the burst
+            delay = max(delay, self.tokens._reserve(min(tokens, self.tokens.capacity)))
+        return delay
+
+    async def acquire(self, tokens: float = 0):
+        """Wait for one request slot and `tokens` (estimated) tokens."""
+        delay = self._delay(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, tokens: float = 0):
+        delay = self._delay(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    def settle(self, estimated: float, actual: float):
+        """Correct the token bucket once the actual usage of a call is known."""
+        if self.tokens is not None:
+            self.tokens.refund(min(estimated, self.tokens.capacity) - actual)
+
+    def pause(self, seconds: float):
+        """Block every caller for `seconds` (429 / exhausted window)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update(self, headers: Optional[Mapping[str, str]]):
+        """Adapt to the rate-limit headers of a response (successful or not)."""
+        if not headers:
+            return
+        limits = parse_rate_limit_headers(headers)
+        if "retry_after" in limits:
+            self.pause(limits["retry_after"])
+
+        for kind in ("requests", "tokens"):
+            limit = limits.get(f"limit_{kind}")
+            remaining = limits.get(f"remaining_{kind}")
+            bucket = getattr(self, kind)
+            if limit:
+                rate = limit * self.headroom / 60.0
+                burst = max(1.0, rate * 6) if kind == "requests" else limit * self.headroom
+                if bucket is None:
+                    bucket = self.tokens = TokenBucket(rate, burst)
+                elif abs(bucket.rate - rate) > 1e-9:
+                    bucket.set_rate(rate, burst)
+            if remaining is None or bucket is None:
+                continue
+            bucket.drain_to(remaining * self.headroom)
+            if remaining <= 0 and limits.get(f"reset_{kind}"):
+                self.pause(limits[f"reset_{kind}"])
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_limiter(
+    key: str,
+    requests_per_minute: float = 60,
+    tokens_per_minute: Optional[float] = None,
+) -> AdaptiveRateLimiter:
+    """The limiter registered under `key` (created with these limits on first use)."""
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = AdaptiveRateLimiter(requests_per_minute, tokens_per_minute)
+        return limiter
@@ -1,198 +1,59 @@
-# === Standard Library ===
-import os
-import re
-import json
-import base64
-import mimetypes
-from pathlib import Path
-from typing import Any
-
-# === Third-Party ===
-import pandas as pd
-import matplotlib.pyplot as plt
-from PIL import Image
-from dotenv import load_dotenv
-from openai import OpenAI
-from anthropic import Anthropic
-from html import escape
-from IPython.display import HTML, display
-
-# === Env & Clients ===
-def load_env():
-    # Load .env from the project root (one level up from utils/)
-    project_root = Path(__file__).resolve().parent.parent
-    load_dotenv(project_root / ".env")
-
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
-
-    # Both clients read keys from env by default; explicit is also fine:
-    openai_client = OpenAI(api_key=openai_api_key) if openai_api_key else OpenAI()
-    anthropic_client = Anthropic(api_key=anthropic_api_key) if anthropic_api_key else Anthropic()
-
-
-def get_response(model: str, prompt: str) -> str:
-    if "claude" in model.lower() or "anthropic" in model.lower():
-        # Anthropic Claude format
-        message = anthropic_client.messages.create(
-            model=model,
-            max_tokens=1000,
-            messages=[{"role": "user", "content": [{"type": "text", "text": prompt}]}],
-        )
-        return message.content[0].text
-
-    else:
-        # Default to OpenAI format for all other models (gpt-4, o3-mini, o1, etc.)
-        response = openai_client.responses.create(
-            model=model,
-            input=prompt,
-        )
-        return response.output_text
-
-def ensure_execute_python_tags(text: str) -> str:
-    """Normalize code to be wrapped in <execute_python>...</execute_python>."""
-    text = text.strip()
-    # Strip ```python fences if present
-    text = re.sub(r"^```(?:python)?\s*|\s*```$", "", text).strip()
-    if "<execute_python>" not in text:
-        text = f"<execute_python>\n{text}\n</execute_python>"
-    return text
-
-def encode_image_b64(path: str) -> tuple[str, str]:
-    """Return (media_type, base64_str) for an image file path."""
-    mime, _ = mimetypes.guess_type(path)
-    media_type = mime or "image/png"
-    with open(path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode("utf-8")
-    return media_type, b64
-
-def image_anthropic_call(model_name: str, prompt: str, media_type: str, b64: str) -> str:
-    """
-    Call Anthropic Claude (messages.create) with text+image and return *all* text blocks concatenated.
-    Adds a system message to enforce strict JSON output.
-    """
-    msg = anthropic_client.messages.create(
-        model=model_name,
-        max_tokens=2000,
-        temperature=0,
-        system=(
-            "You are a careful assistant. Respond with a single valid JSON object only. "
-            "Do not include markdown, code fences, or commentary outside JSON."
-        ),
-        messages=[{
-            "role": "user",
-            "content": [
-                {"type": "text", "text": prompt},
-                {"type": "image", "source": {"type": "base64", "media_type": media_type, "data": b64}},
-            ],
-        }],
-    )
-
-    # Anthropic returns a list of content blocks; collect all text
-    parts = []
-    for block in (msg.content or []):
-        if getattr(block, "type", None) == "text":
-            parts.append(block.text)
-    return "".join(parts).strip()
-
-
-def image_openai_call(model_name: str, prompt: str, media_type: str, b64: str) -> str:
-    data_url = f"data:{media_type};base64,{b64}"
-    resp = openai_client.responses.create(
-        model=model_name,
-        input=[
-            {
-                "role": "user",
-                "content": [
-                    {"type": "input_text", "text": prompt},
-                    {"type": "input_image", "image_url": data_url},
-                ],
-            }
-        ],
+"""
+Facade of the historical `agentic_learning.utils.utils` module.
+
+The helpers now live in lightweight submodules, loaded on first attribute access (PEP 562
+module `__getattr__`), so that `from agentic_learning.utils.utils import load_env` no longer
+imports pandas, matplotlib, PIL, the OpenAI / Anthropic SDKs and IPython:
+
+    - ./env.py:     load_env
+    - ./llm.py:     get_response, image_*_call, encode_image_b64, ensure_execute_python_tags
+    - ./display.py: print_html
+
+Import time of the entry points: `python -m agentic_learning.utils.import_benchmark`.
+"""
+
+# --- Standard library ---
+import importlib
+from typing import TYPE_CHECKING
+
+_LAZY = {
+    "load_env": "env",
+    "PROJECT_ROOT": "env",
+    "get_response": "llm",
+    "openai_client": "llm",
+    "anthropic_client": "llm",
+    "ensure_execute_python_tags": "llm",
+    "encode_image_b64": "llm",
+    "image_anthropic_call": "llm",
+    "image_openai_call": "llm",
+    "print_html": "display",
+}
+
+__all__ = sorted(_LAZY)
+
+if TYPE_CHECKING:
+    from agentic_learning.utils.display import print_html
+    from agentic_learning.utils.env import PROJECT_ROOT, load_env
+    from agentic_learning.utils.llm import (
+        anthropic_client,
+        encode_image_b64,
+        ensure_execute_python_tags,
+        get_response,
+        image_anthropic_call,
+        image_openai_call,
+        openai_client,
     )
-    content = (resp.output_text or "").strip()
-    return content
 
 
-def print_html(content: Any, title: str | None = None, is_image: bool = False):
-    """
-    Pretty-print inside a styled card.
-    - If is_image=True and content is a string: treat as image path/URL and render <img>.
-    - If content is a pandas DataFrame/Series: render as an HTML table.
-    - Otherwise (strings/others): show as code/text in <pre><code>.
-    """
+def __getattr__(name: str):
     try:
-        from html import escape as _escape
-    except ImportError:
-        _escape = lambda x: x
-
-    def image_to_base64(image_path: str) -> str:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode("utf-8")
-
-    # Render content
-    if is_image and isinstance(content, str):
-        b64 = image_to_base64(content)
-        rendered = f'<img src="data:image/png;base64,{b64}" alt="Image" style="max-width:100%; height:auto; border-radius:8px;">'
-    elif isinstance(content, pd.DataFrame):
-        rendered = content.to_html(classes="pretty-table", index=False, border=0, escape=False)
-    elif isinstance(content, pd.Series):
-        rendered = content.to_frame().to_html(classes="pretty-table", border=0, escape=False)
-    elif isinstance(content, str):
-        rendered = f"<pre><code>{_escape(content)}</code></pre>"
-    else:
-        rendered = f"<pre><code>{_escape(str(content))}</code></pre>"
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f"agentic_learning.utils.{module}"), name)
+    globals()[name] = value  # Next accesses skip __getattr__
+    return value
 
-    css = """
-    <style>
-    .pretty-card{
-      font-family: ui-sans-serif, system-ui;
-      border: 2px solid transparent;
-      border-radius: 14px;
-      padding: 14px 16px;
-      margin: 10px 0;
-      background: linear-gradient(#fff, #fff) padding-box,
-                  linear-gradient(135deg, #3b82f6, #9333ea) border-box;
-      color: #111;
-      box-shadow: 0 4px 12px rgba(0,0,0,.08);
-    }
-    .pretty-title{
-      font-weight:700;
-      margin-bottom:8px;
-      font-size:14px;
-      color:#111;
-      padding-bottom: 8px;
-      border-bottom: 1px solid #eee;
-    }
-    /* 🔒 Only affects INSIDE the card */
-    .pretty-card pre, 
-    .pretty-card code {
-      background: #f3f4f6;
-      color: #111;
-      padding: 8px;
-      border-radius: 8px;
-      display: block;
-      overflow-x: auto;
-      font-size: 13px;
-      white-space: pre-wrap;
-    }
-    .pretty-card img { max-width: 100%; height: auto; border-radius: 8px; }
-    .pretty-card table.pretty-table {
-      border-collapse: collapse;
-      width: 100%;
-      font-size: 13px;
-      color: #111;
-    }
-    .pretty-card table.pretty-table th, 
-    .pretty-card table.pretty-table td {
-      border: 1px solid #e5e7eb;
-      padding: 6px 8px;
-      text-align: left;
-    }
-    .pretty-card table.pretty-table th { background: #f9fafb; font-weight: 600; }
-    </style>
-    """
 
-    title_html = f'<div class="pretty-title">{title}</div>' if title else ""
-    card = f'<div class="pretty-card">{title_html}{rendered}</div>'
-    display(HTML(css + card))
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))